@@ -13,6 +13,7 @@ class CandidateProfile(models.Model):
     birth_date = models.DateField("Data de Nascimento", null=True, blank=True) # <--- O erro estava aqui
     phone = models.CharField("Celular/WhatsApp", max_length=20, null=True, blank=True)
     photo = models.ImageField("Foto de Perfil", upload_to="candidates/photos/", blank=True, null=True)
+    photo_variants = models.JSONField("Versões Responsivas", default=dict, blank=True, editable=False)
     
     # Endereço
     cep = models.CharField("CEP", max_length=9, null=True, blank=True)
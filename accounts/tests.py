@@ -1,3 +1,55 @@
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 
-# Create your tests here.
+from core.testing import TempMediaRootMixin
+from core.uploadhandlers import MB
+from .models import CandidateProfile
+
+PDF = b'%PDF-1.4\n' + b'0' * 64
+PNG = b'\x89PNG\r\n\x1a\n' + b'0' * 64
+
+
+class ProfileUploadTests(TempMediaRootMixin, TestCase):
+    """Arquivos do perfil conferidos enquanto chegam (core.uploadhandlers)."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('candidato', 'candidato@example.com', 'senha')
+        self.client.force_login(self.user)
+
+    def post(self, **files):
+        data = {
+            'full_name': "Candidato Teste", 'cpf': '123.456.789-00', 'birth_date': '1990-01-01',
+            'phone': '92900000000', 'cep': '69000-000', 'address': "Rua A, 1", 'city': "Manaus", 'state': 'AM',
+        }
+        data.update({name: SimpleUploadedFile(filename, content) for name, (filename, content) in files.items()})
+        return self.client.post('/meu-perfil/', data)
+
+    def assertRejected(self, response, field, message):
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(message, response.context['form'].errors[field][0])
+        self.assertFalse(CandidateProfile.objects.get(user=self.user).resume_file)
+        self.assertEqual(self.media_files(), [])
+
+    def test_arquivos_aceitos(self):
+        response = self.post(resume_file=('cv.pdf', PDF))
+        self.assertRedirects(response, '/meu-perfil/')
+        profile = CandidateProfile.objects.get(user=self.user)
+        self.assertTrue(profile.resume_file.name.startswith('candidates/resumes/cv'))
+        with profile.resume_file.open('rb') as fp:
+            self.assertEqual(fp.read(), PDF)
+        self.assertFalse([name for name in self.media_files() if name.endswith('.part')])
+
+    def test_arquivo_vazio(self):
+        self.assertRejected(self.post(resume_file=('cv.pdf', b'')), 'resume_file', "vazio")
+
+    def test_arquivo_menor_que_a_assinatura(self):
+        self.assertRejected(self.post(resume_file=('cv.pdf', b'abcde')), 'resume_file', "PDF ou Word")
+
+    def test_tipo_nao_aceito(self):
+        self.assertRejected(self.post(resume_file=('cv.pdf', b'<html>' + b'0' * 64)), 'resume_file', "PDF ou Word")
+
+    def test_arquivo_maior_que_o_limite(self):
+        response = self.post(resume_file=('cv.pdf', PDF), photo=('foto.png', PNG + b'0' * 5 * MB))
+        self.assertRejected(response, 'photo', "limite de 5 MB")
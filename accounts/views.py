@@ -2,10 +2,22 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth import login
 from django.db import transaction
+from django.db.models import Exists, OuterRef
 from django.contrib.auth.decorators import login_required
 from .models import CandidateProfile
 from .forms import UserRegisterForm, CandidateProfileForm, EducationForm, ExperienceForm, CourseForm
-from careers.models import Candidate
+from careers.linking import link_candidates
+from careers.models import Candidate, CandidateDocument
+from core.files import IMAGE_TYPES, RESUME_TYPES
+from core.uploadhandlers import MB, UploadRule, add_upload_errors, validate_uploads
+
+# Arquivos do perfil, conferidos enquanto chegam (core.uploadhandlers)
+PHOTO_UPLOAD_RULE = UploadRule(
+    'accounts.CandidateProfile.photo', 5 * MB, IMAGE_TYPES, "Envie a foto em JPG, PNG, WebP ou GIF.",
+)
+RESUME_UPLOAD_RULE = UploadRule(
+    'accounts.CandidateProfile.resume_file', 10 * MB, RESUME_TYPES, "Envie o currículo em PDF ou Word (DOC/DOCX).",
+)
 
 @login_required
 def register(request):
@@ -29,6 +41,9 @@ def register(request):
                     profile = profile_form.save(commit=False)
                     profile.user = user
                     profile.save()
+
+                    # Candidaturas cadastradas antes (ex: pelo RH) com o mesmo e-mail
+                    link_candidates(user)
                     
                     # 3. Loga o usuário e redireciona
                     login(request, user)
@@ -49,6 +64,7 @@ def register(request):
     })
 
 @login_required # <--- Adicione esta linha!
+@validate_uploads(photo=PHOTO_UPLOAD_RULE, resume_file=RESUME_UPLOAD_RULE)
 def profile_view(request):
     """
     Dashboard do Candidato: Perfil + Histórico de Vagas.
@@ -58,10 +74,14 @@ def profile_view(request):
     profile, created = CandidateProfile.objects.get_or_create(user=request.user)
     
     # ... (o resto da função continua igual) ...
-    my_applications = Candidate.objects.filter(email=request.user.email).order_by('-sent_at')
+    # 'has_documents' na mesma consulta (o template mostrava o botão com 1 consulta por candidatura)
+    my_applications = Candidate.objects.filter(user=request.user).select_related('job').annotate(
+        has_documents=Exists(CandidateDocument.objects.filter(candidate=OuterRef('pk')))
+    ).order_by('-sent_at')
 
     if request.method == 'POST':
         form = CandidateProfileForm(request.POST, request.FILES, instance=profile)
+        add_upload_errors(form, request)
         if form.is_valid():
             form.save()
             messages.success(request, 'Seus dados foram atualizados com sucesso!')
@@ -1,9 +1,20 @@
 from django.contrib import admin
 from django.contrib.admin import AdminSite
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponseRedirect
+from django.urls import path, reverse
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.db.models import Count , Q
 from django.template.response import TemplateResponse
+from core.streaming import EXPORT_FORMATS
+from search.admin import IndexedSearchAdminMixin
+
+from . import candidate_search
+from .dossier import dossier_response
+from .export import export_candidates
+from .metrics import dashboard_metrics
 from .models import JobOpportunity, Candidate, DocumentType, CandidateDocument
 
 class HRAdminSite(AdminSite):
@@ -14,34 +25,10 @@ class HRAdminSite(AdminSite):
     
     # Customizando a página inicial (Dashboard)
     def index(self, request, extra_context=None):
-        # 1. Coletar Métricas Básicas
-        total_vagas_abertas = JobOpportunity.objects.filter(is_active=True).count()
-        total_candidatos = Candidate.objects.count()
-        total_banco_talentos = Candidate.objects.filter(job__isnull=True).count() # Vaga vazia = Banco
-        
-        # 2. Funil de Seleção (Quantos em cada fase)
-        # Usamos 'aggregate' para contar rapidinho
-        funil = Candidate.objects.aggregate(
-            novos=Count('id', filter=Q(status='NOVO')),
-            entrevista=Count('id', filter=Q(status='ENTREVISTA')),
-            admissao=Count('id', filter=Q(status__in=['AGUARDANDO_DOCS', 'DOCS_EM_ANALISE'])),
-            contratados=Count('id', filter=Q(status='CONTRATADO')),
-        )
-
-        # 3. Vagas com mais candidatos (Top 5)
-        top_vagas = JobOpportunity.objects.filter(is_active=True).annotate(
-            num_cand=Count('candidates')
-        ).order_by('-num_cand')[:5]
-
-        # Passa esses dados para o template
+        # As métricas vêm prontas da tabela HRMetric, atualizada pelos signals
+        # de Candidate/JobOpportunity (ver careers/metrics.py)
         context = {
-            'metricas': {
-                'vagas_abertas': total_vagas_abertas,
-                'total_candidatos': total_candidatos,
-                'banco_talentos': total_banco_talentos,
-                'funil': funil,
-                'top_vagas': top_vagas,
-            }
+            'metricas': dashboard_metrics(),
         }
         # Junta com o contexto padrão do admin (lista de apps)
         context.update(extra_context or {})
@@ -57,14 +44,20 @@ class DocumentTypeAdmin(admin.ModelAdmin):
     list_display = ('title', 'description')
 
 # 2. Vagas
-class JobOpportunityAdmin(admin.ModelAdmin):
+class JobOpportunityAdmin(IndexedSearchAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'department', 'candidatos_count', 'is_active', 'created_at')
     list_filter = ('department', 'is_active')
     search_fields = ('title',)
+    search_kind = 'vaga'  # busca pelo índice (search.admin)
     
+    def get_queryset(self, request):
+        # Conta os candidatos na mesma consulta da listagem (evita 1 COUNT por vaga)
+        return super().get_queryset(request).annotate(num_candidatos=Count('candidates'))
+
     def candidatos_count(self, obj):
-        return obj.candidates.count()
+        return obj.num_candidatos
     candidatos_count.short_description = "Candidatos"
+    candidatos_count.admin_order_field = 'num_candidatos'
 
 # 3. Documentos Inline (Dentro do Candidato)
 class CandidateDocumentInline(admin.TabularInline):
@@ -83,14 +76,23 @@ class CandidateDocumentInline(admin.TabularInline):
 class CandidateAdmin(admin.ModelAdmin):
     list_display = ('name', 'job_display', 'status', 'docs_status_rh', 'acoes_rapidas')
     list_filter = ('status', 'job', 'sent_at')
-    search_fields = ('name', 'email', 'cpf')
+    # A busca usa a tabela CandidateSearchToken (get_search_results abaixo);
+    # search_fields só habilita a caixa de busca
+    search_fields = ('name', 'email', 'phone')
+    search_help_text = "Nome, e-mail, telefone ou CPF. Pode digitar só o começo das palavras, com ou sem acento."
+
     inlines = [CandidateDocumentInline]
+    raw_id_fields = ('user',)
     
     list_editable = ('status',)
 
+    # A exportação e o dossiê não usam as contagens da listagem (ver get_queryset)
+    EXPORT_ACTIONS = ('exportar_csv', 'exportar_xlsx', 'baixar_dossie')
+    actions = EXPORT_ACTIONS
+
     fieldsets = (
         ('Dados do Candidato', {
-            'fields': ('job', 'name', 'email', 'phone', 'resume_file')
+            'fields': ('job', 'user', 'name', 'email', 'phone', 'resume_file')
         }),
         ('Controle de Admissão', {
             'fields': ('status', 'hr_notes'),
@@ -98,14 +100,79 @@ class CandidateAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('job')
+        if self._is_export(request):
+            # Sem o GROUP BY abaixo: a planilha sai na ordem do índice, sem esperar o agrupamento
+            return queryset
+        # Vaga via JOIN e contagem de documentos por agregação condicional:
+        # a listagem faz um número fixo de consultas, seja qual for o tamanho da página.
+        return queryset.annotate(
+            docs_total=Count('documents'),
+            docs_pendentes=Count('documents', filter=Q(documents__status='PENDENTE')),
+            docs_validados=Count('documents', filter=Q(documents__status='VALIDADO')),
+        )
+
+    def _is_export(self, request):
+        return getattr(request, 'candidate_export', False) or request.POST.get('action') in self.EXPORT_ACTIONS
+
+    def get_urls(self):
+        opts = self.opts
+        return [
+            path(
+                'exportar/',
+                self.admin_site.admin_view(self.export_view),
+                name=f'{opts.app_label}_{opts.model_name}_export',
+            ),
+        ] + super().get_urls()
+
+    def export_view(self, request):
+        """Planilha com todos os candidatos da listagem atual (mesmos filtros e busca)."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        file_format = request.GET.get('formato', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            raise Http404("Formato de exportação inválido.")
+        # O restante da query string é o da listagem (filtros, busca)
+        request.GET = request.GET.copy()
+        request.GET.pop('formato', None)
+        request.candidate_export = True
+        try:
+            queryset = self.get_changelist_instance(request).get_queryset(request)
+        except IncorrectLookupParameters:
+            opts = self.opts
+            return HttpResponseRedirect(
+                reverse(f'{self.admin_site.name}:{opts.app_label}_{opts.model_name}_changelist')
+            )
+        return export_candidates(queryset, file_format)
+
+    @admin.action(description="Exportar selecionados (CSV)", permissions=['view'])
+    def exportar_csv(self, request, queryset):
+        return export_candidates(queryset, 'csv')
+
+    @admin.action(description="Exportar selecionados (XLSX)", permissions=['view'])
+    def exportar_xlsx(self, request, queryset):
+        return export_candidates(queryset, 'xlsx')
+
+    @admin.action(description="Baixar dossiê de admissão (ZIP)", permissions=['view'])
+    def baixar_dossie(self, request, queryset):
+        return dossier_response(queryset)
+
+    def get_search_results(self, request, queryset, search_term):
+        filtered = candidate_search.filter_candidates(queryset, search_term)
+        if filtered is None:
+            return queryset, False
+        return filtered, False
+
     def job_display(self, obj):
         return obj.job.title if obj.job else "Banco de Talentos"
     job_display.short_description = "Vaga"
+    job_display.admin_order_field = 'job__title'
 
     def docs_status_rh(self, obj):
-        total = obj.documents.count()
-        pendentes = obj.documents.filter(status='PENDENTE').count()
-        aprovados = obj.documents.filter(status='VALIDADO').count()
+        total = obj.docs_total
+        pendentes = obj.docs_pendentes
+        aprovados = obj.docs_validados
         
         if total == 0: return "-"
         
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CareersConfig(AppConfig):
     name = 'careers'
+
+    def ready(self):
+        # Conecta os receivers que mantêm as métricas e a busca do RH
+        from . import signals  # noqa: F401
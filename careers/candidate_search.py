@@ -0,0 +1,168 @@
+"""
+Busca de candidatos do painel do RH (tabela CandidateSearchToken).
+
+Cada candidato tem uma linha por termo: as palavras do nome, o e-mail (e as
+partes antes do '@'), o telefone e o CPF só com dígitos. Tudo em minúsculas
+e sem acentos ("João" vira "joao"). Uma busca casa quando cada palavra
+digitada é o início de algum termo do candidato: "jo silva" acha "João da
+Silva"; "92 9" acha pelo telefone; o CPF funciona com ou sem pontuação.
+
+O prefixo vira um intervalo (token >= 'jo' AND token < 'jp'), que usa o
+índice (token, candidate) em qualquer banco, sem varrer Candidate.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.apps import apps as global_apps
+from django.db import connection, transaction
+from django.db.models import Q
+
+from search.index import fold
+
+from .models import CandidateSearchToken
+
+# Candidatos processados por vez na reconstrução
+REBUILD_BATCH_SIZE = 2000
+# Palavras consideradas na busca
+MAX_QUERY_TERMS = 6
+# Termos menores que isso (ex: 'da', 'e') não entram no índice do nome
+MIN_WORD_LENGTH = 2
+
+_WORD_RE = re.compile(r'[^\W_]+')
+_NON_DIGITS_RE = re.compile(r'\D')
+# Números com pontuação de CPF/telefone: '123.456.789-00', '(92) 99999-0000'
+_NUMBER_RE = re.compile(r'^[\d.\-/()+]+$')
+_TOKEN_LENGTH = CandidateSearchToken._meta.get_field('token').max_length
+
+
+def _digits(value):
+    return _NON_DIGITS_RE.sub('', value or '')
+
+
+def candidate_tokens(candidate, cpf=None):
+    """Conjunto de termos do candidato ('cpf' vem do CandidateProfile do usuário)."""
+    tokens = {word for word in _WORD_RE.findall(fold(candidate.name or '')) if len(word) >= MIN_WORD_LENGTH}
+
+    email = fold(candidate.email or '').strip()
+    if email:
+        tokens.add(email)
+        tokens.update(_WORD_RE.findall(email.split('@')[0]))
+
+    phone = _digits(candidate.phone)
+    if phone:
+        tokens.add(phone)
+        # Sem DDI/DDD: o RH costuma digitar só o número
+        tokens.update(phone[-length:] for length in (8, 9) if len(phone) > length)
+
+    cpf = _digits(cpf)
+    if cpf:
+        tokens.add(cpf)
+    return {token[:_TOKEN_LENGTH] for token in tokens}
+
+
+def query_terms(query):
+    """Termos da busca, já no formato dos tokens."""
+    terms = []
+    for piece in fold(query).split():
+        if '@' in piece:
+            terms.append(piece)
+        elif _NUMBER_RE.match(piece):
+            terms.append(_digits(piece))
+        else:
+            terms.extend(_WORD_RE.findall(piece))
+    unique = []
+    for term in terms:
+        if term and term not in unique:
+            unique.append(term[:_TOKEN_LENGTH])
+    return unique[:MAX_QUERY_TERMS]
+
+
+def _prefix_range(term):
+    # Menor texto maior que todos os que começam com 'term'
+    return {'token__gte': term, 'token__lt': term[:-1] + chr(ord(term[-1]) + 1)}
+
+
+def filter_candidates(queryset, query):
+    """
+    Restringe o queryset de Candidate aos que casam com a busca.
+    Retorna None se a busca não tem nenhum termo.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    for term in terms:
+        queryset = queryset.filter(
+            pk__in=CandidateSearchToken.objects.filter(**_prefix_range(term)).values('candidate_id'),
+        )
+    return queryset
+
+
+def _profile_cpfs(user_ids, apps=global_apps):
+    CandidateProfile = apps.get_model('accounts', 'CandidateProfile')
+    return dict(CandidateProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'cpf'))
+
+
+def update_candidates(candidates):
+    """Atualiza os termos dos candidatos (só grava o que mudou)."""
+    candidates = list(candidates)
+    if not candidates:
+        return
+    cpfs = _profile_cpfs({c.user_id for c in candidates if c.user_id})
+    current = {}
+    for candidate_id, token in CandidateSearchToken.objects.filter(
+        candidate__in=candidates,
+    ).values_list('candidate_id', 'token'):
+        current.setdefault(candidate_id, set()).add(token)
+
+    stale, new = [], []
+    for candidate in candidates:
+        wanted = candidate_tokens(candidate, cpfs.get(candidate.user_id))
+        existing = current.get(candidate.pk, set())
+        stale += [(candidate.pk, token) for token in existing - wanted]
+        new += [CandidateSearchToken(candidate_id=candidate.pk, token=token) for token in wanted - existing]
+
+    with transaction.atomic():
+        if stale:
+            CandidateSearchToken.objects.filter(
+                reduce(or_, (Q(candidate_id=candidate_id, token=token) for candidate_id, token in stale)),
+            ).delete()
+        CandidateSearchToken.objects.bulk_create(new)
+
+
+def rebuild(apps=global_apps):
+    """
+    Refaz a tabela inteira (depois de cargas com bulk_create, que não disparam
+    signals). Usa SQL direto: com centenas de milhares de candidatos, o
+    delete() do ORM carregaria cada termo por causa dos receivers de
+    post_delete genéricos, e o bulk_create instanciaria um model por termo.
+    A migration 0010 chama com o 'apps' do RunPython (models históricos).
+    """
+    Candidate = apps.get_model('careers', 'Candidate')
+    table = connection.ops.quote_name(apps.get_model('careers', 'CandidateSearchToken')._meta.db_table)
+    insert = f"INSERT INTO {table} (candidate_id, token) VALUES (%s, %s)"
+    total = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table}")
+        queryset = Candidate.objects.only('id', 'name', 'email', 'phone', 'user_id').order_by()
+        for batch in _batches(queryset.iterator(chunk_size=REBUILD_BATCH_SIZE), REBUILD_BATCH_SIZE):
+            cpfs = _profile_cpfs({c.user_id for c in batch if c.user_id}, apps)
+            rows = [
+                (candidate.pk, token)
+                for candidate in batch
+                for token in candidate_tokens(candidate, cpfs.get(candidate.user_id))
+            ]
+            cursor.executemany(insert, rows)
+            total += len(rows)
+    return total
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,148 @@
+"""
+Dossiê de admissão: ZIP com o currículo e os documentos enviados de um ou
+mais candidatos, mais um manifesto (manifesto.csv).
+
+O ZIP é montado enquanto é enviado (core.streaming.ZipStream): cada arquivo
+é lido do storage em pedaços de FILE_CHUNK_SIZE e repassado à resposta, sem
+montar o ZIP inteiro em memória nem em arquivo temporário. A memória usada
+não depende do tamanho dos arquivos. Medição: 'manage.py benchmark_dossier'.
+"""
+import hashlib
+import posixpath
+import zipfile
+
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from django.utils.text import slugify
+
+from core.streaming import ZipStream, csv_stream
+
+from .models import CandidateDocument
+
+# Bytes lidos do storage por vez
+FILE_CHUNK_SIZE = 1024 * 1024
+# Candidatos lidos do banco por vez (cada lote traz os documentos em uma consulta)
+CANDIDATE_CHUNK_SIZE = 100
+
+MANIFEST_NAME = 'manifesto.csv'
+MANIFEST_HEADER = [
+    "ID", "Candidato", "Vaga", "Status do Processo", "Documento", "Status do Documento",
+    "Arquivo no ZIP", "Tamanho (bytes)", "SHA-256", "Observação",
+]
+
+
+class _Entry:
+    """Um arquivo do dossiê: de onde vem no storage e para onde vai no ZIP."""
+
+    def __init__(self, candidate, label, status, field_file, arcname):
+        self.candidate = candidate
+        self.label = label
+        self.status = status
+        self.field_file = field_file
+        self.arcname = arcname
+        self.size = None
+        self.sha256 = ''
+        self.note = ''
+
+    def manifest_row(self):
+        candidate = self.candidate
+        return [
+            candidate.pk, candidate.name, candidate.job.title if candidate.job else "Banco de Talentos",
+            candidate.get_status_display(), self.label, self.status,
+            self.arcname if self.size is not None else '', self.size, self.sha256, self.note,
+        ]
+
+
+def _folder(candidate):
+    return f"{candidate.pk}-{slugify(candidate.name) or 'candidato'}"
+
+
+def _entries(candidate):
+    """Arquivos de um candidato, com nomes únicos dentro da pasta dele."""
+    folder = _folder(candidate)
+    used = set()
+
+    def arcname(base, field_file):
+        extension = posixpath.splitext(field_file.name)[1].lower() if field_file else ''
+        name, counter = f"{base}{extension}", 2
+        while name in used:
+            name, counter = f"{base}-{counter}{extension}", counter + 1
+        used.add(name)
+        return f"{folder}/{name}"
+
+    yield _Entry(candidate, "Currículo", '', candidate.resume_file, arcname('curriculo', candidate.resume_file))
+    for document in candidate.documents.all():
+        yield _Entry(
+            candidate, document.doc_type.title, document.get_status_display(), document.file,
+            arcname(slugify(document.doc_type.title) or 'documento', document.file),
+        )
+
+
+def _write_entry(archive, output, entry):
+    """Copia o arquivo para o ZIP em pedaços, devolvendo os bytes do ZIP a cada pedaço."""
+    if not entry.field_file:
+        entry.note = "Não enviado"
+        return
+    storage = entry.field_file.storage
+    try:
+        source = storage.open(entry.field_file.name, 'rb')
+    except OSError:
+        entry.note = "Arquivo não encontrado no servidor"
+        return
+
+    with source:
+        info = zipfile.ZipInfo(entry.arcname, date_time=timezone.localtime().timetuple()[:6])
+        # PDFs e imagens já são comprimidos: guardar sem compressão mantém a
+        # vazão no limite do disco/rede em vez do limite da CPU
+        info.compress_type = zipfile.ZIP_STORED
+        try:
+            # Com o tamanho conhecido, o zipfile decide sozinho se precisa do ZIP64 (> 2 GiB)
+            info.file_size = storage.size(entry.field_file.name)
+        except (OSError, NotImplementedError):
+            pass
+        digest, size = hashlib.sha256(), 0
+        with archive.open(info, 'w', force_zip64=not info.file_size) as target:
+            while chunk := source.read(FILE_CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+                target.write(chunk)
+                yield output.drain()
+    entry.size = size
+    entry.sha256 = digest.hexdigest()
+
+
+def dossier_stream(candidates):
+    """Bytes do ZIP com a pasta de cada candidato e o manifesto no fim."""
+    output = ZipStream()
+    manifest = []
+    with zipfile.ZipFile(output, 'w') as archive:
+        for candidate in candidates:
+            for entry in _entries(candidate):
+                yield from _write_entry(archive, output, entry)
+                manifest.append(entry.manifest_row())
+        archive.writestr(
+            MANIFEST_NAME, b''.join(csv_stream(MANIFEST_HEADER, manifest)), compress_type=zipfile.ZIP_DEFLATED,
+        )
+    yield output.drain()
+
+
+def dossier_candidates(queryset):
+    """Candidatos com vaga e documentos (uma consulta a mais por lote)."""
+    documents = CandidateDocument.objects.select_related('doc_type').order_by('doc_type__title', 'pk')
+    return queryset.select_related('job').prefetch_related(
+        Prefetch('documents', queryset=documents),
+    ).order_by('pk').iterator(chunk_size=CANDIDATE_CHUNK_SIZE)
+
+
+def dossier_response(queryset):
+    """StreamingHttpResponse com o dossiê dos candidatos do queryset."""
+    first = list(queryset.order_by('pk')[:2])
+    if len(first) == 1:
+        filename = f"dossie-{_folder(first[0])}.zip"
+    else:
+        filename = f"dossies-{timezone.localdate():%Y-%m-%d}.zip"
+    response = StreamingHttpResponse(dossier_stream(dossier_candidates(queryset)), content_type='application/zip')
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
@@ -0,0 +1,60 @@
+"""
+Exportação dos candidatos do painel do RH em planilha (CSV ou XLSX).
+
+Uma única consulta traz o candidato, a vaga e a contagem de documentos por
+status. As contagens são subconsultas correlacionadas (índice
+documento_candidato_status_idx) em vez de JOIN + GROUP BY: assim o banco
+devolve as linhas na ordem do índice de 'sent_at' à medida que as lê, e o
+download começa sem esperar o agrupamento da tabela inteira.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.streaming import streaming_export
+
+from .models import Candidate, CandidateDocument, JobOpportunity
+
+# Linhas lidas do banco por vez
+EXPORT_CHUNK_SIZE = 2000
+
+DOCUMENT_STATUSES = [status for status, _ in CandidateDocument.STATUS_CHOICES]
+
+HEADER = [
+    "ID", "Nome", "E-mail", "Telefone", "Vaga", "Departamento", "Status", "Enviado em",
+    "Aceitou Termos/LGPD", "Documentos", *[label for _, label in CandidateDocument.STATUS_CHOICES],
+]
+
+
+def _document_count(status=None):
+    documents = CandidateDocument.objects.filter(candidate=OuterRef('pk'))
+    if status:
+        documents = documents.filter(status=status)
+    count = documents.order_by().values('candidate').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(count, output_field=IntegerField()), Value(0))
+
+
+def export_rows(queryset):
+    """Linhas da planilha para o queryset de Candidate (já filtrado pelo admin)."""
+    status_labels = dict(Candidate.STATUS_CHOICES)
+    department_labels = dict(JobOpportunity._meta.get_field('department').choices)
+    rows = queryset.order_by('-sent_at').annotate(
+        docs_total=_document_count(),
+        **{f'docs_{status.lower()}': _document_count(status) for status in DOCUMENT_STATUSES},
+    ).values_list(
+        'id', 'name', 'email', 'phone', 'job__title', 'job__department', 'status', 'sent_at', 'terms_accepted',
+        'docs_total', *[f'docs_{status.lower()}' for status in DOCUMENT_STATUSES],
+    )
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        candidate_id, name, email, phone, job, department, status, *rest = row
+        yield [
+            candidate_id, name, email, phone, job or "Banco de Talentos",
+            department_labels.get(department, department or ''),
+            status_labels.get(status, status), *rest,
+        ]
+
+
+def export_candidates(queryset, file_format):
+    """StreamingHttpResponse com a planilha dos candidatos."""
+    filename = f"candidatos-{timezone.localdate():%Y-%m-%d}"
+    return streaming_export(file_format, filename, HEADER, export_rows(queryset))
@@ -0,0 +1,38 @@
+"""
+Vínculo das candidaturas sem conta (cadastradas pelo RH ou antes do campo
+'user') à conta do site com o mesmo e-mail.
+
+O e-mail é comparado sem diferenciar maiúsculas nem espaços nas pontas, e um
+e-mail usado por mais de uma conta é ambíguo: nenhuma delas recebe as
+candidaturas. Usado no cadastro (accounts.views.register) e, em lote, por
+'manage.py link_candidates_to_users'.
+"""
+from django.contrib.auth.models import User
+from django.db.models.functions import Lower, Trim
+
+from . import candidate_search
+from .models import Candidate
+
+
+def email_key(email):
+    return (email or '').strip().lower()
+
+
+def _by_email_key(queryset, key):
+    # O mesmo email_key, calculado no banco (um 'iexact' não ignora os espaços)
+    return queryset.alias(email_key=Lower(Trim('email'))).filter(email_key=key)
+
+
+def link_candidates(user):
+    """Vincula a 'user' as candidaturas sem conta com o e-mail dele. Retorna quantas."""
+    key = email_key(user.email)
+    if not key or _by_email_key(User.objects.exclude(pk=user.pk), key).exists():
+        return 0
+    candidates = list(_by_email_key(Candidate.objects.filter(user__isnull=True), key))
+    if candidates:
+        Candidate.objects.filter(pk__in=[candidate.pk for candidate in candidates]).update(user=user)
+        for candidate in candidates:
+            candidate.user = user
+        # O update() não dispara signals: o CPF do perfil entra nos termos de busca aqui
+        candidate_search.update_candidates(candidates)
+    return len(candidates)
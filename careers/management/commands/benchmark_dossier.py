@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from careers.dossier import dossier_candidates, dossier_stream
+from careers.models import Candidate, CandidateDocument, DocumentType
+
+MB = 1024 * 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede vazão e pico de memória do dossiê de admissão (ZIP em streaming) com um candidato "
+        "de arquivos grandes. Usa um MEDIA_ROOT temporário e desfaz os registros no fim."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=int, default=500, help="Tamanho total dos arquivos do candidato")
+        parser.add_argument('--files', type=int, default=10, help="Quantidade de documentos (além do currículo)")
+        parser.add_argument('--output', help="Grava o ZIP gerado neste arquivo (padrão: descarta)")
+
+    def handle(self, *args, **options):
+        file_size = options['size_mb'] * MB // (options['files'] + 1)
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            with transaction.atomic():
+                candidate = self.create_candidate(media_root, options['files'], file_size)
+                self.measure(Candidate.objects.filter(pk=candidate.pk), options['output'])
+                transaction.set_rollback(True)
+
+    def create_candidate(self, media_root, files, file_size):
+        self.stdout.write(f"Gerando {files + 1} arquivo(s) de {file_size / MB:.1f} MB...")
+        os.makedirs(os.path.join(media_root, 'benchmark'))
+        names = []
+        for index in range(files + 1):
+            name = f'benchmark/arquivo-{index}.pdf'
+            with open(os.path.join(media_root, name), 'wb') as fp:
+                # Dados aleatórios: não comprimem, como PDFs e fotos de documentos
+                for start in range(0, file_size, 4 * MB):
+                    fp.write(os.urandom(min(4 * MB, file_size - start)))
+            names.append(name)
+
+        candidate = Candidate.objects.create(
+            name="Candidato Benchmark Dossiê", email='dossie@benchmark.invalid', phone='0', resume_file=names[0],
+        )
+        doc_type = DocumentType.objects.create(title="Documento Benchmark")
+        CandidateDocument.objects.bulk_create([
+            CandidateDocument(candidate=candidate, doc_type=doc_type, file=name, status='ENVIADO')
+            for name in names[1:]
+        ])
+        return candidate
+
+    def measure(self, queryset, output):
+        target = open(output, 'wb') if output else None
+        total = chunks = largest = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        first_byte = None
+        try:
+            for chunk in dossier_stream(dossier_candidates(queryset)):
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+                total += len(chunk)
+                chunks += 1
+                largest = max(largest, len(chunk))
+                if target:
+                    target.write(chunk)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            if target:
+                target.close()
+
+        self.stdout.write(
+            f"ZIP: {total / MB:.1f} MB em {chunks} pedaços (maior: {largest / 1024:.0f} KiB)\n"
+            f"Primeiro byte: {first_byte * 1000:.1f} ms  Total: {elapsed:.2f} s  "
+            f"Vazão: {total / MB / elapsed:.1f} MB/s\n"
+            f"Pico de memória (tracemalloc): {peak / MB:.1f} MB"
+        )
+        if output:
+            self.stdout.write(self.style.SUCCESS(f"ZIP gravado em {output}"))
@@ -0,0 +1,67 @@
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from careers import candidate_search
+from careers.linking import email_key
+from careers.models import Candidate
+
+
+class Command(BaseCommand):
+    help = (
+        "Vincula candidaturas antigas (sem 'user') à conta do site com o mesmo e-mail. "
+        "Processa em lotes e pode ser executado mais de uma vez."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Só mostra quantas seriam vinculadas")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # E-mail (careers.linking.email_key) -> id do usuário. E-mails usados
+        # por mais de uma conta são ambíguos e ficam de fora.
+        emails = Counter()
+        user_by_email = {}
+        for user_id, email in User.objects.exclude(email='').values_list('id', 'email').iterator(chunk_size=batch_size):
+            key = email_key(email)
+            emails[key] += 1
+            user_by_email[key] = user_id
+        ambiguous = {email for email, count in emails.items() if count > 1}
+
+        linked = skipped = 0
+        last_pk = 0
+        while True:
+            # Paginação por pk: cada lote é uma consulta indexada
+            batch = list(
+                Candidate.objects.filter(user__isnull=True, pk__gt=last_pk)
+                .order_by('pk').only('pk', 'name', 'email', 'phone')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            to_update = []
+            for candidate in batch:
+                key = email_key(candidate.email)
+                if key in user_by_email and key not in ambiguous:
+                    candidate.user_id = user_by_email[key]
+                    to_update.append(candidate)
+                else:
+                    skipped += 1
+
+            if to_update and not options['dry_run']:
+                with transaction.atomic():
+                    Candidate.objects.bulk_update(to_update, ['user'], batch_size=batch_size)
+                    # bulk_update não dispara signals: o CPF do perfil entra nos termos de busca aqui
+                    candidate_search.update_candidates(to_update)
+            linked += len(to_update)
+            self.stdout.write(f"... até o candidato #{last_pk}: {linked} vinculado(s)")
+
+        if ambiguous:
+            self.stdout.write(self.style.WARNING(f"{len(ambiguous)} e-mail(s) usados por mais de uma conta foram ignorados."))
+        verb = "seriam vinculadas" if options['dry_run'] else "vinculadas"
+        self.stdout.write(self.style.SUCCESS(f"{linked} candidatura(s) {verb}; {skipped} sem conta correspondente."))
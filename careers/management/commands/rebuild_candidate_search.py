@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from careers import candidate_search
+
+
+class Command(BaseCommand):
+    help = "Refaz do zero os termos de busca dos candidatos do painel do RH (tabela CandidateSearchToken)."
+
+    def handle(self, *args, **options):
+        total = candidate_search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Busca de candidatos refeita: {total} termos."))
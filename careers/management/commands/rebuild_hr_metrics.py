@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from careers import metrics
+
+
+class Command(BaseCommand):
+    help = "Recalcula do zero as métricas do dashboard do RH (tabela HRMetric)."
+
+    def handle(self, *args, **options):
+        metrics.rebuild()
+        self.stdout.write(self.style.SUCCESS("Métricas do RH recalculadas."))
@@ -0,0 +1,132 @@
+"""
+Métricas materializadas do dashboard do RH (tabela HRMetric).
+
+Chaves:
+    candidatos_total      todos os candidatos
+    banco_talentos        candidatos sem vaga
+    status:<STATUS>       candidatos em cada status
+    vagas_abertas         vagas com is_active=True
+    vaga:<id>             candidatos da vaga (linha com 'job' preenchido)
+"""
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Count, F, Max
+from django.utils import timezone
+
+from .models import HRMetric
+
+
+def job_key(job_id):
+    return f'vaga:{job_id}'
+
+
+def add(key, delta, job_id=None):
+    """Soma 'delta' à métrica (criando a linha se necessário)."""
+    updated = HRMetric.objects.filter(key=key).update(value=F('value') + delta, updated_at=timezone.now())
+    if not updated:
+        metric, created = HRMetric.objects.get_or_create(key=key, defaults={'value': delta, 'job_id': job_id})
+        if not created:
+            HRMetric.objects.filter(key=key).update(value=F('value') + delta, updated_at=timezone.now())
+
+
+def candidate_changed(old, new):
+    """
+    Aplica a diferença entre dois estados (status, job_id) de um candidato.
+    'old' é None na criação e 'new' é None na exclusão.
+    """
+    if old == new:
+        return
+    if old is None:
+        add('candidatos_total', 1)
+    if new is None:
+        add('candidatos_total', -1)
+
+    old_status, old_job = old or (None, None)
+    new_status, new_job = new or (None, None)
+
+    if old_status != new_status:
+        if old is not None:
+            add(f'status:{old_status}', -1)
+        if new is not None:
+            add(f'status:{new_status}', 1)
+
+    if old is None or new is None or old_job != new_job:
+        if old is not None:
+            _add_to_job(old_job, -1)
+        if new is not None:
+            _add_to_job(new_job, 1)
+
+
+def _add_to_job(job_id, delta):
+    # Candidato sem vaga conta no Banco de Talentos
+    if job_id:
+        add(job_key(job_id), delta, job_id)
+    else:
+        add('banco_talentos', delta)
+
+
+def job_changed(job_id, was_active, is_active, created=False):
+    if created:
+        # Linha da vaga já existe com 0 para aparecer no ranking
+        add(job_key(job_id), 0, job_id)
+    if was_active != is_active:
+        add('vagas_abertas', 1 if is_active else -1)
+
+
+def job_deleted(job_id, was_active, candidates):
+    """
+    A linha 'vaga:<id>' some junto com a vaga (CASCADE). Os candidatos da
+    vaga passam para o Banco de Talentos (on_delete=SET_NULL, sem signals).
+    """
+    if was_active:
+        add('vagas_abertas', -1)
+    if candidates:
+        add('banco_talentos', candidates)
+
+
+@transaction.atomic
+def rebuild(apps=global_apps):
+    """
+    Recalcula todas as métricas do zero (manage.py rebuild_hr_metrics). A
+    migration 0009 chama com o 'apps' do RunPython, para usar os models daquele
+    ponto do histórico.
+    """
+    Candidate = apps.get_model('careers', 'Candidate')
+    HRMetric = apps.get_model('careers', 'HRMetric')
+    JobOpportunity = apps.get_model('careers', 'JobOpportunity')
+    HRMetric.objects.all().delete()
+    metrics = [
+        HRMetric(key='candidatos_total', value=Candidate.objects.count()),
+        HRMetric(key='banco_talentos', value=Candidate.objects.filter(job__isnull=True).count()),
+        HRMetric(key='vagas_abertas', value=JobOpportunity.objects.filter(is_active=True).count()),
+    ]
+    for row in Candidate.objects.values('status').annotate(total=Count('id')).order_by():
+        metrics.append(HRMetric(key=f"status:{row['status']}", value=row['total']))
+    for job_id, total in JobOpportunity.objects.annotate(total=Count('candidates')).values_list('id', 'total'):
+        metrics.append(HRMetric(key=job_key(job_id), value=total, job_id=job_id))
+    HRMetric.objects.bulk_create(metrics, batch_size=1000)
+
+
+def dashboard_metrics():
+    """Lê as métricas no formato usado por templates/admin/rh_dashboard.html."""
+    # A migration 0009 monta a tabela; daí em diante os signals a mantêm
+    values = dict(HRMetric.objects.filter(job__isnull=True).values_list('key', 'value'))
+
+    top_vagas = []
+    for metric in HRMetric.objects.filter(job__is_active=True).select_related('job').order_by('-value')[:5]:
+        metric.job.num_cand = metric.value
+        top_vagas.append(metric.job)
+
+    return {
+        'vagas_abertas': values.get('vagas_abertas', 0),
+        'total_candidatos': values.get('candidatos_total', 0),
+        'banco_talentos': values.get('banco_talentos', 0),
+        'funil': {
+            'novos': values.get('status:NOVO', 0),
+            'entrevista': values.get('status:ENTREVISTA', 0),
+            'admissao': values.get('status:AGUARDANDO_DOCS', 0) + values.get('status:DOCS_EM_ANALISE', 0),
+            'contratados': values.get('status:CONTRATADO', 0),
+        },
+        'top_vagas': top_vagas,
+        'atualizado_em': HRMetric.objects.aggregate(ultima=Max('updated_at'))['ultima'],
+    }
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 09:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0003_candidate_terms_accepted_candidate_terms_accepted_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HRMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True, verbose_name='Métrica')),
+                ('value', models.IntegerField(default=0, verbose_name='Valor')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('job', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='metric', to='careers.jobopportunity')),
+            ],
+            options={
+                'verbose_name': 'Métrica do RH',
+                'verbose_name_plural': 'Métricas do RH',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-18 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0004_hrmetric'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['email', '-sent_at'], name='candidato_email_recentes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['-sent_at'], name='candidato_recentes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidatedocument',
+            index=models.Index(fields=['candidate', 'status'], name='documento_candidato_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='vaga_aberta_recentes_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0006_candidate_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobopportunity',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(fields=['updated_at', 'id'], name='vaga_alteracoes_idx'),
+        ),
+    ]
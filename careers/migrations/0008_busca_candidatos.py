@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 10:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0007_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100, verbose_name='Termo')),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='careers.candidate')),
+            ],
+            options={
+                'verbose_name': 'Termo de Busca do Candidato',
+                'verbose_name_plural': 'Termos de Busca dos Candidatos',
+                'indexes': [models.Index(fields=['token', 'candidate'], name='candidato_busca_termo_idx')],
+            },
+        ),
+    ]
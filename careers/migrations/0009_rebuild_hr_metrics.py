@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-18 14:05
+
+from django.db import migrations
+
+
+def rebuild_hr_metrics(apps, schema_editor):
+    # Monta as métricas com os dados existentes antes que os signals criem
+    # contadores parciais (ver careers.metrics)
+    from careers.metrics import rebuild
+
+    rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0008_busca_candidatos'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_hr_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 15:10
+
+from django.db import migrations
+
+
+def backfill_candidate_search(apps, schema_editor):
+    # A busca do painel do RH lê só a tabela de termos (0008): preenche com os
+    # candidatos existentes (ver careers.candidate_search)
+    from careers.candidate_search import rebuild
+
+    rebuild(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_image_variants'),
+        ('careers', '0009_rebuild_hr_metrics'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_candidate_search, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.auth.models import User
 
 class JobOpportunity(models.Model):
     """
@@ -24,11 +25,19 @@ class JobOpportunity(models.Model):
     
     is_active = models.BooleanField("Vaga Aberta?", default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Usado pela sincronização incremental (core.sync)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Vaga"
         verbose_name_plural = "Vagas Disponíveis"
         ordering = ['-created_at']
+        indexes = [
+            # Vagas abertas, mais recentes primeiro (careers_home, API)
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='vaga_aberta_recentes_idx'),
+            # Alterações desde o último sync (core.sync)
+            models.Index(fields=['updated_at', 'id'], name='vaga_alteracoes_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.location})"
@@ -40,6 +49,9 @@ class Candidate(models.Model):
     """
     # Vaga é opcional (null=True), pois ele pode mandar para "Banco de Talentos" geral
     job = models.ForeignKey(JobOpportunity, on_delete=models.SET_NULL, null=True, blank=True, related_name="candidates", verbose_name="Vaga Pretendida")
+    # Conta do site que enviou a candidatura (vazio para candidatos cadastrados pelo RH).
+    # Indexado junto com 'sent_at' em Meta.indexes.
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, db_index=False, related_name="applications", verbose_name="Usuário")
     
     name = models.CharField("Nome Completo", max_length=100)
     email = models.EmailField("E-mail")
@@ -73,10 +85,40 @@ class Candidate(models.Model):
         verbose_name = "Candidato"
         verbose_name_plural = "Gestão de Candidatos"
         ordering = ['-sent_at']
+        indexes = [
+            # Vínculo de candidaturas antigas por e-mail (link_candidates_to_users)
+            models.Index(fields=['email', '-sent_at'], name='candidato_email_recentes_idx'),
+            # Candidaturas do usuário logado: filter(user=...).order_by('-sent_at')
+            models.Index(fields=['user', '-sent_at'], name='candidato_usuario_recentes_idx'),
+            # Listagem do RH (ordenação padrão)
+            models.Index(fields=['-sent_at'], name='candidato_recentes_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.get_status_display()}"
     
+class CandidateSearchToken(models.Model):
+    """
+    Palavras normalizadas (minúsculas, sem acento) de cada candidato: nome,
+    e-mail, telefone e CPF do perfil. A busca do painel do RH procura por
+    prefixo no índice desta tabela em vez de 'icontains' em Candidate.
+    Mantida pelos signals (ver careers/candidate_search.py).
+    """
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField("Termo", max_length=100)
+
+    class Meta:
+        verbose_name = "Termo de Busca do Candidato"
+        verbose_name_plural = "Termos de Busca dos Candidatos"
+        indexes = [
+            # Busca por prefixo (token >= 'joa' AND token < 'job') já devolvendo o candidato
+            models.Index(fields=['token', 'candidate'], name='candidato_busca_termo_idx'),
+        ]
+
+    def __str__(self):
+        return self.token
+
+
 class DocumentType(models.Model):
     """Catálogo de tipos de documentos que a empresa pode pedir."""
     title = models.CharField("Nome do Documento", max_length=100, help_text="Ex: CNH, RG, Comprovante de Residência")
@@ -108,6 +150,29 @@ class CandidateDocument(models.Model):
     class Meta:
         verbose_name = "Documento do Candidato"
         verbose_name_plural = "Documentos Solicitados"
+        indexes = [
+            # Contagem de documentos por status no painel do RH
+            models.Index(fields=['candidate', 'status'], name='documento_candidato_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.doc_type} - {self.candidate.name}"
+
+class HRMetric(models.Model):
+    """
+    Métricas do painel do RH, mantidas incrementalmente pelos signals de
+    Candidate e JobOpportunity (ver careers/metrics.py). O dashboard só lê
+    esta tabela, sem agregar a tabela de candidatos a cada acesso.
+    """
+    key = models.CharField("Métrica", max_length=100, unique=True)
+    value = models.IntegerField("Valor", default=0)
+    # Preenchido nas métricas por vaga (quantidade de candidatos da vaga)
+    job = models.OneToOneField(JobOpportunity, on_delete=models.CASCADE, null=True, blank=True, related_name='metric')
+    updated_at = models.DateTimeField("Atualizado em", auto_now=True)
+
+    class Meta:
+        verbose_name = "Métrica do RH"
+        verbose_name_plural = "Métricas do RH"
 
     def __str__(self):
-        return f"{self.doc_type} - {self.candidate.name}"
\ No newline at end of file
+        return f"{self.key} = {self.value}"
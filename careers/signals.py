@@ -0,0 +1,67 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from accounts.models import CandidateProfile
+
+from . import candidate_search, metrics
+from .models import Candidate, JobOpportunity
+
+
+# --- Métricas do dashboard do RH (careers/metrics.py) ---
+
+@receiver(pre_save, sender=Candidate)
+def remember_candidate_state(sender, instance, raw=False, **kwargs):
+    # Estado gravado no banco antes da alteração (status, vaga)
+    instance._metric_old_state = None
+    if instance.pk and not raw:
+        instance._metric_old_state = Candidate.objects.filter(pk=instance.pk).values_list('status', 'job_id').first()
+
+
+@receiver(post_save, sender=Candidate)
+def update_candidate_metrics(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    metrics.candidate_changed(getattr(instance, '_metric_old_state', None), (instance.status, instance.job_id))
+
+
+@receiver(post_delete, sender=Candidate)
+def remove_candidate_metrics(sender, instance, **kwargs):
+    metrics.candidate_changed((instance.status, instance.job_id), None)
+
+
+@receiver(pre_save, sender=JobOpportunity)
+def remember_job_state(sender, instance, raw=False, **kwargs):
+    instance._metric_was_active = False
+    if instance.pk and not raw:
+        instance._metric_was_active = JobOpportunity.objects.filter(pk=instance.pk, is_active=True).exists()
+
+
+@receiver(post_save, sender=JobOpportunity)
+def update_job_metrics(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    metrics.job_changed(instance.pk, getattr(instance, '_metric_was_active', False), instance.is_active, created=created)
+
+
+@receiver(pre_delete, sender=JobOpportunity)
+def remove_job_metrics(sender, instance, **kwargs):
+    # Precisa rodar antes do SET_NULL nos candidatos
+    candidates = instance.candidates.count()
+    was_active = JobOpportunity.objects.filter(pk=instance.pk, is_active=True).exists()
+    metrics.job_deleted(instance.pk, was_active, candidates)
+
+
+# --- Busca de candidatos do painel do RH (careers/candidate_search.py) ---
+
+@receiver(post_save, sender=Candidate)
+def update_candidate_search(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    candidate_search.update_candidates([instance])
+
+
+@receiver([post_save, post_delete], sender=CandidateProfile)
+def update_profile_candidates_search(sender, instance, raw=False, **kwargs):
+    # O CPF do perfil faz parte dos termos de todas as candidaturas do usuário
+    if raw:
+        return
+    candidate_search.update_candidates(Candidate.objects.filter(user_id=instance.user_id))
@@ -0,0 +1,39 @@
+from PIL import Image
+
+from core.files import sniff_content_type
+from tasks.queue import task
+from .models import CandidateDocument
+
+# Tipos aceitos como documento digitalizado
+ACCEPTED_DOCUMENT_TYPES = {'application/pdf', 'image/jpeg', 'image/png', 'image/webp', 'image/heic'}
+
+
+@task
+def verify_candidate_document(document_id):
+    """
+    Confere o arquivo enviado pelo candidato no onboarding. Se estiver
+    corrompido ou não for PDF/imagem, devolve o documento como 'REJEITADO'
+    para que o candidato reenvie, sem o RH precisar abrir o arquivo.
+    """
+    document = CandidateDocument.objects.filter(id=document_id, status='ENVIADO').first()
+    if document is None or not document.file:
+        return
+
+    problem = None
+    with document.file.open('rb') as f:
+        content_type = sniff_content_type(f.read(16))
+        if content_type not in ACCEPTED_DOCUMENT_TYPES:
+            problem = "Formato não aceito. Envie o documento em PDF ou como foto (JPG/PNG)."
+        elif content_type.startswith('image/') and content_type != 'image/heic':
+            f.seek(0)
+            try:
+                with Image.open(f) as image:
+                    image.verify()
+            except Exception:
+                problem = "A imagem enviada está corrompida. Tire uma nova foto e reenvie."
+
+    if problem:
+        # update() para não sobrescrever uma revisão que o RH tenha feito nesse meio tempo
+        CandidateDocument.objects.filter(id=document.id, status='ENVIADO', file=document.file.name).update(
+            status='REJEITADO', rejection_reason=problem
+        )
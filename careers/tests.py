@@ -1,3 +1,327 @@
+import csv
+import hashlib
+import io
+import zipfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db.models import Count, Q
 from django.test import TestCase
+from django.urls import reverse
+
+from core.testing import QueryPlanAssertionsMixin, TempMediaRootMixin
+from core.uploadhandlers import MB
+from accounts.models import CandidateProfile
+from . import candidate_search
+from .linking import link_candidates
+from .models import Candidate, CandidateDocument, CandidateSearchToken, DocumentType, JobOpportunity
+
+PDF = b'%PDF-1.4\n' + b'0' * 64
+
+
+class QueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+    """As consultas mais frequentes de careers/accounts precisam usar índice."""
+
+    def test_historico_do_candidato(self):
+        self.assertUsesIndex(Candidate.objects.filter(user_id=1).order_by('-sent_at'))
+
+    def test_candidatura_duplicada(self):
+        self.assertUsesIndex(Candidate.objects.filter(user_id=1, job_id=1))
+
+    def test_vinculo_por_email(self):
+        self.assertUsesIndex(Candidate.objects.filter(user__isnull=True, email='joao@example.com'))
+
+    def test_listagem_do_rh(self):
+        self.assertUsesIndex(Candidate.objects.all()[:100])
+
+    def test_documentos_por_status(self):
+        self.assertUsesIndex(CandidateDocument.objects.filter(candidate_id=1, status='PENDENTE'))
+
+    def test_contagem_de_documentos_na_listagem_do_rh(self):
+        self.assertUsesIndex(Candidate.objects.select_related('job').annotate(
+            docs_total=Count('documents'),
+            docs_pendentes=Count('documents', filter=Q(documents__status='PENDENTE')),
+        )[:100])
+
+    def test_vagas_abertas(self):
+        self.assertUsesIndex(JobOpportunity.objects.filter(is_active=True))
+
+
+class OnboardingUploadTests(TempMediaRootMixin, TestCase):
+    """Documento do onboarding conferido enquanto chega (core.uploadhandlers)."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('candidato', 'candidato@example.com', 'senha')
+        self.client.force_login(self.user)
+        self.candidate = Candidate.objects.create(
+            user=self.user, name="Candidato Teste", email=self.user.email, phone='0', resume_file='resumes/cv.pdf',
+        )
+        self.document = CandidateDocument.objects.create(
+            candidate=self.candidate, doc_type=DocumentType.objects.create(title="RG"),
+        )
+        self.url = reverse('onboarding', args=[self.candidate.pk])
+
+    def post(self, filename, content):
+        return self.client.post(self.url, {
+            'doc_id': self.document.pk, 'file': SimpleUploadedFile(filename, content),
+        }, follow=True)
+
+    def assertRejected(self, response, message):
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(message, [str(m) for m in response.context['messages']][0])
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.status, 'PENDENTE')
+        self.assertEqual(self.media_files(), [])
+
+    def test_documento_aceito(self):
+        response = self.post('rg.pdf', PDF)
+        self.assertRedirects(response, self.url)
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.status, 'ENVIADO')
+        self.assertEqual(self.media_files(), [self.document.file.name])
+
+    def test_arquivo_vazio(self):
+        self.assertRejected(self.post('rg.pdf', b''), "vazio")
+
+    def test_arquivo_menor_que_a_assinatura(self):
+        self.assertRejected(self.post('rg.pdf', b'abcde'), "Formato não aceito")
+
+    def test_tipo_nao_aceito(self):
+        self.assertRejected(self.post('rg.pdf', b'<html>' + b'0' * 64), "Formato não aceito")
+
+    def test_arquivo_maior_que_o_limite(self):
+        self.assertRejected(self.post('rg.pdf', PDF + b'0' * 25 * MB), "limite de 25 MB")
+
+
+class LinkCandidatesTests(TestCase):
+    """Cadastro e 'link_candidates_to_users' vinculam as mesmas candidaturas (careers.linking)."""
+
+    def setUp(self):
+        for email in ('Joao@Example.com', ' joao@example.com', 'ana@example.com', 'ana@example.com'):
+            Candidate.objects.create(name="Candidato", email=email, phone='0', resume_file='resumes/cv.pdf')
+
+    def test_email_sem_diferenciar_maiusculas(self):
+        user = User.objects.create_user('joao', 'joao@example.com')
+        self.assertEqual(link_candidates(user), 2)
+        self.assertEqual(Candidate.objects.filter(user=user).count(), 2)
+
+    def test_email_ambiguo(self):
+        User.objects.create_user('ana', 'ana@example.com')
+        user = User.objects.create_user('ana2', 'ANA@example.com')
+        self.assertEqual(link_candidates(user), 0)
+
+    def test_mesmo_resultado_do_comando(self):
+        users = [User.objects.create_user('joao', 'JOAO@example.com'), User.objects.create_user('ana', 'ana@example.com')]
+        for user in users:
+            link_candidates(user)
+        linked = set(Candidate.objects.values_list('pk', 'user'))
+        Candidate.objects.update(user=None)
+        call_command('link_candidates_to_users', stdout=StringIO())
+        self.assertEqual(set(Candidate.objects.values_list('pk', 'user')), linked)
+
+    def test_cpf_do_perfil_entra_na_busca(self):
+        for linker in ('cadastro', 'comando'):
+            with self.subTest(linker=linker):
+                Candidate.objects.update(user=None)
+                User.objects.all().delete()
+                user = User.objects.create_user('joao', 'joao@example.com')
+                CandidateProfile.objects.create(user=user, cpf='123.456.789-09')
+                if linker == 'cadastro':
+                    link_candidates(user)
+                else:
+                    call_command('link_candidates_to_users', stdout=StringIO())
+                found = candidate_search.filter_candidates(Candidate.objects.all(), '123.456.789-09')
+                self.assertEqual(found.count(), 2)
+
+
+class CandidateSearchTests(TestCase):
+    """Busca de candidatos do painel do RH (careers.candidate_search)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('joao', 'joao@example.com')
+        self.profile = CandidateProfile.objects.create(user=self.user, cpf='123.456.789-09')
+        self.joao = Candidate.objects.create(
+            user=self.user, name="João da Silva", email='Joao.Silva@Example.com', phone='(92) 99999-0000',
+            resume_file='resumes/cv.pdf',
+        )
+        self.ana = Candidate.objects.create(
+            name="Ana Conceição", email='ana@example.com', phone='92 98888-1111', resume_file='resumes/cv.pdf',
+        )
+
+    def found(self, query):
+        return set(candidate_search.filter_candidates(Candidate.objects.all(), query))
+
+    def test_sem_acentos_e_maiusculas(self):
+        for query in ('joao', 'JOÃO', 'João', 'conceicao', 'CONCEIÇÃO'):
+            with self.subTest(query=query):
+                self.assertEqual(len(self.found(query)), 1)
+
+    def test_prefixo_de_cada_palavra(self):
+        self.assertEqual(self.found('jo silva'), {self.joao})
+        self.assertEqual(self.found('jo ana'), set())
+        self.assertEqual(self.found('silvb'), set())
+        self.assertEqual(candidate_search._prefix_range('jo'), {'token__gte': 'jo', 'token__lt': 'jp'})
+
+    def test_email(self):
+        self.assertEqual(self.found('joao.silva@example.com'), {self.joao})
+        self.assertEqual(self.found('silva'), {self.joao})
+
+    def test_telefone(self):
+        self.assertEqual(self.found('(92) 99999-0000'), {self.joao})
+        self.assertEqual(self.found('99999-0000'), {self.joao})
+        self.assertEqual(self.found('9888'), {self.ana})
+        self.assertEqual(self.found('92'), {self.joao, self.ana})
+
+    def test_cpf_com_e_sem_pontuacao(self):
+        self.assertEqual(self.found('123.456.789-09'), {self.joao})
+        self.assertEqual(self.found('12345678909'), {self.joao})
+
+    def test_busca_sem_termos(self):
+        self.assertIsNone(candidate_search.filter_candidates(Candidate.objects.all(), ' - '))
+
+    def test_atualiza_ao_salvar_o_candidato(self):
+        self.ana.name = "Ana Pereira"
+        self.ana.save()
+        self.assertEqual(self.found('pereira'), {self.ana})
+        self.assertEqual(self.found('conceicao'), set())
+
+    def test_atualiza_ao_salvar_e_apagar_o_perfil(self):
+        self.profile.cpf = '987.654.321-00'
+        self.profile.save()
+        self.assertEqual(self.found('98765432100'), {self.joao})
+        self.assertEqual(self.found('12345678909'), set())
+        self.profile.delete()
+        self.assertEqual(self.found('98765432100'), set())
+
+    def test_rebuild(self):
+        CandidateSearchToken.objects.all().delete()
+        candidate_search.rebuild()
+        self.assertEqual(self.found('12345678909'), {self.joao})
+        self.assertEqual(self.found('ana'), {self.ana})
+
+
+class CandidateExportTests(TestCase):
+    """Exportação da listagem de candidatos do painel do RH (careers.export)."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('rh', password='x'))
+        job = JobOpportunity.objects.create(title="Eletricista", department='ENGENHARIA', description="Vaga")
+        self.ana = Candidate.objects.create(
+            job=job, name="Ana Souza", email='ana@example.com', phone='92 98888-1111', resume_file='resumes/cv.pdf',
+        )
+        self.bruno = Candidate.objects.create(
+            name="=Bruno", email='bruno@example.com', phone='92 97777-2222', resume_file='resumes/cv.pdf',
+            status='ANALISE',
+        )
+        CandidateDocument.objects.create(
+            candidate=self.ana, doc_type=DocumentType.objects.create(title="RG"), file='docs/rg.pdf',
+        )
+        self.export_url = reverse('rh_admin:careers_candidate_export')
+        self.changelist_url = reverse('rh_admin:careers_candidate_changelist')
+
+    def exported_ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode('utf-8').lstrip('\ufeff')
+        return [line.split(';')[0] for line in content.splitlines()[1:]]
+
+    def test_todos(self):
+        response = self.client.get(self.export_url)
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertEqual(self.exported_ids(response), [str(self.bruno.pk), str(self.ana.pk)])
+
+    def test_filtros_e_busca_da_listagem(self):
+        self.assertEqual(self.exported_ids(self.client.get(self.export_url, {'status': 'ANALISE'})), [str(self.bruno.pk)])
+        self.assertEqual(self.exported_ids(self.client.get(self.export_url, {'q': 'souza'})), [str(self.ana.pk)])
+
+    def test_linha_da_planilha(self):
+        response = self.client.get(self.export_url, {'q': 'ana'})
+        content = b''.join(response.streaming_content).decode('utf-8')
+        row = content.splitlines()[1].split(';')
+        self.assertEqual(row[4:7], ["Eletricista", "Engenharia", "Novo Recebido"])
+        self.assertEqual(row[-6:], ['Não', '1', '1', '0', '0', '0'])
+
+    def test_xlsx(self):
+        response = self.client.get(self.export_url, {'formato': 'xlsx', 'status': 'ANALISE'})
+        self.assertTrue(response['Content-Disposition'].endswith('.xlsx"'))
+        with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as archive:
+            sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        self.assertIn('=Bruno', sheet)
+        self.assertNotIn('Ana Souza', sheet)
+
+    def test_formato_ou_filtro_invalido(self):
+        self.assertEqual(self.client.get(self.export_url, {'formato': 'pdf'}).status_code, 404)
+        response = self.client.get(self.export_url, {'naoexiste': '1'})
+        self.assertRedirects(response, self.changelist_url, fetch_redirect_response=False)
+
+    def test_acoes_exportam_so_os_selecionados(self):
+        for action in ('exportar_csv', 'exportar_xlsx'):
+            with self.subTest(action=action):
+                response = self.client.post(self.changelist_url, {'action': action, '_selected_action': [self.ana.pk]})
+                content = b''.join(response.streaming_content)
+                if action == 'exportar_xlsx':
+                    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                        content = archive.read('xl/worksheets/sheet1.xml')
+                self.assertIn(b'Ana Souza', content)
+                self.assertNotIn(b'Bruno', content)
+
+    def test_sem_permissao_de_ver(self):
+        self.client.force_login(User.objects.create_user('equipe', password='x', is_staff=True))
+        self.assertEqual(self.client.get(self.export_url).status_code, 403)
+
+
+class DossierTests(TempMediaRootMixin, TestCase):
+    """Dossiê de admissão em ZIP (careers.dossier), pela ação do painel do RH."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('rh', password='x'))
+        rg, cnh = DocumentType.objects.create(title="RG"), DocumentType.objects.create(title="CNH")
+        self.ana = Candidate.objects.create(
+            name="Ana Souza", email='ana@example.com', phone='0',
+            resume_file=default_storage.save('resumes/ana.pdf', ContentFile(b'curriculo da ana')),
+        )
+        # Dois documentos do mesmo tipo: o segundo vira 'rg-2.pdf'
+        for content in (b'rg frente', b'rg verso'):
+            CandidateDocument.objects.create(
+                candidate=self.ana, doc_type=rg, status='VALIDADO',
+                file=default_storage.save('candidate_docs/rg.pdf', ContentFile(content)),
+            )
+        CandidateDocument.objects.create(candidate=self.ana, doc_type=cnh, status='ENVIADO', file='candidate_docs/sumiu.pdf')
+        self.bruno = Candidate.objects.create(name="Bruno", email='bruno@example.com', phone='0', resume_file='')
+        CandidateDocument.objects.create(candidate=self.bruno, doc_type=rg)
+
+    def download(self, *candidates):
+        response = self.client.post(reverse('rh_admin:careers_candidate_changelist'), {
+            'action': 'baixar_dossie', '_selected_action': [candidate.pk for candidate in candidates],
+        })
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        return response, zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_dois_candidatos(self):
+        response, archive = self.download(self.ana, self.bruno)
+        self.assertIn('dossies-', response['Content-Disposition'])
+        ana = f'{self.ana.pk}-ana-souza'
+        self.assertEqual(archive.namelist(), [f'{ana}/curriculo.pdf', f'{ana}/rg.pdf', f'{ana}/rg-2.pdf', 'manifesto.csv'])
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.read(f'{ana}/rg-2.pdf'), b'rg verso')
+
+        manifest = archive.read('manifesto.csv').decode('utf-8').lstrip('\ufeff')
+        rows = [row[4:] for row in csv.reader(io.StringIO(manifest), delimiter=';')][1:]
+        self.assertEqual(rows, [
+            ["Currículo", '', f'{ana}/curriculo.pdf', '16', hashlib.sha256(b'curriculo da ana').hexdigest(), ''],
+            ["CNH", "Em Análise pelo RH", '', '', '', "Arquivo não encontrado no servidor"],
+            ["RG", "Documento Aceito", f'{ana}/rg.pdf', '9', hashlib.sha256(b'rg frente').hexdigest(), ''],
+            ["RG", "Documento Aceito", f'{ana}/rg-2.pdf', '8', hashlib.sha256(b'rg verso').hexdigest(), ''],
+            ["Currículo", '', '', '', '', "Não enviado"],
+            ["RG", "Aguardando Envio", '', '', '', "Não enviado"],
+        ])
 
-# Create your tests here.
+    def test_um_candidato(self):
+        response, archive = self.download(self.bruno)
+        self.assertIn(f'dossie-{self.bruno.pk}-bruno.zip', response['Content-Disposition'])
+        self.assertEqual(archive.namelist(), ['manifesto.csv'])
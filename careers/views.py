@@ -1,10 +1,24 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from .models import JobOpportunity, Candidate, CandidateDocument
 from accounts.models import CandidateProfile # Importando do outro app
-
+from core.cache import cache_public_page
+from core.compression import gzip_large_responses
+from core.sync import DeltaSyncAPI
+from core.uploadhandlers import MB, UploadRule, upload_errors, validate_uploads
+from uploads import chunked
+from .tasks import ACCEPTED_DOCUMENT_TYPES, verify_candidate_document
+
+# Documento do onboarding, conferido enquanto chega (core.uploadhandlers)
+DOCUMENT_UPLOAD_RULE = UploadRule(
+    'careers.CandidateDocument.file', 25 * MB, ACCEPTED_DOCUMENT_TYPES,
+    "Formato não aceito. Envie o documento em PDF ou como foto (JPG/PNG).",
+)
+
+@cache_public_page('careers.JobOpportunity')
 def careers_home(request):
     """
     Lista as vagas abertas.
@@ -12,6 +26,16 @@ def careers_home(request):
     jobs = JobOpportunity.objects.filter(is_active=True)
     return render(request, 'careers_home.html', {'jobs': jobs})
 
+@method_decorator(gzip_large_responses, name='dispatch')
+class JobOpportunitySyncAPI(DeltaSyncAPI):
+    """Sync incremental das vagas (ver core.sync). Vagas fechadas saem como excluídas."""
+    model = JobOpportunity
+    fields = (
+        'id', 'title', 'department', 'location', 'description', 'requirements', 'benefits',
+        'salary_range', 'vacancies', 'created_at', 'updated_at',
+    )
+    active_field = 'is_active'
+
 def job_detail(request, job_id):
     """
     Exibe os detalhes completos de uma vaga.
@@ -20,73 +44,41 @@ def job_detail(request, job_id):
     return render(request, 'careers_job_detail.html', {'job': job})
 
 @login_required
-def job_apply(request, job_id):
-    """
-    Lógica para aplicar para uma vaga usando o perfil existente.
-    """
-    job = get_object_or_404(JobOpportunity, id=job_id, is_active=True)
-    user = request.user
-    
-    # 1. Tenta pegar o perfil
-    try:
-        # Tenta acessar o perfil. Se não existir, vai gerar erro.
-        if not hasattr(user, 'candidate_profile'):
-            raise ObjectDoesNotExist
-        profile = user.candidate_profile
-    except ObjectDoesNotExist:
-        messages.warning(request, "Seu perfil está incompleto. Preencha seus dados para se candidatar.")
-        return redirect('profile')
-    
-    # 2. Verifica se tem currículo anexado
-    if not profile.resume_file:
-        messages.error(request, "Você precisa anexar seu Currículo (PDF) no menu 'Meu Perfil' antes de aplicar.")
-        return redirect('profile')
-
-    # 3. Verifica se já aplicou
-    if Candidate.objects.filter(email=user.email, job=job).exists():
-        messages.warning(request, f"Você já se candidatou para a vaga de {job.title}.")
-        return redirect('careers_home')
-
-    # 4. Salva a candidatura
-    Candidate.objects.create(
-        job=job,
-        name=profile.full_name or user.username,
-        email=user.email,
-        phone=profile.phone or "Não informado",
-        resume_file=profile.resume_file,
-        message=f"Aplicação via perfil do usuário {user.username}"
-    )
-    
-    messages.success(request, f"Sucesso! Sua candidatura para {job.title} foi enviada.")
-    return redirect('careers_home')
-
-@login_required
+@validate_uploads(file=DOCUMENT_UPLOAD_RULE)
 def onboarding_view(request, candidate_id):
     """
     Tela onde o candidato vê os documentos solicitados e faz upload.
     """
-    # Segurança: Só acessa se o candidato for do usuário logado
-    candidate = get_object_or_404(Candidate, id=candidate_id, email=request.user.email)
+    # Segurança: Só acessa se a candidatura for do usuário logado
+    candidate = get_object_or_404(Candidate.objects.select_related('job'), id=candidate_id, user=request.user)
     
-    documents = candidate.documents.all()
+    documents = candidate.documents.select_related('doc_type')
 
     if request.method == 'POST':
         # Identifica qual documento está sendo enviado pelo ID escondido no form
         doc_id = request.POST.get('doc_id')
         uploaded_file = request.FILES.get('file')
+        # Com JavaScript o arquivo sobe antes, em partes (uploads.chunked), e vem só o id do envio
+        upload = chunked.completed_session(request.POST.get('upload_id'), 'candidate_document', user=request.user)
         
-        if doc_id and uploaded_file:
+        if doc_id and (uploaded_file or upload):
             doc_request = get_object_or_404(CandidateDocument, id=doc_id, candidate=candidate)
             
-            doc_request.file = uploaded_file
+            if upload:
+                chunked.save_to_field(doc_request.file, upload, save=False)
+            else:
+                doc_request.file = uploaded_file
             doc_request.status = 'ENVIADO' # Muda status automaticamente
             doc_request.rejection_reason = '' # Limpa rejeição anterior se houver
             doc_request.save()
+            # Conferência do arquivo roda no worker; a resposta volta na hora
+            verify_candidate_document.enqueue(doc_request.id)
             
             messages.success(request, f"Arquivo para {doc_request.doc_type} enviado com sucesso!")
             return redirect('onboarding', candidate_id=candidate.id)
         else:
-            messages.error(request, "Erro ao enviar arquivo.")
+            # Arquivo recusado durante o envio (tamanho ou formato) tem mensagem própria
+            messages.error(request, upload_errors(request).get('file', "Erro ao enviar arquivo."))
 
     return render(request, 'careers_onboarding.html', {
         'candidate': candidate,
@@ -98,18 +90,13 @@ def candidate_history(request):
     """
     Mostra o histórico de candidaturas do usuário logado.
     """
-    # Pega todas as candidaturas deste usuário (pelo email)
-    candidaturas = Candidate.objects.filter(email=request.user.email).order_by('-sent_at')
+    # Pega todas as candidaturas deste usuário (pela FK, indexada com 'sent_at')
+    candidaturas = Candidate.objects.filter(user=request.user).select_related('job').order_by('-sent_at')
     
     return render(request, 'careers_history.html', {
         'candidaturas': candidaturas
     })
 
-@login_required
-def candidate_history(request):
-    candidaturas = Candidate.objects.filter(email=request.user.email).order_by('-sent_at')
-    return render(request, 'careers_history.html', {'candidaturas': candidaturas})
-
 @login_required
 def job_apply(request, job_id=None):
     """
@@ -137,7 +124,7 @@ def job_apply(request, job_id=None):
         # 3. Verifica se já se candidatou recentemente (Evitar duplicidade)
         # Se for vaga específica, verifica aquela vaga. Se for banco, verifica se já está no banco.
         existing = Candidate.objects.filter(
-            email=request.user.email, 
+            user=request.user,
             job=job,
             # Se for banco de talentos (job=None), verifica status 'BANCO' ou 'NOVO'
         ).exists()
@@ -149,14 +136,15 @@ def job_apply(request, job_id=None):
         # 4. Cria a Candidatura
         # Pega os dados do Perfil do usuário para preencher o Candidato automaticamente
         try:
-            profile = request.user.candidateprofile
+            profile = request.user.candidate_profile
             
             candidate = Candidate.objects.create(
                 job=job, # Pode ser None (Banco de Talentos)
+                user=request.user,
                 name=f"{request.user.first_name} {request.user.last_name}",
                 email=request.user.email,
                 phone=profile.phone,
-                resume_file=profile.resume, # Usa o currículo do perfil
+                resume_file=profile.resume_file, # Usa o currículo do perfil
                 status='NOVO' if job else 'BANCO', # Status inicial
                 terms_accepted=True,
                 terms_accepted_at=timezone.now()
@@ -43,16 +43,22 @@ INSTALLED_APPS = [
     'services',
     'careers',
     'accounts',
+    'tasks',
+    'search',
+    'uploads',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',  # primeiro: mede a requisição inteira
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.SlowQueryMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -68,7 +74,6 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.company_settings',
-                'core.context_processors.company_settings',
             ],
         },
     },
@@ -76,6 +81,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# 'manage.py test' com METRICS_DIR temporário (core.testing.TestRunner)
+TEST_RUNNER = 'core.testing.TestRunner'
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
@@ -88,6 +96,65 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Precisa ser compartilhado entre os workers do gunicorn: é por ele que um
+# processo fica sabendo que outro alterou CompanySettings ou um conteúdo do site.
+# Em produção com mais de um servidor, trocar por Redis/Memcached.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+    }
+}
+
+# Tempo (segundos) que uma página pública fica no cache de páginas (core.cache)
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+
+# API (Django REST Framework)
+# Em produção só JSON compacto; a API navegável (HTML) fica para o DEBUG.
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    ],
+}
+
+# Respostas menores que isso (bytes) não são comprimidas (core.compression)
+GZIP_MIN_LENGTH = 1024
+
+
+# Métricas em /metrics/ (core.metrics), formato do Prometheus.
+# Cada processo do gunicorn grava a sua parte em METRICS_DIR; o endpoint
+# soma todas (as de processos encerrados ficam em METRICS_DIR/archive.json).
+METRICS_DIR = os.path.join(BASE_DIR, 'metrics')
+METRICS_FLUSH_INTERVAL = 5  # segundos
+# Além de usuários staff, lê /metrics/ quem mandar 'Authorization: Bearer <METRICS_TOKEN>'
+# (bearer_token no scrape_config do Prometheus). Sem token definido, só staff.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+# IPs liberados sem token. Atrás de um proxy no mesmo servidor (nginx, ver
+# MEDIA_SENDFILE_HEADER) todo acesso chega de 127.0.0.1: deixe vazio.
+METRICS_ALLOWED_IPS = []
+
+# Consultas mais lentas que isso (ms) vão para SLOW_QUERY_LOG (core.slowqueries).
+# Relatório: 'manage.py slowquery_report'. None desliga o log.
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'logs', 'slow_queries.jsonl')
+SLOW_QUERY_THRESHOLD_MS = 100
+
+# Perfil de requisições (core.profiling), aberto no admin em "Perfis de Requisição".
+# Fração das requisições perfiladas automaticamente (ex: 0.001 em produção).
+PROFILING_SAMPLE_RATE = 0
+PROFILING_MAX_PROFILES = 500
+
+
+# Fila de tarefas (app 'tasks', processada por 'manage.py runworker').
+# True executa as tarefas na hora, dentro da requisição (útil em testes).
+TASKS_ALWAYS_EAGER = False
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -132,6 +199,20 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# /media/ passa pelo Django (core.media), que confere o acesso aos arquivos
+# pessoais e deixa o envio para o servidor da frente:
+# - nginx: 'X-Accel-Redirect' e, no nginx,
+#       location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+# - Apache (mod_xsendfile): 'X-Sendfile' e MEDIA_SENDFILE_PREFIX = MEDIA_ROOT
+# None: o próprio Django envia (desenvolvimento), com suporte a Range.
+MEDIA_SENDFILE_HEADER = None
+MEDIA_SENDFILE_PREFIX = '/protected-media/'
+
+# Arquivos em montagem dos envios em partes (app 'uploads'). Fora de
+# MEDIA_ROOT, mas de preferência no mesmo disco: no fim o arquivo só é movido.
+# Sessões abandonadas: 'manage.py clear_upload_sessions' (ex: cron diário).
+CHUNKED_UPLOAD_DIR = os.path.join(BASE_DIR, 'uploads_tmp')
+
 # Configuração Visual do Painel (Jazzmin) - Personalizado para Norte Tech
 JAZZMIN_SETTINGS = {
     "site_title": "Norte Tech Admin",
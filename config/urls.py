@@ -1,13 +1,14 @@
 from django.contrib import admin
 from django.urls import path
 from django.conf import settings
-from django.conf.urls.static import static
 # 1. ADICIONEI 'noticia_detail' NA IMPORTAÇÃO ABAIXO
-from core.views import home, service_detail, about, noticia_detail, todas_noticias, contato, privacidade
-from services.views import ServiceListAPI, service_list
-from careers.views import careers_home, job_apply, onboarding_view, job_detail, candidate_history, talent_bank_view
+from core.views import home, service_detail, about, noticia_detail, todas_noticias, contato, privacidade, NoticiaSyncAPI, metrics_view, media_view
+from services.views import ServiceListAPI, ServiceSyncAPI, service_list
+from careers.views import JobOpportunitySyncAPI, careers_home, job_apply, onboarding_view, job_detail, candidate_history, talent_bank_view
 from django.contrib.auth import views as auth_views
 from accounts import views as account_views
+from search.views import SearchAPI, busca
+from uploads.views import upload_session, upload_start
 from careers.admin_rh import rh_admin
 
 urlpatterns = [
@@ -23,6 +24,19 @@ urlpatterns = [
     path('servicos/', service_list, name='services_list'),
     path('servico/<slug:slug>/', service_detail, name='service_detail'),
     path('api/v1/servicos/', ServiceListAPI.as_view(), name='api_services'),
+    # Sync incremental para clientes com cópia local (?since=<token>, ver core.sync)
+    path('api/v1/sync/noticias/', NoticiaSyncAPI.as_view(), name='api_sync_noticias'),
+    path('api/v1/sync/servicos/', ServiceSyncAPI.as_view(), name='api_sync_services'),
+    path('api/v1/sync/vagas/', JobOpportunitySyncAPI.as_view(), name='api_sync_jobs'),
+    path('busca/', busca, name='busca'),
+    path('api/v1/busca/', SearchAPI.as_view(), name='api_busca'),
+    path('metrics/', metrics_view, name='metrics'),
+    # Uploads (currículos e documentos só para o dono ou o RH). Em produção o
+    # envio passa para o nginx/Apache: ver MEDIA_SENDFILE_HEADER no settings.
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", media_view, name='media'),
+    # Envio de arquivos grandes em partes (protocolo em uploads/chunked.py)
+    path('envios/', upload_start, name='upload_start'),
+    path('envios/<uuid:upload_id>/', upload_session, name='upload_session'),
     path('a-empresa/', about, name='about'),
     path('carreiras/', careers_home, name='careers_home'),
     path('fale-conosco/', contato, name='contato_page'),
@@ -45,9 +59,6 @@ urlpatterns = [
     path('carreiras/documentos/<int:candidate_id>/', onboarding_view, name='onboarding'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
 # Redirecionamento após Login e Logout
 LOGIN_REDIRECT_URL = 'profile'
 LOGOUT_REDIRECT_URL = 'home'
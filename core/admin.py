@@ -1,6 +1,11 @@
+from django import forms
 from django.contrib import admin
 # Adicionei 'CompanySettings' na lista de imports abaixo para corrigir o próximo erro
-from .models import CompanySettings, Certification, HomeVideo, OperatingBase, Noticia, CanalContato, CarouselImage
+from .models import CompanySettings, Certification, HomeVideo, OperatingBase, Noticia, CanalContato, CarouselImage, RequestProfile
+from search.admin import IndexedSearchAdminMixin
+from uploads.forms import ChunkedFileInput, ChunkedUploadAdminMixin
+
+from .profiling import PROFILE_PARAM, PROFILING_TOKEN_MAX_AGE, make_token
 class CompanySettingsAdmin(admin.ModelAdmin):
     """
     Configuração Global: Impede que o usuário delete a configuração principal
@@ -21,11 +26,20 @@ class CertificationAdmin(admin.ModelAdmin):
     ordering = ('order',)
 
 
+class HomeVideoAdminForm(forms.ModelForm):
+    class Meta:
+        model = HomeVideo
+        fields = '__all__'
+        # O MP4 sobe em partes e continua de onde parou se a conexão cair
+        widgets = {'video_file': ChunkedFileInput(kind='home_video')}
+
+
 @admin.register(HomeVideo)
-class HomeVideoAdmin(admin.ModelAdmin):
+class HomeVideoAdmin(ChunkedUploadAdminMixin, admin.ModelAdmin):
     """
     Gestão do Player de Vídeo da Home.
     """
+    form = HomeVideoAdminForm
     list_display = ('title', 'is_active', 'created_at')
     list_editable = ('is_active',) # Permite ativar/desativar rápido
     list_filter = ('is_active', 'created_at')
@@ -40,9 +54,10 @@ class OperatingBaseAdmin(admin.ModelAdmin):
     list_editable = ('order',)
 
 @admin.register(Noticia)
-class NoticiaAdmin(admin.ModelAdmin):
+class NoticiaAdmin(IndexedSearchAdminMixin, admin.ModelAdmin):
     list_display = ('titulo', 'data_criacao')
     search_fields = ('titulo', 'resumo')
+    search_kind = 'noticia'  # busca pelo índice (search.admin)
     # Isso faz a mágica: cria o slug baseado no título automaticamente
     prepopulated_fields = {"slug": ("titulo",)}
 
@@ -55,3 +70,66 @@ class CanalContatoAdmin(admin.ModelAdmin):
 class CarouselImageAdmin(admin.ModelAdmin):
     list_display = ('title', 'order', 'is_active')
     list_editable = ('order', 'is_active')
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """
+    Navegador dos perfis de requisição (core.profiling): funções mais caras
+    e linha do tempo do SQL. Somente leitura.
+    """
+    list_display = ('created_at', 'method', 'path', 'view', 'status', 'duration_ms', 'query_count', 'db_ms', 'trigger')
+    list_filter = ('trigger', 'method')
+    search_fields = ('path', 'view')
+    exclude = ('data',)
+    change_list_template = 'admin/core/requestprofile/change_list.html'
+    change_form_template = 'admin/core/requestprofile/change_form.html'
+
+    def get_queryset(self, request):
+        # O perfil comprimido só é lido na página de detalhe
+        return super().get_queryset(request).defer('data')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {
+            **(extra_context or {}),
+            'profile_param': PROFILE_PARAM,
+            'profile_token': make_token(request.user),
+            'profile_token_minutes': PROFILING_TOKEN_MAX_AGE // 60,
+        }
+        return super().changelist_view(request, extra_context)
+
+    def render_change_form(self, request, context, add=False, change=False, form_url='', obj=None):
+        if obj is not None:
+            context.update(self.profile_context(request, obj))
+        return super().render_change_form(request, context, add, change, form_url, obj)
+
+    def profile_context(self, request, obj):
+        data = obj.unpack()
+        # ?ordem=tottime ordena pelo tempo na própria função; o padrão é o acumulado
+        order = 'tottime' if request.GET.get('ordem') == 'tottime' else 'cumtime'
+        column = 5 if order == 'tottime' else 6
+        functions = sorted(data['functions'], key=lambda row: row[column], reverse=True)[:100]
+        total = obj.duration_ms or 1
+        queries = [
+            {
+                **query,
+                'left': min(query['start_ms'] / total * 100, 100),
+                'width': max(query['ms'] / total * 100, 0.3),
+            }
+            for query in data['queries']
+        ]
+        return {
+            'profile_order': order,
+            'profile_functions': [
+                {'file': f, 'line': line, 'name': name, 'calls': calls, 'primitive_calls': primitive,
+                 'tottime': tottime, 'cumtime': cumtime}
+                for f, line, name, calls, primitive, tottime, cumtime in functions
+            ],
+            'profile_queries': queries,
+        }
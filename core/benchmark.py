@@ -0,0 +1,220 @@
+"""
+Benchmark de ponta a ponta das rotas do site (config/urls.py).
+
+Usado por 'manage.py seed_benchmark' (gera a massa de dados) e
+'manage.py benchmark_urls' (mede cada rota e grava um JSON que pode ser
+comparado entre versões).
+"""
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+
+# Contas criadas pelo seed_benchmark e usadas nas medições com login
+BENCH_USERNAME = 'bench-candidato'
+BENCH_STAFF_USERNAME = 'bench-admin'
+# Domínio dos e-mails gerados (reservado, nunca entrega)
+BENCH_EMAIL_DOMAIN = 'benchmark.invalid'
+
+# Limite de consultas e de tempo por rota, verificado em core/tests.py
+BUDGETS_FILE = Path(settings.BASE_DIR) / 'config' / 'performance_budgets.json'
+
+# Rotas que alteram dados mesmo com GET (ou encerram a sessão) ou que só
+# aceitam POST: não são medidas
+SKIP_ROUTES = {'logout', 'delete_education', 'delete_experience', 'delete_course', 'upload_start'}
+
+# Rotas que só existem para staff (404 para os demais): medidas só com login de staff
+STAFF_ONLY_ROUTES = {'metrics'}
+
+# Query string das rotas que precisam de parâmetros GET (palavras presentes
+# em quase todos os textos do seed_benchmark: o pior caso da busca)
+ROUTE_QUERIES = {
+    'busca': {'q': 'subestação manutenção'},
+    'api_busca': {'q': 'subestação manutenção'},
+}
+
+
+@dataclass
+class Route:
+    name: str
+    url: str
+    # 'staff' para os painéis administrativos, 'candidato' para o resto
+    login_as: str
+    # Também medida sem login (False nas rotas de STAFF_ONLY_ROUTES)
+    anonymous: bool = True
+
+    @property
+    def users(self):
+        return ('anonimo', self.login_as) if self.anonymous else (self.login_as,)
+
+
+@dataclass
+class RouteResult:
+    route: str
+    url: str
+    user: str
+    status: int
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    queries: int
+    peak_memory_kb: float
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def percentile(sorted_values, pct):
+    """Percentil por interpolação linear ('sorted_values' já ordenado)."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _sample_kwargs():
+    """
+    Valores reais para os parâmetros das rotas (slug, ids), lidos do banco.
+    Rotas cujo parâmetro não tem valor disponível ficam de fora.
+    """
+    from django.contrib.auth.models import User
+    from careers.models import Candidate, JobOpportunity
+    from core.models import Noticia
+    from services.models import Service
+
+    user = User.objects.filter(username=BENCH_USERNAME).first()
+    candidate = Candidate.objects.filter(user=user).order_by('-sent_at').first() if user else None
+    return {
+        'noticia_detail': {'slug': Noticia.objects.values_list('slug', flat=True).first()},
+        'service_detail': {'slug': Service.objects.filter(is_active=True).values_list('slug', flat=True).first()},
+        'job_detail': {'job_id': JobOpportunity.objects.filter(is_active=True).values_list('id', flat=True).first()},
+        'job_apply': {'job_id': JobOpportunity.objects.filter(is_active=True).values_list('id', flat=True).first()},
+        'onboarding': {'candidate_id': candidate.id if candidate else None},
+    }
+
+
+def _admin_routes(site):
+    """Índice do painel e a listagem (changelist) de cada model registrado."""
+    names = [f'{site.name}:index']
+    for model in site._registry:
+        names.append(f'{site.name}:{model._meta.app_label}_{model._meta.model_name}_changelist')
+    return [Route(name, reverse(name), 'staff') for name in names]
+
+
+def discover_routes():
+    """Lista as rotas do config/urls.py que podem ser medidas com GET."""
+    from django.contrib.admin.sites import all_sites
+
+    # Carrega o urls.py antes de olhar all_sites: é ele que importa o painel do RH
+    url_patterns = get_resolver().url_patterns
+    admin_sites = {site.name: site for site in all_sites}
+    kwargs_by_name = _sample_kwargs()
+    routes = []
+    for entry in url_patterns:
+        if isinstance(entry, URLResolver):
+            # Painéis administrativos (admin/ e rh/)
+            if entry.namespace in admin_sites:
+                routes.extend(_admin_routes(admin_sites[entry.namespace]))
+            continue
+
+        if not entry.name or entry.name in SKIP_ROUTES:
+            continue
+        kwargs = {}
+        if entry.pattern.converters:
+            kwargs = kwargs_by_name.get(entry.name, {})
+            if set(kwargs) != set(entry.pattern.converters) or None in kwargs.values():
+                continue
+        url = reverse(entry.name, kwargs=kwargs)
+        if entry.name in ROUTE_QUERIES:
+            url += '?' + urlencode(ROUTE_QUERIES[entry.name])
+        if entry.name in STAFF_ONLY_ROUTES:
+            routes.append(Route(entry.name, url, 'staff', anonymous=False))
+        else:
+            routes.append(Route(entry.name, url, 'candidato'))
+
+    # O mesmo nome pode aparecer duas vezes no urls.py: mede só uma
+    unique = {}
+    for route in routes:
+        unique.setdefault((route.name, route.url), route)
+    return list(unique.values())
+
+
+def measure_route(route, client, user_label, requests=20, warmup=2, before_request=None, memory=True):
+    """
+    Executa 'requests' GETs na rota e mede latência (p50/p95/p99), o maior
+    número de consultas SQL e, com memory=True, o pico de memória Python
+    (tracemalloc) de uma requisição.
+    """
+    for _ in range(warmup):
+        if before_request:
+            before_request()
+        client.get(route.url)
+
+    timings = []
+    status = queries = 0
+    for _ in range(requests):
+        if before_request:
+            before_request()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = client.get(route.url)
+            timings.append((time.perf_counter() - start) * 1000)
+        status = response.status_code
+        queries = max(queries, len(ctx.captured_queries))
+
+    # Memória numa requisição à parte: o tracemalloc deixa tudo mais lento
+    peak = 0
+    if memory:
+        if before_request:
+            before_request()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            client.get(route.url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    timings.sort()
+    return RouteResult(
+        route=route.name,
+        url=route.url,
+        user=user_label,
+        status=status,
+        requests=requests,
+        p50_ms=round(percentile(timings, 50), 3),
+        p95_ms=round(percentile(timings, 95), 3),
+        p99_ms=round(percentile(timings, 99), 3),
+        mean_ms=round(sum(timings) / len(timings), 3),
+        queries=queries,
+        peak_memory_kb=round(peak / 1024, 1),
+    )
+
+
+def load_budgets(path=BUDGETS_FILE):
+    """Lê o manifesto de orçamentos: {'scale': ..., 'routes': {nome: {'queries': n, 'ms': t}}}."""
+    with open(path, encoding='utf-8') as fp:
+        return json.load(fp)
+
+
+def make_client(host, username=None):
+    """Client de teste, anônimo ou já logado com 'username'."""
+    from django.contrib.auth.models import User
+
+    client = Client(SERVER_NAME=host)
+    if username:
+        client.force_login(User.objects.get(username=username))
+    return client
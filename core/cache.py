@@ -0,0 +1,169 @@
+"""
+Cache de páginas públicas (visitantes anônimos) e GET condicional.
+
+Cada página declara de quais models depende. Para cada model guardamos no
+cache uma "versão" (timestamp em ms da última alteração); a chave da página
+inclui essas versões, então salvar/excluir um model invalida apenas as
+páginas que dependem dele, sem precisar varrer chaves.
+
+As mesmas versões geram o ETag e o Last-Modified das páginas, o que permite
+responder 304 sem ir ao banco nem renderizar o template.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.utils.translation import get_language
+from django.views.decorators.http import condition
+
+from . import metrics
+
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 10)
+
+# Todas as páginas usam o rodapé/título de CompanySettings (base.html)
+GLOBAL_DEPENDENCIES = ('core.companysettings',)
+
+# Models cujo save/delete invalidam páginas em cache
+PAGE_CACHE_MODELS = {
+    'core.companysettings',
+    'core.noticia',
+    'core.carouselimage',
+    'core.homevideo',
+    'core.certification',
+    'core.operatingbase',
+    'core.canalcontato',
+    'services.service',
+    'services.servicecategory',
+    'careers.jobopportunity',
+}
+
+
+def _version_key(label):
+    return f'pagecache:v:{label}'
+
+
+def _now_ms():
+    return time.time_ns() // 1_000_000
+
+
+def get_versions(labels):
+    """
+    Retorna {label: versão} para os models informados.
+    Versões ausentes (cache reiniciado) começam no instante atual, o que
+    invalida qualquer página gerada antes.
+    """
+    keys = {label: _version_key(label) for label in labels}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for label, key in keys.items():
+        if key not in found:
+            cache.add(key, _now_ms(), None)
+            found[key] = cache.get(key)
+        versions[label] = found[key]
+    return versions
+
+
+def bump_version(label):
+    """Marca o model como alterado agora (chamado pelos signals)."""
+    key = _version_key(label)
+    current = cache.get(key) or 0
+    cache.set(key, max(_now_ms(), current + 1), None)
+
+
+def is_cacheable_request(request):
+    """Só visitantes anônimos, GET/HEAD e sem mensagens pendentes."""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.user.is_authenticated:
+        return False
+    # Mensagens do framework 'messages' são por visitante (ex: após logout)
+    if get_messages(request):
+        return False
+    return True
+
+
+def page_cache_key(request, labels):
+    versions = get_versions(labels)
+    raw = '|'.join([
+        request.get_host(),
+        request.get_full_path(),
+        get_language() or '',
+        *(f'{label}={versions[label]}' for label in sorted(versions)),
+    ])
+    return 'pagecache:page:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def _labels(models, include_global=True):
+    labels = {m.lower() for m in models}
+    if include_global:
+        labels |= set(GLOBAL_DEPENDENCIES)
+    return tuple(sorted(labels))
+
+
+def conditional_page(*models, include_global=True):
+    """
+    Decorator de view: envia ETag/Last-Modified calculados a partir das
+    versões dos models e responde 304 sem executar a view quando a cópia do
+    cliente ainda é atual.
+
+    Páginas de usuário logado e com mensagens pendentes não recebem
+    validadores: o HTML delas traz o token CSRF da sessão, que muda a cada
+    login, e um 304 deixaria no navegador um formulário que dá 403.
+    """
+    labels = _labels(models, include_global)
+
+    def etag(request, *args, **kwargs):
+        if request.user.is_authenticated or get_messages(request):
+            return None
+        versions = get_versions(labels)
+        raw = '|'.join([
+            request.get_full_path(),
+            get_language() or '',
+            request.META.get('HTTP_ACCEPT', ''),
+            *(f'{label}={versions[label]}' for label in labels),
+        ])
+        return hashlib.md5(raw.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        if request.user.is_authenticated or get_messages(request):
+            return None
+        newest = max(get_versions(labels).values())
+        return datetime.fromtimestamp(newest / 1000, tz=timezone.utc)
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
+def cache_public_page(*models):
+    """
+    Decorator de view: guarda o HTML completo para visitantes anônimos e
+    responde GET condicional (ver conditional_page).
+
+    Uso:
+        @cache_public_page('core.Noticia', 'services.Service')
+        def home(request): ...
+    """
+    labels = _labels(models)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = page_cache_key(request, labels)
+            response = cache.get(key)
+            metrics.cache_event('paginas', response is not None)
+            if response is not None:
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            # Não guardamos erros, redirects nem respostas que setam cookies
+            if response.status_code == 200 and not response.cookies and not response.streaming:
+                cache.set(key, response, PAGE_CACHE_TIMEOUT)
+            return response
+        return conditional_page(*models)(wrapper)
+    return decorator
@@ -0,0 +1,24 @@
+"""
+Compressão gzip só para respostas grandes.
+
+O GZipMiddleware do Django comprime qualquer resposta a partir de 200 bytes;
+em respostas pequenas o ganho é mínimo e o custo de CPU continua. Aqui o
+limite vem de GZIP_MIN_LENGTH e a compressão é ligada por view, com o
+decorator 'gzip_large_responses'.
+"""
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.decorators import decorator_from_middleware
+
+GZIP_MIN_LENGTH = getattr(settings, 'GZIP_MIN_LENGTH', 1024)
+
+
+class LargeResponseGZipMiddleware(GZipMiddleware):
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < GZIP_MIN_LENGTH:
+            return response
+        return super().process_response(request, response)
+
+
+gzip_large_responses = decorator_from_middleware(LargeResponseGZipMiddleware)
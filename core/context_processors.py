@@ -1,10 +1,13 @@
 # core/context_processors.py
+from django.utils.functional import SimpleLazyObject
 from .models import CompanySettings
 
 def company_settings(request):
     """
     Disponibiliza as configurações da empresa (CompanySettings)
     para todos os templates do site automaticamente.
+
+    O objeto é carregado sob demanda (SimpleLazyObject): páginas que não usam
+    'company_settings' nem chegam a consultar o cache.
     """
-    settings = CompanySettings.objects.first()
-    return {'company_settings': settings}
\ No newline at end of file
+    return {'company_settings': SimpleLazyObject(CompanySettings.load)}
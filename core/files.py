@@ -0,0 +1,38 @@
+"""
+Utilitários para arquivos enviados pelos usuários.
+"""
+
+# Assinaturas (magic bytes) dos formatos aceitos nos uploads
+MAGIC_SIGNATURES = [
+    (b'%PDF-', 'application/pdf'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),  # .doc (OLE2)
+    (b'PK\x03\x04', 'application/zip'),  # .docx/.xlsx são ZIP
+]
+
+# Tipos aceitos nos uploads (conferidos com sniff_content_type)
+IMAGE_TYPES = frozenset({'image/jpeg', 'image/png', 'image/webp', 'image/gif'})
+RESUME_TYPES = frozenset({'application/pdf', 'application/msword', 'application/zip'})
+
+
+def sniff_content_type(head):
+    """
+    Identifica o tipo do arquivo pelos primeiros bytes, sem confiar na
+    extensão nem no Content-Type enviado pelo navegador.
+    """
+    for signature, content_type in MAGIC_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head[4:8] == b'ftyp':
+        brand = head[8:12]
+        if brand in (b'avif', b'avis'):
+            return 'image/avif'
+        if brand in (b'heic', b'heix', b'mif1'):
+            return 'image/heic'
+        return 'video/mp4'
+    return None
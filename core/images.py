@@ -0,0 +1,140 @@
+"""
+Pipeline de imagens responsivas.
+
+Quando um model com imagem é salvo, geramos versões redimensionadas (AVIF,
+WebP e JPEG) em larguras fixas, gravadas ao lado do arquivo original com o
+hash do conteúdo no nome. A lista de versões fica num JSONField do próprio
+model ('<campo>_variants'), assim o template monta o 'srcset' sem tocar no
+disco. As versões são geradas uma única vez por arquivo enviado.
+"""
+import hashlib
+import io
+import posixpath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+VARIANT_WIDTHS = getattr(settings, 'IMAGE_VARIANT_WIDTHS', (480, 960, 1600))
+
+# (extensão, formato do Pillow, content-type, opções de gravação)
+# A extensão é também o nome do recurso em PIL.features.check()
+VARIANT_FORMATS = [
+    ('avif', 'AVIF', 'image/avif', {'quality': 55}),
+    ('webp', 'WEBP', 'image/webp', {'quality': 75, 'method': 4}),
+    ('jpg', 'JPEG', 'image/jpeg', {'quality': 80, 'optimize': True, 'progressive': True}),
+]
+
+# Campos de imagem processados: label do model -> campos
+RESPONSIVE_IMAGE_FIELDS = {
+    'core.carouselimage': ('image',),
+    'core.noticia': ('imagem',),
+    'core.certification': ('image',),
+    'core.operatingbase': ('image',),
+    'services.service': ('cover_image',),
+    'accounts.candidateprofile': ('photo',),
+}
+
+
+def variants_field_name(field_name):
+    return f'{field_name}_variants'
+
+
+def _available_formats():
+    # O Pillow pode ter sido compilado sem AVIF; nesse caso só WebP/JPEG
+    return [f for f in VARIANT_FORMATS if features.check(f[0])]
+
+
+def _target_widths(original_width):
+    widths = [w for w in VARIANT_WIDTHS if w < original_width]
+    # Inclui a largura original (limitada à maior largura configurada)
+    widths.append(min(original_width, max(VARIANT_WIDTHS)))
+    return sorted(set(widths))
+
+
+def generate_variants(field_file):
+    """
+    Gera as versões de 'field_file' e retorna o dicionário gravado em
+    '<campo>_variants':
+
+        {'original': nome, 'width': 1920, 'height': 1080,
+         'sources': {'image/webp': [[480, 'noticias_img/foto.ab12cd34ef56.480w.webp'], ...]}}
+    """
+    storage = field_file.storage
+    with field_file.open('rb') as f:
+        content = f.read()
+
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    directory, filename = posixpath.split(field_file.name)
+    stem = posixpath.splitext(filename)[0]
+
+    with Image.open(io.BytesIO(content)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    width, height = image.size
+    has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+
+    sources = {}
+    for ext, pil_format, content_type, options in _available_formats():
+        entries = []
+        for target_width in _target_widths(width):
+            name = posixpath.join(directory, f'{stem}.{digest}.{target_width}w.{ext}')
+            if not storage.exists(name):
+                target_height = max(1, round(height * target_width / width))
+                resized = image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+                if pil_format == 'JPEG' or not has_alpha:
+                    resized = resized.convert('RGB')
+                buffer = io.BytesIO()
+                resized.save(buffer, pil_format, **options)
+                name = storage.save(name, ContentFile(buffer.getvalue()))
+            entries.append([target_width, name])
+        sources[content_type] = entries
+
+    return {'original': field_file.name, 'width': width, 'height': height, 'sources': sources}
+
+
+def _variant_names(variants):
+    return {name for entries in (variants or {}).get('sources', {}).values() for _, name in entries}
+
+
+def delete_variants(variants, storage, keep=()):
+    for name in _variant_names(variants) - set(keep):
+        storage.delete(name)
+
+
+def needs_variants(instance, field_name):
+    """True se a imagem atual ainda não foi processada (checagem sem I/O)."""
+    field_file = getattr(instance, field_name)
+    current = getattr(instance, variants_field_name(field_name)) or {}
+    if field_file:
+        return current.get('original') != field_file.name
+    return bool(current)
+
+
+def update_variants(instance, field_name):
+    """
+    Atualiza '<campo>_variants' de 'instance' se a imagem mudou desde o
+    último processamento. Retorna True se algo foi alterado.
+    """
+    if not needs_variants(instance, field_name):
+        return False
+
+    field_file = getattr(instance, field_name)
+    target = variants_field_name(field_name)
+    current = getattr(instance, target) or {}
+
+    if field_file:
+        try:
+            new = generate_variants(field_file)
+        except (OSError, Image.DecompressionBombError):
+            # Arquivo ilegível/corrompido: o template usa o original e não
+            # tentamos de novo a cada save
+            new = {'original': field_file.name, 'sources': {}}
+    else:
+        new = {}
+
+    delete_variants(current, field_file.storage, keep=_variant_names(new))
+    # update() para não disparar o post_save de novo
+    type(instance).objects.filter(pk=instance.pk).update(**{target: new})
+    setattr(instance, target, new)
+    return True
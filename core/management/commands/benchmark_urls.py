@@ -0,0 +1,110 @@
+import json
+import platform
+import subprocess
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from core.benchmark import BENCH_STAFF_USERNAME, BENCH_USERNAME, discover_routes, make_client, measure_route
+
+# Métricas comparadas com --compare (maior = pior)
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'queries', 'peak_memory_kb')
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede todas as rotas do config/urls.py (anônimo e logado): latência p50/p95/p99, "
+        "consultas SQL e pico de memória. Rode antes 'manage.py seed_benchmark'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20, help="Requisições medidas por rota e usuário")
+        parser.add_argument('--warmup', type=int, default=2, help="Requisições de aquecimento (não medidas)")
+        parser.add_argument('--output', default='benchmark.json', help="Arquivo JSON com o resultado")
+        parser.add_argument('--compare', help="JSON de uma execução anterior para comparar")
+        parser.add_argument('--filter', default='', help="Só rotas cujo nome contém este texto")
+        parser.add_argument('--cold', action='store_true', help="Limpa o cache antes de cada requisição")
+
+    def handle(self, *args, **options):
+        # As requisições precisam de um host aceito por ALLOWED_HOSTS
+        host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'localhost')
+        clients = {
+            'anonimo': make_client(host),
+            'candidato': make_client(host, BENCH_USERNAME),
+            'staff': make_client(host, BENCH_STAFF_USERNAME),
+        }
+        before_request = cache.clear if options['cold'] else None
+
+        results = []
+        routes = [route for route in discover_routes() if options['filter'] in route.name]
+        for route in routes:
+            for user in route.users:
+                result = measure_route(
+                    route, clients[user], user, requests=options['requests'],
+                    warmup=options['warmup'], before_request=before_request,
+                )
+                results.append(result.as_dict())
+                self.stdout.write(
+                    f"{route.name:<45} {user:<9} {result.status} "
+                    f"p50 {result.p50_ms:>8.2f} ms  p95 {result.p95_ms:>8.2f} ms  p99 {result.p99_ms:>8.2f} ms  "
+                    f"{result.queries:>3} consultas  {result.peak_memory_kb:>9.1f} KiB"
+                )
+
+        report = {'meta': self.meta(options), 'results': results}
+        with open(options['output'], 'w', encoding='utf-8') as fp:
+            json.dump(report, fp, indent=2, ensure_ascii=False)
+        self.stdout.write(self.style.SUCCESS(f"Resultado gravado em {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as fp:
+                self.compare(json.load(fp), report)
+
+    def meta(self, options):
+        from careers.models import Candidate, CandidateDocument
+        from core.models import Noticia
+        from services.models import Service
+
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = ''
+        return {
+            'date': timezone.now().isoformat(),
+            'commit': commit,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'requests': options['requests'],
+            'cold_cache': options['cold'],
+            'rows': {
+                'candidatos': Candidate.objects.count(),
+                'documentos': CandidateDocument.objects.count(),
+                'noticias': Noticia.objects.count(),
+                'servicos': Service.objects.count(),
+            },
+        }
+
+    def compare(self, old, new):
+        """Mostra as rotas que mudaram mais de 10% em relação à execução anterior."""
+        previous = {(r['route'], r['user']): r for r in old['results']}
+        self.stdout.write(f"\nComparação com {old['meta'].get('commit') or old['meta']['date']}:")
+        changed = False
+        for result in new['results']:
+            before = previous.get((result['route'], result['user']))
+            if before is None:
+                continue
+            for metric in COMPARED_METRICS:
+                a, b = before[metric], result[metric]
+                if a == b or (a and abs(b - a) / a < 0.10):
+                    continue
+                changed = True
+                style = self.style.ERROR if b > a else self.style.SUCCESS
+                self.stdout.write(style(f"{result['route']:<45} {result['user']:<9} {metric:<15} {a} -> {b}"))
+        if not changed:
+            self.stdout.write("Nenhuma diferença acima de 10%.")
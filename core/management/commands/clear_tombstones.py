@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core import sync
+
+
+class Command(BaseCommand):
+    help = (
+        "Apaga os registros de exclusão (Tombstone) mais antigos que SYNC_TOMBSTONE_RETENTION_DAYS. "
+        "Clientes do sync com token anterior a isso recebem 410 e refazem a sincronização completa."
+    )
+
+    def handle(self, *args, **options):
+        total = sync.prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} registro(s) de exclusão apagado(s) (mais de {sync.SYNC_TOMBSTONE_RETENTION_DAYS} dias)."
+        ))
@@ -0,0 +1,21 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core.cache import PAGE_CACHE_MODELS, bump_version
+from core.images import RESPONSIVE_IMAGE_FIELDS, update_variants
+
+
+class Command(BaseCommand):
+    help = "Gera as versões responsivas (AVIF/WebP/JPEG) das imagens já cadastradas."
+
+    def handle(self, *args, **options):
+        for label, field_names in RESPONSIVE_IMAGE_FIELDS.items():
+            model = apps.get_model(label)
+            changed = 0
+            for instance in model.objects.iterator(chunk_size=200):
+                for field_name in field_names:
+                    changed += update_variants(instance, field_name)
+            if changed and label in PAGE_CACHE_MODELS:
+                bump_version(label)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {changed} imagem(ns) processada(s)")
+        self.stdout.write(self.style.SUCCESS("Versões responsivas atualizadas."))
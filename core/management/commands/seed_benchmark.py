@@ -0,0 +1,277 @@
+import random
+import secrets
+from io import BytesIO
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from PIL import Image
+
+from accounts.models import AcademicEducation, CandidateProfile, ExtraCourse, ProfessionalExperience
+from careers import candidate_search, metrics
+from careers.models import Candidate, CandidateDocument, DocumentType, JobOpportunity
+from core.benchmark import BENCH_EMAIL_DOMAIN, BENCH_STAFF_USERNAME, BENCH_USERNAME
+from core.cache import PAGE_CACHE_MODELS, bump_version
+from core.models import (
+    CanalContato, CarouselImage, Certification, CompanySettings, HomeVideo, Noticia, OperatingBase,
+)
+from search import index as search_index
+from services.models import Service, ServiceCategory
+
+# Quantidades com --scale=1. Com --scale=100: 5 mil notícias, 200 mil
+# candidatos e 50 mil documentos.
+BASE_COUNTS = {
+    'categorias': 5,
+    'servicos': 20,
+    'noticias': 50,
+    'vagas': 20,
+    'usuarios': 500,
+    'candidatos': 2000,
+    'documentos': 500,
+}
+BATCH_SIZE = 1000
+
+WORDS = (
+    "energia subestação manutenção preventiva corretiva linha transmissão distribuição rede "
+    "elétrica projeto engenharia segurança equipe campo frota operação cliente contrato obra "
+    "inspeção termográfica poda iluminação pública medição painel cabine transformador relé "
+    "proteção comissionamento Manaus Amazonas qualidade meio ambiente saúde treinamento"
+).split()
+FIRST_NAMES = "Ana Bruno Carla Diego Elisa Felipe Gabriela Hugo Isabela João Larissa Marcos Natália Otávio Paula Rafael Sofia Thiago".split()
+LAST_NAMES = "Silva Souza Oliveira Santos Lima Pereira Costa Ferreira Almeida Rodrigues Gomes Martins Araújo Barbosa".split()
+
+# PDF mínimo válido (1 página em branco)
+SAMPLE_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+# Só o cabeçalho 'ftyp' de um MP4: suficiente para o player da Home apontar
+SAMPLE_MP4 = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom" + b"\x00" * 1024
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria uma massa de dados realista em todas as apps para o benchmark "
+        "('manage.py benchmark_urls'). Use num banco de testes: os dados não são removidos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1, help="Multiplicador das quantidades (ex: 100 = 200 mil candidatos)")
+        parser.add_argument('--seed', type=int, default=42, help="Semente do gerador aleatório (massa reprodutível)")
+        parser.add_argument(
+            '--i-know-this-is-not-production', action='store_true',
+            help="Roda mesmo com DEBUG desligado (cria um superusuário)",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['i_know_this_is_not_production']:
+            raise CommandError(
+                "O seed_benchmark cria um superusuário e milhares de contas: só roda com DEBUG ligado "
+                "ou com --i-know-this-is-not-production."
+            )
+        if User.objects.filter(username=BENCH_USERNAME).exists():
+            raise CommandError(
+                "A massa do benchmark já existe neste banco. Use um banco novo (ex: 'manage.py flush')."
+            )
+        scale = options['scale']
+        self.rng = random.Random(options['seed'])
+        self.counts = {name: max(1, round(count * scale)) for name, count in BASE_COUNTS.items()}
+        # Senha nova a cada massa, fora do gerador com semente (não se repete entre bancos)
+        self.password = secrets.token_urlsafe(12)
+
+        with transaction.atomic():
+            self.files = self.create_files()
+            self.seed_core()
+            self.seed_services()
+            self.seed_accounts()
+            self.seed_careers()
+
+        # bulk_create não dispara signals: recalcula o que eles mantêm
+        metrics.rebuild()
+        candidate_search.rebuild()
+        search_index.rebuild()
+        for label in PAGE_CACHE_MODELS:
+            bump_version(label)
+        self.stdout.write(self.style.SUCCESS(
+            f"Massa criada. Login: '{BENCH_USERNAME}' (candidato) e '{BENCH_STAFF_USERNAME}' (admin), senha '{self.password}'."
+        ))
+
+    # --- utilitários ---
+
+    def save_file(self, name, content):
+        """Os registros compartilham poucos arquivos, gravados uma vez só."""
+        if default_storage.exists(name):
+            return name
+        return default_storage.save(name, ContentFile(content))
+
+    def create_files(self):
+        image = BytesIO()
+        Image.effect_noise((1600, 900), 48).convert('RGB').save(image, 'JPEG', quality=80)
+        return {
+            'imagem': self.save_file('benchmark/imagem.jpg', image.getvalue()),
+            'pdf': self.save_file('benchmark/documento.pdf', SAMPLE_PDF),
+            'video': self.save_file('benchmark/video.mp4', SAMPLE_MP4),
+        }
+
+    def text(self, words):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+    def name(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def bulk(self, model, objects):
+        total = 0
+        for batch in chunks(objects, BATCH_SIZE):
+            model.objects.bulk_create(batch)
+            total += len(batch)
+        self.stdout.write(f"{model._meta.verbose_name_plural}: {total}")
+
+    # --- apps ---
+
+    def seed_core(self):
+        if not CompanySettings.objects.exists():
+            CompanySettings.objects.create(phone="(92) 3000-0000")
+        image = self.files['imagem']
+        self.bulk(Certification, (Certification(name=f"ISO {9001 + i}", image=image, order=i) for i in range(4)))
+        self.bulk(HomeVideo, [HomeVideo(title="Vídeo do benchmark", video_file=self.files['video'], overlay_text=self.text(12))])
+        self.bulk(OperatingBase, (
+            OperatingBase(name=f"Base {i}", address=self.text(5), image=image, order=i) for i in range(6)
+        ))
+        self.bulk(CarouselImage, (
+            CarouselImage(title=self.text(4), description=self.text(10), image=image, order=i) for i in range(5)
+        ))
+        self.bulk(CanalContato, (
+            CanalContato(titulo=f"Canal {i}", conteudo=f"contato{i}@{BENCH_EMAIL_DOMAIN}", tipo='EMAIL', ordem=i)
+            for i in range(4)
+        ))
+        self.bulk(Noticia, (
+            Noticia(
+                titulo=self.text(8), slug=f"bench-noticia-{i}", resumo=self.text(30),
+                conteudo='\n\n'.join(self.text(60) for _ in range(6)), imagem=image,
+            )
+            for i in range(self.counts['noticias'])
+        ))
+
+    def seed_services(self):
+        self.bulk(ServiceCategory, (ServiceCategory(name=f"Categoria {i}") for i in range(self.counts['categorias'])))
+        categories = list(ServiceCategory.objects.values_list('id', flat=True))
+        self.bulk(Service, (
+            Service(
+                category_id=self.rng.choice(categories), title=self.text(4), slug=f"bench-servico-{i}",
+                short_description=self.text(25), full_description='\n\n'.join(self.text(80) for _ in range(4)),
+                cover_image=self.files['imagem'], icon_class='bi-lightning-charge',
+                is_active=self.rng.random() < 0.9,
+            )
+            for i in range(self.counts['servicos'])
+        ))
+
+    def seed_accounts(self):
+        User.objects.create_superuser(BENCH_STAFF_USERNAME, f"admin@{BENCH_EMAIL_DOMAIN}", self.password)
+        User.objects.create_user(
+            BENCH_USERNAME, f"candidato@{BENCH_EMAIL_DOMAIN}", self.password, first_name="Candidato", last_name="Benchmark",
+        )
+        # O hash é caro: calculado uma vez e repetido para todas as contas
+        password = make_password(self.password)
+        self.bulk(User, (
+            User(username=f"bench-{i}", email=f"bench-{i}@{BENCH_EMAIL_DOMAIN}", password=password,
+                 first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES))
+            for i in range(self.counts['usuarios'])
+        ))
+
+        self.users = list(
+            User.objects.filter(username__startswith='bench-').exclude(username=BENCH_STAFF_USERNAME)
+            .values_list('id', 'email', 'first_name', 'last_name')
+        )
+        self.bulk(CandidateProfile, (
+            CandidateProfile(
+                user_id=user_id, full_name=f"{first} {last}", cpf=self.cpf(n), phone="(92) 99999-0000",
+                city="Manaus", state="AM", resume_file=self.files['pdf'], photo=self.files['imagem'],
+            )
+            for n, (user_id, _, first, last) in enumerate(self.users)
+        ))
+        self.bulk(AcademicEducation, (
+            AcademicEducation(user_id=user_id, institution="Universidade Benchmark", course=self.text(3),
+                              level='SUPERIOR_COMPLETO', start_date='2015-02-01', end_date='2019-12-01')
+            for user_id, *_ in self.users
+        ))
+        self.bulk(ProfessionalExperience, (
+            ProfessionalExperience(user_id=user_id, company="Empresa Benchmark", role=self.text(2),
+                                   start_date='2020-01-01', description=self.text(40))
+            for user_id, *_ in self.users
+        ))
+        self.bulk(ExtraCourse, (
+            ExtraCourse(user_id=user_id, name="NR-10", institution="SENAI", hours=40, completion_year=2022)
+            for user_id, *_ in self.users
+        ))
+
+    def cpf(self, n):
+        digits = f"{n:011d}"
+        return f"{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:]}"
+
+    def seed_careers(self):
+        departments = [value for value, _ in JobOpportunity._meta.get_field('department').choices]
+        self.bulk(JobOpportunity, (
+            JobOpportunity(
+                title=self.text(3), department=self.rng.choice(departments), description=self.text(120),
+                requirements=self.text(60), benefits=self.text(20), vacancies=self.rng.randint(1, 5),
+                is_active=self.rng.random() < 0.7,
+            )
+            for _ in range(self.counts['vagas'])
+        ))
+        jobs = list(JobOpportunity.objects.values_list('id', flat=True)) + [None]  # None = banco de talentos
+        statuses = [value for value, _ in Candidate.STATUS_CHOICES]
+        bench_user = next(user for user in self.users if user[1] == f"candidato@{BENCH_EMAIL_DOMAIN}")
+
+        def candidates():
+            # O candidato do benchmark sempre tem candidaturas, uma em fase de documentos
+            for status in ('NOVO', 'ENTREVISTA', 'AGUARDANDO_DOCS'):
+                yield self.candidate(bench_user, self.rng.choice(jobs), status)
+            for _ in range(self.counts['candidatos'] - 3):
+                user = self.rng.choice(self.users) if self.rng.random() < 0.7 else None
+                yield self.candidate(user, self.rng.choice(jobs), self.rng.choice(statuses))
+        self.bulk(Candidate, candidates())
+
+        self.bulk(DocumentType, (DocumentType(title=title, description=self.text(10)) for title in ("RG", "CPF", "CNH", "ASO", "Comprovante de Residência")))
+        doc_types = list(DocumentType.objects.values_list('id', flat=True))
+        # Documentos vão para os candidatos em fase de admissão (o do benchmark primeiro)
+        admission = list(
+            Candidate.objects.filter(status__in=['AGUARDANDO_DOCS', 'DOCS_EM_ANALISE', 'CONTRATADO'])
+            .order_by('id').values_list('id', flat=True)
+        )
+        doc_statuses = [value for value, _ in CandidateDocument.STATUS_CHOICES]
+
+        def documents():
+            for i in range(self.counts['documentos']):
+                status = self.rng.choice(doc_statuses)
+                yield CandidateDocument(
+                    candidate_id=admission[(i // len(doc_types)) % len(admission)],
+                    doc_type_id=doc_types[i % len(doc_types)],
+                    status=status,
+                    file=self.files['pdf'] if status != 'PENDENTE' else None,
+                )
+        self.bulk(CandidateDocument, documents())
+
+    def candidate(self, user, job_id, status):
+        if user:
+            _, email, first, last = user
+            name = f"{first} {last}"
+        else:
+            name = self.name()
+            email = f"{name.lower().replace(' ', '.')}.{self.rng.randint(1, 10**6)}@{BENCH_EMAIL_DOMAIN}"
+        return Candidate(
+            job_id=job_id, user_id=user[0] if user else None, name=name, email=email, phone="(92) 98888-0000",
+            resume_file=self.files['pdf'], message=self.text(20), status=status, terms_accepted=True,
+        )
@@ -0,0 +1,66 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core import slowqueries
+from core.benchmark import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Ranking das consultas lentas (SLOW_QUERY_LOG) agrupadas pela impressão digital do SQL, "
+        "ordenado pelo tempo total."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', help="Arquivo do log (padrão: settings.SLOW_QUERY_LOG)")
+        parser.add_argument('--limit', type=int, default=20, help="Quantas consultas mostrar")
+        parser.add_argument('--hours', type=float, help="Só registros das últimas N horas")
+        parser.add_argument('--view', default='', help="Só registros de rotas cujo nome contém este texto")
+        parser.add_argument('--full-sql', action='store_true', help="Mostra o SQL inteiro")
+
+    def handle(self, *args, **options):
+        path = options['log'] or slowqueries.SLOW_QUERY_LOG
+        if not path:
+            raise CommandError("SLOW_QUERY_LOG não está configurado; use --log.")
+        since = timezone.now() - timedelta(hours=options['hours']) if options['hours'] else None
+
+        groups = defaultdict(lambda: {'timings': [], 'views': Counter(), 'call_sites': Counter(), 'sql': ''})
+        try:
+            for entry in slowqueries.read_log(path):
+                if since and parse_datetime(entry['at']) < since:
+                    continue
+                if options['view'] not in entry['view']:
+                    continue
+                group = groups[entry['fingerprint']]
+                group['timings'].append(entry['ms'])
+                group['views'][entry['view']] += 1
+                group['call_sites'][entry['call_site']] += 1
+                group['sql'] = entry['sql']
+        except FileNotFoundError:
+            raise CommandError(f"Log não encontrado: {path}")
+
+        if not groups:
+            self.stdout.write("Nenhuma consulta lenta registrada.")
+            return
+
+        ranking = sorted(groups.items(), key=lambda item: sum(item[1]['timings']), reverse=True)
+        for position, (key, group) in enumerate(ranking[:options['limit']], start=1):
+            timings = sorted(group['timings'])
+            sql = group['sql'] if options['full_sql'] else group['sql'][:200]
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{position:>2}. {key}  total {sum(timings) / 1000:.2f} s  {len(timings)}x  "
+                f"média {sum(timings) / len(timings):.1f} ms  p95 {percentile(timings, 95):.1f} ms  "
+                f"máx {timings[-1]:.1f} ms"
+            ))
+            self.stdout.write(f"    {sql}")
+            for view, count in group['views'].most_common(3):
+                self.stdout.write(f"    rota: {view or '-'} ({count}x)")
+            for call_site, count in group['call_sites'].most_common(3):
+                self.stdout.write(f"    origem: {call_site or '-'} ({count}x)")
+
+        total = sum(len(group['timings']) for group in groups.values())
+        self.stdout.write(f"\n{total} consultas lentas, {len(groups)} impressões digitais.")
@@ -0,0 +1,257 @@
+"""
+Entrega dos arquivos de MEDIA_ROOT (rota /media/, core.views.media_view).
+
+Currículos, documentos de admissão e fotos de perfil (PROTECTED_MEDIA) só
+saem para o dono ou para staff com permissão de ver o model; o resto
+(imagens do site, vídeo da home) é público. Conferido o acesso, o envio fica
+com o servidor da frente, pelo header de MEDIA_SENDFILE_HEADER:
+
+- nginx: 'X-Accel-Redirect', com MEDIA_SENDFILE_PREFIX apontando para uma
+  location 'internal' com alias para MEDIA_ROOT;
+- Apache (mod_xsendfile) / lighttpd: 'X-Sendfile', com MEDIA_SENDFILE_PREFIX
+  igual ao caminho de MEDIA_ROOT no disco.
+
+Sem servidor na frente (MEDIA_SENDFILE_HEADER = None, desenvolvimento) o
+próprio Django envia o arquivo: inteiro pelo FileResponse (sendfile do
+servidor WSGI, quando houver) ou só o trecho pedido no header Range, que o
+player de vídeo usa para avançar. ETag/Last-Modified permitem respostas 304.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+from dataclasses import dataclass
+from urllib.parse import quote
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from .images import _variant_names
+
+MEDIA_SENDFILE_HEADER = getattr(settings, 'MEDIA_SENDFILE_HEADER', None)
+MEDIA_SENDFILE_PREFIX = getattr(settings, 'MEDIA_SENDFILE_PREFIX', '/protected-media/')
+# Cache no navegador dos arquivos públicos (o storage nunca reaproveita um nome)
+MEDIA_PUBLIC_MAX_AGE = getattr(settings, 'MEDIA_PUBLIC_MAX_AGE', 60 * 60 * 24 * 7)
+
+# Bytes lidos do disco por vez ao enviar um trecho (Range)
+RANGE_CHUNK_SIZE = 64 * 1024
+
+# Tipos abertos no navegador; os demais (HTML, SVG...) são baixados, para
+# que um arquivo enviado não rode script no domínio do site
+INLINE_CONTENT_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif', 'application/pdf')
+INLINE_PREFIXES = ('video/', 'audio/')
+
+
+@dataclass(frozen=True)
+class ProtectedMedia:
+    model: str            # 'app_label.Model'
+    field: str            # FileField/ImageField com o arquivo
+    owner: str            # caminho até o User dono (lookup do ORM)
+    variants: str = None  # campo '<campo>_variants' (core.images), se houver
+    shared_from: tuple = ()  # outros campos ('app_label.Model.campo') cujos arquivos este também aponta
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+    @property
+    def prefixes(self):
+        # Parte fixa do upload_to ('resumes/%Y/%m/' -> 'resumes/'), deste campo e dos compartilhados
+        fields = [self.get_model()._meta.get_field(self.field)]
+        for path in self.shared_from:
+            app_label, model_name, field_name = path.split('.')
+            fields.append(apps.get_model(app_label, model_name)._meta.get_field(field_name))
+        return tuple(field.upload_to.split('%')[0] for field in fields)
+
+    def owners(self, name):
+        """Ids dos donos do arquivo 'name' (original ou versão responsiva)."""
+        manager = self.get_model()._default_manager
+        owners = set(manager.filter(**{self.field: name}).values_list(self.owner, flat=True))
+        match = _VARIANT_RE.match(name) if self.variants else None
+        if match:
+            # Versão gerada por core.images: '<nome sem extensão>.<hash>.<largura>w.<formato>'
+            rows = manager.filter(**{f'{self.field}__startswith': match['stem'] + '.'}).values_list(
+                self.owner, self.variants,
+            )
+            owners.update(owner for owner, variants in rows if name in _variant_names(variants))
+        return owners
+
+
+_VARIANT_RE = re.compile(r'^(?P<stem>.+)\.[0-9a-f]{12}\.\d+w\.\w+$')
+
+PROTECTED_MEDIA = (
+    # A candidatura pelo site (careers.views.job_apply) aponta para o currículo do perfil
+    ProtectedMedia('careers.Candidate', 'resume_file', 'user', shared_from=('accounts.CandidateProfile.resume_file',)),
+    ProtectedMedia('careers.CandidateDocument', 'file', 'candidate__user'),
+    ProtectedMedia('accounts.CandidateProfile', 'resume_file', 'user'),
+    ProtectedMedia('accounts.CandidateProfile', 'photo', 'user', variants='photo_variants'),
+)
+
+
+def protected_entries(name):
+    """Entradas de PROTECTED_MEDIA que podem apontar para 'name' (vazio: arquivo público)."""
+    return [entry for entry in PROTECTED_MEDIA if name.startswith(entry.prefixes)]
+
+
+def can_access(user, entries, name):
+    """Dono do arquivo ou staff com permissão de ver o model, por qualquer uma das entradas."""
+    if not user.is_authenticated:
+        return False
+    if user.is_staff:
+        for entry in entries:
+            opts = entry.get_model()._meta
+            if user.has_perm(f'{opts.app_label}.view_{opts.model_name}'):
+                return True
+    return any(user.pk in entry.owners(name) for entry in entries)
+
+
+def media_path(name):
+    """Caminho do arquivo dentro de MEDIA_ROOT (Http404 se sair dele)."""
+    name = posixpath.normpath(name).lstrip('/')
+    try:
+        return name, safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+
+
+# --- Range ---
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    (início, fim) inclusivos do header 'Range: bytes=...'. None quando o
+    arquivo deve ir inteiro: sem Range, mal formado ou com vários
+    intervalos (a RFC 9110 permite ignorar). RangeNotSatisfiable se o
+    trecho começa depois do fim do arquivo.
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start >= size:
+            raise RangeNotSatisfiable
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # 'bytes=-500': os últimos 500 bytes
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable
+        start, end = max(0, size - suffix), size - 1
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    """Sem If-Range, ou com o validador atual: o Range vale."""
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    return parse_http_date_safe(value) == last_modified
+
+
+def _read_range(fp, start, length):
+    try:
+        fp.seek(start)
+        while length > 0:
+            chunk = fp.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fp.close()
+
+
+def file_response(request, full_path, st, content_type):
+    """Arquivo pelo Django, com Range e respostas condicionais (304/412)."""
+    last_modified = int(st.st_mtime)
+    etag = f'"{last_modified:x}-{st.st_size:x}"'
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    size = st.st_size
+    # Com If-Range de uma versão antiga, o arquivo mudou: vai inteiro
+    range_header = request.META.get('HTTP_RANGE') if _if_range_matches(request, etag, last_modified) else None
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    fp = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(fp, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(fp, start, end - start + 1), status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def sendfile_response(name, content_type):
+    """Resposta vazia que manda o servidor da frente enviar o arquivo."""
+    response = HttpResponse(content_type=content_type)
+    if MEDIA_SENDFILE_HEADER.lower() == 'x-accel-redirect':
+        # O nginx decodifica a URI interna
+        response[MEDIA_SENDFILE_HEADER] = MEDIA_SENDFILE_PREFIX.rstrip('/') + '/' + quote(name)
+    else:
+        response[MEDIA_SENDFILE_HEADER] = os.path.join(MEDIA_SENDFILE_PREFIX, name)
+    return response
+
+
+def serve(request, name):
+    """Confere o acesso e entrega o arquivo 'name' de MEDIA_ROOT."""
+    name, full_path = media_path(name)
+    entries = protected_entries(name)
+    if entries and not can_access(request.user, entries, name):
+        # Mesmo resultado de um arquivo inexistente: não revela o que existe
+        raise Http404
+    try:
+        st = os.stat(full_path)
+    except (OSError, ValueError):
+        raise Http404
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404
+
+    content_type, encoding = mimetypes.guess_type(name)
+    # Arquivos .gz etc. vão como estão, sem Content-Encoding
+    content_type = 'application/octet-stream' if encoding or not content_type else content_type
+    if MEDIA_SENDFILE_HEADER:
+        response = sendfile_response(name, content_type)
+    else:
+        response = file_response(request, full_path, st, content_type)
+
+    response['Accept-Ranges'] = 'bytes'
+    if response.status_code in (200, 206):
+        inline = content_type in INLINE_CONTENT_TYPES or content_type.startswith(INLINE_PREFIXES)
+        if not inline:
+            response['Content-Disposition'] = content_disposition_header(True, posixpath.basename(name))
+    if entries:
+        # Proxies e CDNs não guardam; o navegador revalida (304) a cada acesso
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=MEDIA_PUBLIC_MAX_AGE)
+    return response
@@ -0,0 +1,270 @@
+"""
+Métricas de operação do site no formato texto do Prometheus (/metrics).
+
+Cada processo do gunicorn acumula os números em memória (o lock só protege
+a soma de alguns inteiros) e, no máximo a cada METRICS_FLUSH_INTERVAL
+segundos, grava uma cópia em METRICS_DIR/<pid>-<início>.json (o início
+distingue um processo novo que reaproveitou o pid). O endpoint soma os
+arquivos de todos os processos. Os de processos que já terminaram são
+somados a METRICS_DIR/archive.json e apagados: os contadores não voltam
+para trás e o diretório não cresce com os reinícios dos workers.
+
+As métricas são registradas pelo core.middleware.MetricsMiddleware, com o
+nome da rota (URL name) como label. Os eventos de cache são anotados pelo
+código que consulta o cache (core.cache, CompanySettings.load) e atribuídos
+à rota da requisição em andamento.
+"""
+import atexit
+import fcntl
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+METRICS_FLUSH_INTERVAL = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# nome -> (tipo, descrição, buckets)
+METRICS = {
+    'portal_http_request_duration_seconds': ('histogram', "Tempo de resposta por rota.", LATENCY_BUCKETS),
+    'portal_http_response_size_bytes': ('histogram', "Tamanho do corpo da resposta por rota.", SIZE_BUCKETS),
+    'portal_db_queries_per_request': ('histogram', "Consultas SQL por requisição.", QUERY_BUCKETS),
+    'portal_db_duration_seconds': ('histogram', "Tempo gasto no banco por requisição.", LATENCY_BUCKETS),
+    'portal_cache_requests_total': ('counter', "Consultas ao cache por rota e resultado (hit/miss).", None),
+}
+
+_lock = threading.Lock()
+_counters = {}    # (nome, labels) -> valor
+_histograms = {}  # (nome, labels) -> [contagem por bucket..., soma, total]
+_last_flush = 0.0
+# (pid, nome do arquivo) deste processo; refeito quando o pid muda (fork)
+_snapshot_file = (None, None)
+
+ARCHIVE_NAME = 'archive.json'
+LOCK_NAME = '.lock'
+
+# Eventos de cache da requisição em andamento: {(cache, resultado): n}
+_cache_events = ContextVar('metrics_cache_events', default=None)
+
+
+def _labels(**labels):
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    key = (name, _labels(**labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    buckets = METRICS[name][2]
+    key = (name, _labels(**labels))
+    with _lock:
+        data = _histograms.get(key)
+        if data is None:
+            data = _histograms[key] = [0] * (len(buckets) + 2)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                data[i] += 1
+        data[-2] += value
+        data[-1] += 1
+
+
+def cache_event(cache_name, hit):
+    """Anota um hit/miss de cache na requisição atual (fora de requisição é ignorado)."""
+    events = _cache_events.get()
+    if events is not None:
+        key = (cache_name, 'hit' if hit else 'miss')
+        events[key] = events.get(key, 0) + 1
+
+
+def start_request():
+    """Chamado pelo middleware no início da requisição. Retorna o token do contextvar."""
+    return _cache_events.set({})
+
+
+def finish_request(token, view):
+    """Transfere os eventos de cache da requisição para os contadores."""
+    events = _cache_events.get() or {}
+    _cache_events.reset(token)
+    for (cache_name, result), count in events.items():
+        inc('portal_cache_requests_total', count, view=view, cache=cache_name, result=result)
+
+
+# --- agregação entre processos ---
+
+def snapshot():
+    with _lock:
+        return {
+            'counters': [[name, list(labels), value] for (name, labels), value in _counters.items()],
+            'histograms': [[name, list(labels), list(data)] for (name, labels), data in _histograms.items()],
+        }
+
+
+def _metrics_dir():
+    # Lido a cada uso: os testes apontam para um diretório temporário
+    return getattr(settings, 'METRICS_DIR', None)
+
+
+def _snapshot_name():
+    global _snapshot_file
+    pid = os.getpid()
+    if _snapshot_file[0] != pid:
+        _snapshot_file = (pid, f'{pid}-{time.time_ns()}.json')
+    return _snapshot_file[1]
+
+
+def _write_json(path, data):
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as fp:
+        json.dump(data, fp)
+    os.replace(tmp, path)  # quem lê nunca vê o arquivo pela metade
+
+
+def flush(force=False):
+    """Grava a cópia deste processo em METRICS_DIR (no máximo a cada METRICS_FLUSH_INTERVAL)."""
+    global _last_flush
+    metrics_dir = _metrics_dir()
+    now = time.monotonic()
+    if not metrics_dir or (not force and now - _last_flush < METRICS_FLUSH_INTERVAL):
+        return
+    _last_flush = now
+    data = snapshot()
+    if not data['counters'] and not data['histograms']:
+        return  # processo sem requisições (ex: outros comandos do manage.py)
+    os.makedirs(metrics_dir, exist_ok=True)
+    _write_json(os.path.join(metrics_dir, _snapshot_name()), data)
+
+
+atexit.register(flush, force=True)
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # existe, mas é de outro usuário
+    return True
+
+
+def _finished_snapshots(metrics_dir, names):
+    """Arquivos de processos que já terminaram."""
+    for name in names:
+        pid, sep, _ = name.partition('-')
+        if sep and name.endswith('.json') and pid.isdigit() and name != _snapshot_name():
+            if not _process_alive(int(pid)):
+                yield name
+
+
+def _read_json(path):
+    try:
+        with open(path) as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None  # arquivo removido ou sendo trocado: entra na próxima leitura
+
+
+def _archive_finished(metrics_dir):
+    """
+    Soma os arquivos de processos que terminaram ao archive.json e os apaga.
+    Chamada com o lock do diretório (_load_snapshots).
+    """
+    finished = list(_finished_snapshots(metrics_dir, os.listdir(metrics_dir)))
+    if not finished:
+        return
+    loaded = {name: _read_json(os.path.join(metrics_dir, name)) for name in finished}
+    loaded = {name: data for name, data in loaded.items() if data is not None}
+    archive = _read_json(os.path.join(metrics_dir, ARCHIVE_NAME))
+    counters, histograms = _sum([archive, *loaded.values()] if archive else loaded.values())
+    _write_json(os.path.join(metrics_dir, ARCHIVE_NAME), {
+        'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, list(labels), data] for (name, labels), data in histograms.items()],
+    })
+    for name in loaded:
+        os.remove(os.path.join(metrics_dir, name))
+
+
+def _load_snapshots():
+    metrics_dir = _metrics_dir()
+    if not metrics_dir:
+        return [snapshot()]
+    flush(force=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+    with open(os.path.join(metrics_dir, LOCK_NAME), 'w') as lock:
+        # Uma leitura por vez: outra não pode arquivar (somar e apagar) um
+        # arquivo entre a listagem e a leitura desta, nem somá-lo duas vezes
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        _archive_finished(metrics_dir)
+        snapshots = [
+            _read_json(os.path.join(metrics_dir, name))
+            for name in os.listdir(metrics_dir) if name.endswith('.json')
+        ]
+    return [data for data in snapshots if data is not None]
+
+
+def _sum(snapshots):
+    counters, histograms = {}, {}
+    for data in snapshots:
+        for name, labels, value in data['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, values in data['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            current = histograms.get(key)
+            histograms[key] = values if current is None else [a + b for a, b in zip(current, values)]
+    return counters, histograms
+
+
+def collect():
+    """Soma as cópias de todos os processos: ({chave: valor}, {chave: dados})."""
+    return _sum(_load_snapshots())
+
+
+# --- formato texto do Prometheus ---
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def render_prometheus():
+    counters, histograms = collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_number(value)}')
+            continue
+        for (metric, labels), data in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(buckets, data):
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {count}')
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {data[-1]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_number(data[-2])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {data[-1]}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,104 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from . import metrics, profiling, slowqueries
+
+
+class QueryCounter:
+    """execute_wrapper do Django: conta as consultas e soma o tempo no banco."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Registra por rota (URL name) o tempo de resposta, o tamanho da resposta,
+    consultas SQL (quantidade e tempo) e hits/misses de cache. Exposto em
+    /metrics (ver core.metrics). Deve ser o primeiro da lista MIDDLEWARE
+    para medir a requisição inteira.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = metrics.start_request()
+        queries = QueryCounter()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(queries))
+                response = self.get_response(request)
+            duration = time.perf_counter() - start
+        finally:
+            view = self.view_name(request)
+            metrics.finish_request(token, view)
+
+        metrics.observe('portal_http_request_duration_seconds', duration,
+                        view=view, method=request.method, status=response.status_code)
+        if not response.streaming:
+            metrics.observe('portal_http_response_size_bytes', len(response.content), view=view)
+        metrics.observe('portal_db_queries_per_request', queries.count, view=view)
+        metrics.observe('portal_db_duration_seconds', queries.duration, view=view)
+        metrics.flush()
+        return response
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return '<sem rota>'
+        return match.view_name or match.route
+
+
+class SlowQueryMiddleware:
+    """
+    Informa ao log de consultas lentas (core.slowqueries) a rota da
+    requisição e grava o que ficou no buffer ao final.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._slowquery_token = None
+        try:
+            return self.get_response(request)
+        finally:
+            if request._slowquery_token is not None:
+                slowqueries.reset_view(request._slowquery_token)
+            if slowqueries.SLOW_QUERY_LOG:
+                slowqueries.flush()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._slowquery_token = slowqueries.set_view(MetricsMiddleware.view_name(request))
+
+
+class ProfilingMiddleware:
+    """
+    Perfila a requisição com o cProfile quando pedido pela equipe ou sorteado
+    na amostra (ver core.profiling). Fica depois do AuthenticationMiddleware,
+    que fornece request.user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trigger = profiling.profile_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        return profiling.profile_request(request, self.get_response, trigger)
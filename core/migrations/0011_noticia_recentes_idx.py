@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_carouselimage_homevideo_overlay_text'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='noticia',
+            index=models.Index(fields=['-data_criacao', 'id'], name='noticia_recentes_idx'),
+        ),
+    ]
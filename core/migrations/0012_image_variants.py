@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_noticia_recentes_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='carouselimage',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versões Responsivas'),
+        ),
+        migrations.AddField(
+            model_name='certification',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versões Responsivas'),
+        ),
+        migrations.AddField(
+            model_name='noticia',
+            name='imagem_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versões Responsivas'),
+        ),
+        migrations.AddField(
+            model_name='operatingbase',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versões Responsivas'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carouselimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', '-created_at'], name='carrossel_ativo_ordem_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-18 10:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_sincronizacao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500, verbose_name='Caminho')),
+                ('view', models.CharField(blank=True, max_length=200, verbose_name='Rota')),
+                ('method', models.CharField(max_length=10, verbose_name='Método')),
+                ('status', models.PositiveSmallIntegerField(verbose_name='Status')),
+                ('trigger', models.CharField(choices=[('manual', 'Pedido pela equipe'), ('amostra', 'Amostra automática')], max_length=10, verbose_name='Origem')),
+                ('duration_ms', models.FloatField(verbose_name='Tempo total (ms)')),
+                ('query_count', models.PositiveIntegerField(verbose_name='Consultas SQL')),
+                ('db_ms', models.FloatField(verbose_name='Tempo no banco (ms)')),
+                ('data', models.BinaryField(verbose_name='Perfil')),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Registrado em')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Perfil de Requisição',
+                'verbose_name_plural': 'Perfis de Requisição',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
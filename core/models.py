@@ -1,5 +1,19 @@
+import json
+import uuid
+import zlib
+
 from django.db import models
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from . import metrics
+
+# Cópia local (por processo) do singleton CompanySettings.
+# O 'token' é comparado com a versão guardada no cache compartilhado para
+# saber se outro processo alterou a configuração.
+_company_settings_local = {'token': None, 'obj': None}
 
 class CompanySettings(models.Model):
     """
@@ -38,6 +52,46 @@ class CompanySettings(models.Model):
             raise ValidationError('Só é permitido ter uma configuração global.')
         return super(CompanySettings, self).save(*args, **kwargs)
 
+    CACHE_KEY = 'core:company_settings'
+    CACHE_TOKEN_KEY = 'core:company_settings:token'
+
+    @classmethod
+    def load(cls):
+        """
+        Retorna o registro único de configuração (ou None), evitando ir ao banco
+        a cada requisição.
+
+        1. Cópia do processo: vale enquanto o token no cache não mudar.
+        2. Cache compartilhado: usado quando outro processo já carregou.
+        3. Banco de dados: só quando o cache está vazio ou foi invalidado.
+        """
+        token = cache.get(cls.CACHE_TOKEN_KEY)
+        if token is not None and token == _company_settings_local['token']:
+            metrics.cache_event('company_settings', True)
+            return _company_settings_local['obj']
+
+        cached = cache.get(cls.CACHE_KEY) if token is not None else None
+        metrics.cache_event('company_settings', cached is not None and cached[0] == token)
+        if cached is not None and cached[0] == token:
+            obj = cached[1]
+        else:
+            obj = cls.objects.first()
+            token = uuid.uuid4().hex
+            # Guardamos (token, obj) juntos para que 'None' (sem configuração)
+            # também fique em cache.
+            cache.set_many({cls.CACHE_KEY: (token, obj), cls.CACHE_TOKEN_KEY: token}, None)
+
+        _company_settings_local['token'] = token
+        _company_settings_local['obj'] = obj
+        return obj
+
+    @classmethod
+    def clear_cache(cls):
+        """Descarta a cópia do processo e a do cache compartilhado."""
+        cache.delete_many([cls.CACHE_KEY, cls.CACHE_TOKEN_KEY])
+        _company_settings_local['token'] = None
+        _company_settings_local['obj'] = None
+
 
 class Certification(models.Model):
     """
@@ -45,6 +99,7 @@ class Certification(models.Model):
     """
     name = models.CharField("Nome do Certificado", max_length=100)
     image = models.ImageField("Imagem do Selo", upload_to="certifications/")
+    image_variants = models.JSONField("Versões Responsivas", default=dict, blank=True, editable=False)
     order = models.IntegerField("Ordem de Exibição", default=0)
 
     class Meta:
@@ -87,6 +142,7 @@ class OperatingBase(models.Model):
     city = models.CharField("Cidade/Estado", max_length=100, default="Manaus - AM")
     phone = models.CharField("Telefone", max_length=20, blank=True)
     image = models.ImageField("Foto da Base", upload_to="bases/", blank=True, null=True)
+    image_variants = models.JSONField("Versões Responsivas", default=dict, blank=True, editable=False)
     map_link = models.URLField("Link do Google Maps", blank=True, help_text="Link para o botão 'Ver no Mapa'")
     
     order = models.IntegerField("Ordem de Exibição", default=0)
@@ -109,7 +165,10 @@ class Noticia(models.Model):
     conteudo = models.TextField("Conteúdo Completo da Notícia")
     
     imagem = models.ImageField(upload_to='noticias_img/')
+    imagem_variants = models.JSONField("Versões Responsivas", default=dict, blank=True, editable=False)
     data_criacao = models.DateTimeField(auto_now_add=True)
+    # Usado pela sincronização incremental (core.sync)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.titulo
@@ -118,6 +177,12 @@ class Noticia(models.Model):
         ordering = ['-data_criacao']
         verbose_name = "Notícia"
         verbose_name_plural = "Notícias"
+        indexes = [
+            # Paginação por cursor da listagem de notícias (core.pagination)
+            models.Index(fields=['-data_criacao', 'id'], name='noticia_recentes_idx'),
+            # Alterações desde o último sync (core.sync)
+            models.Index(fields=['updated_at', 'id'], name='noticia_alteracoes_idx'),
+        ]
 
 # ... (mantenha todo o código que já existe acima)
 
@@ -152,6 +217,7 @@ class CarouselImage(models.Model):
     title = models.CharField("Título (Opcional)", max_length=100, blank=True)
     description = models.CharField("Descrição/Subtítulo (Opcional)", max_length=200, blank=True)
     image = models.ImageField("Imagem do Banner", upload_to="carousel/%Y/%m/")
+    image_variants = models.JSONField("Versões Responsivas", default=dict, blank=True, editable=False)
     order = models.IntegerField("Ordem de Exibição", default=0)
     is_active = models.BooleanField("Ativo?", default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -160,6 +226,70 @@ class CarouselImage(models.Model):
         verbose_name = "Imagem do Carrossel"
         verbose_name_plural = "Carrossel da Home"
         ordering = ['order', '-created_at']
+        indexes = [
+            # Carrossel da Home: só imagens ativas, na ordem de exibição
+            models.Index(fields=['order', '-created_at'], condition=models.Q(is_active=True), name='carrossel_ativo_ordem_idx'),
+        ]
+
+    def __str__(self):
+        return self.title if self.title else f"Banner #{self.id}"
+
+
+class Tombstone(models.Model):
+    """
+    Registro de exclusão dos models sincronizados (core.sync.SYNC_MODELS):
+    é por ele que o cliente do sync incremental fica sabendo o que apagar.
+    Criado automaticamente no post_delete (core.signals).
+    """
+    model = models.CharField("Model", max_length=100)
+    object_id = models.BigIntegerField("ID do Objeto")
+    deleted_at = models.DateTimeField("Excluído em", default=timezone.now)
+
+    class Meta:
+        verbose_name = "Registro de Exclusão"
+        verbose_name_plural = "Registros de Exclusão"
+        indexes = [
+            models.Index(fields=['model', 'deleted_at', 'id'], name='tombstone_sync_idx'),
+        ]
 
     def __str__(self):
-        return self.title if self.title else f"Banner #{self.id}"
\ No newline at end of file
+        return f"{self.model}#{self.object_id}"
+
+
+class RequestProfile(models.Model):
+    """
+    Perfil de uma requisição (cProfile + linha do tempo do SQL), gravado pelo
+    core.middleware.ProfilingMiddleware. Ver core.profiling.
+    """
+    TRIGGER_CHOICES = [
+        ('manual', 'Pedido pela equipe'),
+        ('amostra', 'Amostra automática'),
+    ]
+
+    path = models.CharField("Caminho", max_length=500)
+    view = models.CharField("Rota", max_length=200, blank=True)
+    method = models.CharField("Método", max_length=10)
+    status = models.PositiveSmallIntegerField("Status")
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+', verbose_name="Usuário")
+    trigger = models.CharField("Origem", max_length=10, choices=TRIGGER_CHOICES)
+    duration_ms = models.FloatField("Tempo total (ms)")
+    query_count = models.PositiveIntegerField("Consultas SQL")
+    db_ms = models.FloatField("Tempo no banco (ms)")
+    # JSON comprimido com zlib: {'functions': [...], 'queries': [...]}
+    data = models.BinaryField("Perfil")
+    created_at = models.DateTimeField("Registrado em", default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = "Perfil de Requisição"
+        verbose_name_plural = "Perfis de Requisição"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+    @staticmethod
+    def pack(data):
+        return zlib.compress(json.dumps(data, separators=(',', ':')).encode())
+
+    def unpack(self):
+        return json.loads(zlib.decompress(self.data))
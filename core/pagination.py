@@ -0,0 +1,88 @@
+"""
+Paginação por cursor (keyset) para as listagens do site.
+
+Em vez de OFFSET (que fica mais lento a cada página), o cursor guarda a
+posição do último item exibido (data, id) e a próxima página é buscada com
+um WHERE sobre o índice. O custo por página é constante, mesmo com milhares
+de registros.
+"""
+import base64
+import json
+from dataclasses import dataclass
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+def _encode_cursor(direction, value, pk):
+    raw = json.dumps([direction, value.isoformat(), pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """Retorna (direção, data, id) ou None se o cursor for inválido."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, value, pk = json.loads(base64.urlsafe_b64decode(padded))
+        value = parse_datetime(value)
+        if direction not in ('n', 'p') or value is None:
+            return None
+        return direction, value, int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str | None
+    previous_cursor: str | None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+def keyset_paginate(queryset, cursor, field, page_size=12):
+    """
+    Pagina 'queryset' na ordem (-field, id).
+
+    'cursor' vem da querystring (?cursor=...) e pode ser None/inválido, caso
+    em que a primeira página é retornada.
+    """
+    decoded = _decode_cursor(cursor) if cursor else None
+
+    if decoded is None:
+        rows = list(queryset.order_by(f'-{field}', 'id')[:page_size + 1])
+        has_more_forward = len(rows) > page_size
+        has_more_backward = False
+    elif decoded[0] == 'n':
+        _, value, pk = decoded
+        after = Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__gt': pk})
+        rows = list(queryset.filter(after).order_by(f'-{field}', 'id')[:page_size + 1])
+        has_more_forward = len(rows) > page_size
+        has_more_backward = True
+    else:
+        # Página anterior: busca na ordem inversa e desinverte
+        _, value, pk = decoded
+        before = Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__lt': pk})
+        rows = list(queryset.filter(before).order_by(field, '-id')[:page_size + 1])
+        has_more_backward = len(rows) > page_size
+        has_more_forward = True
+        rows = rows[:page_size]
+        rows.reverse()
+
+    rows = rows[:page_size]
+    next_cursor = previous_cursor = None
+    if rows and has_more_forward:
+        last = rows[-1]
+        next_cursor = _encode_cursor('n', getattr(last, field), last.pk)
+    if rows and has_more_backward:
+        first = rows[0]
+        previous_cursor = _encode_cursor('p', getattr(first, field), first.pk)
+
+    return KeysetPage(rows, next_cursor, previous_cursor)
@@ -0,0 +1,161 @@
+"""
+Perfil de requisições em produção, sem novo deploy.
+
+Uma requisição é perfilada quando:
+- traz '?_profile=<token>' ou o header 'X-Profile: <token>', com um token
+  assinado gerado no admin (lista de Perfis de Requisição) e válido por
+  PROFILING_TOKEN_MAX_AGE segundos. Serve também para perfilar a página
+  como usuário anônimo (ex: curl);
+- traz '?_profile=1' e o usuário logado é staff;
+- cai na amostra aleatória PROFILING_SAMPLE_RATE (0 desliga).
+
+O perfil (funções do cProfile e linha do tempo do SQL) é gravado comprimido
+em core.RequestProfile e aberto no admin. Mantemos só os
+PROFILING_MAX_PROFILES mais recentes.
+"""
+import cProfile
+import os
+import pstats
+import random
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.urls import reverse
+
+from . import slowqueries
+
+PROFILING_SAMPLE_RATE = getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+PROFILING_TOKEN_MAX_AGE = getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 60 * 60)
+PROFILING_MAX_PROFILES = getattr(settings, 'PROFILING_MAX_PROFILES', 500)
+
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+# Funções guardadas por perfil (as de maior tempo acumulado)
+TOP_FUNCTIONS = 300
+
+_signer = signing.TimestampSigner(salt='core.profiling')
+_LIBRARY_PREFIXES = sorted({path + os.sep for path in sys.path if path}, key=len, reverse=True)
+
+
+def make_token(user):
+    """Token para perfilar requisições em nome de 'user' (staff)."""
+    return _signer.sign(str(user.pk))
+
+
+def _valid_token(value):
+    try:
+        user_pk = _signer.unsign(value, max_age=PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    from django.contrib.auth.models import User
+    return User.objects.filter(pk=user_pk, is_staff=True, is_active=True).exists()
+
+
+def profile_trigger(request):
+    """'manual', 'amostra' ou None (não perfilar)."""
+    value = request.GET.get(PROFILE_PARAM) or request.META.get(PROFILE_HEADER)
+    if value:
+        if (':' in value and _valid_token(value)) or request.user.is_staff:
+            return 'manual'
+    if PROFILING_SAMPLE_RATE and random.random() < PROFILING_SAMPLE_RATE:
+        return 'amostra'
+    return None
+
+
+class QueryTimeline:
+    """execute_wrapper: início (relativo à requisição), duração e origem de cada consulta."""
+
+    def __init__(self, start):
+        self.start = start
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        begin = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            end = time.perf_counter()
+            self.queries.append({
+                'start_ms': round((begin - self.start) * 1000, 3),
+                'ms': round((end - begin) * 1000, 3),
+                'sql': sql,
+                'call_site': slowqueries.call_site(),
+            })
+
+
+def _short_path(filename):
+    for prefix in _LIBRARY_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def function_stats(profiler):
+    """Linhas [arquivo, linha, função, chamadas, chamadas primitivas, tottime ms, cumtime ms]."""
+    rows = [
+        [_short_path(filename), line, name, calls, primitive_calls, round(tottime * 1000, 3), round(cumtime * 1000, 3)]
+        for (filename, line, name), (primitive_calls, calls, tottime, cumtime, _) in pstats.Stats(profiler).stats.items()
+    ]
+    rows.sort(key=lambda row: row[6], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+
+def profile_request(request, get_response, trigger):
+    """Executa a requisição sob o cProfile e grava o RequestProfile."""
+    from .models import RequestProfile
+
+    if PROFILE_PARAM in request.GET:
+        # A view não deve ver o parâmetro (o changelist do admin o trataria como filtro)
+        request.GET = request.GET.copy()
+        del request.GET[PROFILE_PARAM]
+    # Sem o '_profile': o token assinado ainda valeria para quem lesse o perfil
+    path = request.path + ('?' + request.GET.urlencode() if request.GET else '')
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    timeline = QueryTimeline(start)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timeline))
+        try:
+            profiler.enable()
+        except ValueError:
+            # Outro profiler já ativo nesta thread (ex: depurador): segue sem perfil
+            return get_response(request)
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    match = getattr(request, 'resolver_match', None)
+    user = getattr(request, 'user', None)
+    profile = RequestProfile.objects.create(
+        path=path[:500],
+        view=(match.view_name if match else '')[:200],
+        method=request.method,
+        status=response.status_code,
+        user=user if user is not None and user.is_authenticated else None,
+        trigger=trigger,
+        duration_ms=round(duration_ms, 3),
+        query_count=len(timeline.queries),
+        db_ms=round(sum(query['ms'] for query in timeline.queries), 3),
+        data=RequestProfile.pack({'functions': function_stats(profiler), 'queries': timeline.queries}),
+    )
+    prune()
+    if trigger == 'manual':
+        response['X-Profile'] = reverse('admin:core_requestprofile_change', args=[profile.pk])
+    return response
+
+
+def prune():
+    """Apaga os perfis mais antigos além de PROFILING_MAX_PROFILES."""
+    from .models import RequestProfile
+
+    old = list(RequestProfile.objects.values_list('pk', flat=True)[PROFILING_MAX_PROFILES:])
+    if old:
+        RequestProfile.objects.filter(pk__in=old).delete()
@@ -0,0 +1,59 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from . import slowqueries
+from .cache import PAGE_CACHE_MODELS, bump_version
+from .images import RESPONSIVE_IMAGE_FIELDS, needs_variants
+from .models import CompanySettings, Tombstone
+from .sync import SYNC_MODELS
+from .tasks import generate_image_variants
+
+
+@receiver([post_save, post_delete], sender=CompanySettings)
+def invalidate_company_settings(sender, **kwargs):
+    """
+    Qualquer alteração na configuração global derruba o cache do singleton,
+    para que o próximo acesso recarregue do banco.
+    """
+    CompanySettings.clear_cache()
+
+
+@receiver([post_save, post_delete])
+def invalidate_public_pages(sender, **kwargs):
+    """
+    Invalida no cache de páginas apenas as páginas que dependem do model
+    alterado (ver core.cache.PAGE_CACHE_MODELS).
+    """
+    label = sender._meta.label_lower
+    if label in PAGE_CACHE_MODELS:
+        bump_version(label)
+
+
+@receiver(post_save)
+def enqueue_image_variants(sender, instance, raw=False, **kwargs):
+    """
+    Agenda a geração das versões responsivas das imagens recém-enviadas
+    (ver core.images.RESPONSIVE_IMAGE_FIELDS). O processamento roda no
+    worker ('manage.py runworker'), fora da requisição.
+    """
+    label = sender._meta.label_lower
+    if raw or label not in RESPONSIVE_IMAGE_FIELDS:
+        return
+    if any(needs_variants(instance, field_name) for field_name in RESPONSIVE_IMAGE_FIELDS[label]):
+        generate_image_variants.enqueue(label, instance.pk)
+
+
+@receiver(post_delete)
+def record_tombstone(sender, instance, **kwargs):
+    """
+    Guarda a exclusão dos models sincronizados (core.sync.SYNC_MODELS) para
+    que os clientes do sync incremental apaguem a sua cópia.
+    """
+    if sender._meta.label_lower in SYNC_MODELS:
+        Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+@receiver(connection_created)
+def install_slow_query_log(sender, connection, **kwargs):
+    """Toda conexão nova (requisições, comandos, runworker) passa pelo log de consultas lentas."""
+    slowqueries.install(connection)
@@ -0,0 +1,164 @@
+"""
+Log de consultas lentas.
+
+Um execute_wrapper instalado em toda conexão (sinal connection_created,
+ver core.signals) cronometra cada consulta. As que passam de
+SLOW_QUERY_THRESHOLD_MS viram um registro com a "impressão digital" do SQL
+(literais e listas de IN trocados por '?'), a rota de origem e a linha do
+nosso código que disparou a consulta.
+
+Os registros ficam num buffer e são acrescentados em lote ao arquivo
+SLOW_QUERY_LOG (uma linha JSON por consulta), no fim de cada requisição ou
+quando o buffer enche. O relatório sai de 'manage.py slowquery_report'.
+"""
+import atexit
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils import timezone
+
+SLOW_QUERY_LOG = getattr(settings, 'SLOW_QUERY_LOG', None)
+SLOW_QUERY_THRESHOLD_MS = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100)
+SLOW_QUERY_BATCH_SIZE = getattr(settings, 'SLOW_QUERY_BATCH_SIZE', 50)
+
+# Rota da requisição em andamento (SlowQueryMiddleware). Fora de requisição
+# fica o comando do manage.py (ex: 'manage.py runworker').
+_current_view = ContextVar('slowquery_view', default=None)
+
+_lock = threading.Lock()
+_buffer = []
+
+_PROJECT_DIR = str(settings.BASE_DIR) + os.sep
+_IGNORED_DIRS = ('site-packages', 'dist-packages', os.sep + 'venv' + os.sep, os.sep + '.venv' + os.sep)
+# Módulos com execute_wrappers: os frames deles não são a origem da consulta
+_WRAPPER_FILES = {
+    os.path.join(os.path.dirname(__file__), name) for name in ('slowqueries.py', 'middleware.py', 'profiling.py')
+}
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|\?')
+_IN_LIST_RE = re.compile(r'\bIN \((?:\?, )*\?\)', re.IGNORECASE)
+_VALUES_LIST_RE = re.compile(r'\bVALUES (?:\((?:\?, )*\?\)(?:, )?)+', re.IGNORECASE)
+_SPACES_RE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """SQL sem os valores: a mesma consulta com parâmetros diferentes fica igual."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _PLACEHOLDER_RE.sub('?', sql)
+    sql = _SPACES_RE.sub(' ', sql).strip()
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _VALUES_LIST_RE.sub('VALUES (...)', sql)
+
+
+def fingerprint(normalized_sql):
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:12]
+
+
+def call_site():
+    """Primeiro frame do nosso código (fora do Django e de bibliotecas) na pilha."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(_PROJECT_DIR) and filename not in _WRAPPER_FILES
+                and not any(part in filename for part in _IGNORED_DIRS)):
+            return f'{os.path.relpath(filename, _PROJECT_DIR)}:{frame.f_lineno} ({frame.f_code.co_name})'
+        frame = frame.f_back
+    return ''
+
+
+def current_view():
+    view = _current_view.get()
+    if view is not None:
+        return view
+    if len(sys.argv) > 1 and sys.argv[0].endswith('manage.py'):
+        return f'manage.py {sys.argv[1]}'
+    return ''
+
+
+def set_view(view):
+    """Chamado pelo SlowQueryMiddleware. Retorna o token para reset_view."""
+    return _current_view.set(view)
+
+
+def reset_view(token):
+    _current_view.reset(token)
+
+
+class SlowQueryWrapper:
+    """execute_wrapper que registra as consultas acima do limite."""
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms >= SLOW_QUERY_THRESHOLD_MS:
+                record(sql, elapsed_ms, many, context['connection'].alias)
+
+
+slow_query_wrapper = SlowQueryWrapper()
+
+
+def install(connection):
+    """Instala o wrapper na conexão (uma vez só)."""
+    if SLOW_QUERY_LOG and slow_query_wrapper not in connection.execute_wrappers:
+        # No início da lista: connection.execute_wrapper() (usado pelo
+        # MetricsMiddleware) remove o último item ao sair do bloco, e a
+        # conexão costuma ser aberta dentro dele.
+        connection.execute_wrappers.insert(0, slow_query_wrapper)
+
+
+def record(sql, elapsed_ms, many, alias):
+    normalized = normalize_sql(sql)
+    entry = {
+        'at': timezone.now().isoformat(),
+        'ms': round(elapsed_ms, 3),
+        'fingerprint': fingerprint(normalized),
+        'sql': normalized,
+        'view': current_view(),
+        'call_site': call_site(),
+        'db': alias,
+        'many': many,
+    }
+    with _lock:
+        _buffer.append(entry)
+        full = len(_buffer) >= SLOW_QUERY_BATCH_SIZE
+    if full:
+        flush()
+
+
+def flush():
+    """Acrescenta o buffer ao SLOW_QUERY_LOG numa única escrita."""
+    with _lock:
+        if not _buffer:
+            return
+        lines = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in _buffer)
+        _buffer.clear()
+    os.makedirs(os.path.dirname(SLOW_QUERY_LOG) or '.', exist_ok=True)
+    # Modo 'a' (O_APPEND): processos diferentes não sobrescrevem as linhas uns dos outros
+    with open(SLOW_QUERY_LOG, 'a', encoding='utf-8') as fp:
+        fp.write(lines)
+
+
+atexit.register(lambda: SLOW_QUERY_LOG and flush())
+
+
+def read_log(path=None):
+    """Registros do log, na ordem em que foram gravados (linhas inválidas são puladas)."""
+    with open(path or SLOW_QUERY_LOG, encoding='utf-8') as fp:
+        for line in fp:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # linha cortada (processo morto no meio da escrita)
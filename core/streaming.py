@@ -0,0 +1,203 @@
+"""
+Arquivos gerados aos poucos para StreamingHttpResponse (CSV, XLSX e ZIP).
+
+As funções recebem um iterável de linhas (de preferência um
+queryset.iterator(chunk_size=...)) e devolvem um gerador de bytes: o
+download começa com as primeiras linhas e a memória usada não depende do
+número de registros.
+
+O XLSX é montado à mão (é um ZIP com XML): o openpyxl só grava o arquivo
+inteiro no fim. O zipfile escreve em saída não "seekable" usando data
+descriptors, o que permite mandar cada pedaço do ZIP assim que fica pronto.
+"""
+import csv
+import io
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+
+# Linhas acumuladas antes de cada envio
+ROWS_PER_CHUNK = 500
+
+CSV_CONTENT_TYPE = 'text/csv; charset=utf-8'
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Caracteres que fazem o Excel/LibreOffice interpretar a célula do CSV como fórmula
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class ZipStream(io.RawIOBase):
+    """
+    Saída de um zipfile.ZipFile que acumula os bytes escritos para serem
+    enviados com drain(). Não é "seekable": o zipfile grava os tamanhos
+    depois de cada arquivo (data descriptor) em vez de voltar ao cabeçalho.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _format_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%d/%m/%Y %H:%M')
+    if isinstance(value, date):
+        return value.strftime('%d/%m/%Y')
+    if isinstance(value, bool):
+        return 'Sim' if value else 'Não'
+    return value
+
+
+def _csv_cell(value):
+    value = _format_value(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Echo:
+    """'Arquivo' do csv.writer que só devolve a linha formatada."""
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(header, rows):
+    """CSV em UTF-8 com BOM (o Excel reconhece os acentos) e ';' como separador."""
+    writer = csv.writer(_Echo(), delimiter=';')
+    yield ('\ufeff' + writer.writerow(header)).encode('utf-8')
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow([_csv_cell(value) for value in row]))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ''.join(lines).encode('utf-8')
+            lines = []
+    if lines:
+        yield ''.join(lines).encode('utf-8')
+
+
+# --- XLSX ---
+
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+# Caracteres de controle não são aceitos em XML 1.0
+_XML_INVALID = dict.fromkeys(c for c in range(32) if c not in (9, 10, 13))
+
+
+def _xlsx_cell(value):
+    value = _format_value(value)
+    if isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    text = escape(str(value).translate(_XML_INVALID))
+    # Texto direto na célula (inlineStr): dispensa a tabela sharedStrings,
+    # que exigiria conhecer todos os textos antes de gravar a planilha
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return '<row>' + ''.join(_xlsx_cell(value) for value in values) + '</row>'
+
+
+def xlsx_stream(header, rows, sheet_name='Planilha1'):
+    """Planilha XLSX (uma aba) gerada linha a linha."""
+    output = ZipStream()
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(name=escape(sheet_name[:31], {'"': '&quot;'})))
+        yield output.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write((_SHEET_START + _xlsx_row(header)).encode('utf-8'))
+            lines = []
+            for row in rows:
+                lines.append(_xlsx_row(row))
+                if len(lines) >= ROWS_PER_CHUNK:
+                    sheet.write(''.join(lines).encode('utf-8'))
+                    lines = []
+                    chunk = output.drain()
+                    if chunk:
+                        yield chunk
+            sheet.write((''.join(lines) + _SHEET_END).encode('utf-8'))
+    yield output.drain()
+
+
+EXPORT_FORMATS = {
+    'csv': (csv_stream, CSV_CONTENT_TYPE),
+    'xlsx': (xlsx_stream, XLSX_CONTENT_TYPE),
+}
+
+
+def streaming_export(file_format, filename, header, rows):
+    """StreamingHttpResponse com a planilha 'file_format' ('csv' ou 'xlsx') para download."""
+    generator, content_type = EXPORT_FORMATS[file_format]
+    response = StreamingHttpResponse(generator(header, rows), content_type=content_type)
+    response['Content-Disposition'] = content_disposition_header(True, f'{filename}.{file_format}')
+    return response
@@ -0,0 +1,180 @@
+"""
+Sincronização incremental (delta sync) para clientes que mantêm uma cópia
+local do conteúdo do site (app, quiosque).
+
+O cliente chama o endpoint sem parâmetros na primeira vez e depois sempre
+com ?since=<token> devolvido na resposta anterior. Cada resposta traz só o
+que mudou desde o token:
+
+    {"changed": [...], "deleted": [ids], "since": "<novo token>", "has_more": false}
+
+Com has_more=true o cliente chama de novo na hora, com o novo token.
+
+As alterações são lidas em ordem de (updated_at, id) e as exclusões em
+ordem de (deleted_at, id) na tabela Tombstone, as duas com índice: o custo
+de um sync é proporcional ao número de mudanças, não ao tamanho da tabela.
+Registros com menos de SYNC_LAG segundos ficam para o próximo sync, para
+não perder gravações de transações que ainda não tinham sido confirmadas.
+
+Os Tombstones são guardados por SYNC_TOMBSTONE_RETENTION_DAYS dias
+('manage.py clear_tombstones', uma vez por dia). Um token mais antigo que
+isso pode ter perdido exclusões: a resposta é 410 e o cliente refaz a
+sincronização completa (sem 'since'), apagando a cópia local.
+"""
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Tombstone
+
+# Models cujas exclusões geram Tombstone (ver core.signals)
+SYNC_MODELS = ('core.noticia', 'services.service', 'careers.jobopportunity')
+
+SYNC_LAG = getattr(settings, 'SYNC_LAG', 10)
+SYNC_PAGE_SIZE = getattr(settings, 'SYNC_PAGE_SIZE', 200)
+SYNC_TOMBSTONE_RETENTION_DAYS = getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 90)
+
+
+class FullResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Token mais antigo que o histórico de exclusões. Refaça a sincronização completa (sem 'since')."
+    default_code = 'full_resync'
+
+
+def tombstone_retention_start():
+    """Exclusões anteriores a este momento podem já ter sido apagadas."""
+    return timezone.now() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def prune_tombstones():
+    """Apaga os Tombstones mais antigos que SYNC_TOMBSTONE_RETENTION_DAYS. Retorna quantos."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=tombstone_retention_start()).delete()
+    return deleted
+
+
+def encode_token(changes, deletions):
+    """'changes' e 'deletions' são posições (data, id) ou None."""
+    raw = json.dumps([
+        [changes[0].isoformat(), changes[1]] if changes else None,
+        [deletions[0].isoformat(), deletions[1]] if deletions else None,
+    ])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_token(token):
+    """Inverso de encode_token. Levanta ValueError se o token for inválido."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        positions = json.loads(base64.urlsafe_b64decode(padded))
+        decoded = []
+        for position in positions:
+            if position is None:
+                decoded.append(None)
+                continue
+            value, pk = position
+            value = parse_datetime(value)
+            if value is None:
+                raise ValueError(token)
+            decoded.append((value, int(pk)))
+        changes, deletions = decoded
+    except (TypeError, ValueError) as exc:
+        raise ValueError(token) from exc
+    return changes, deletions
+
+
+def _after(field, position):
+    """Filtro keyset: itens depois de 'position' na ordem (field, id)."""
+    value, pk = position
+    return Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': pk})
+
+
+class DeltaSyncAPI(APIView):
+    """
+    View base dos endpoints de sync. Subclasses definem:
+
+    - model: o model sincronizado (precisa estar em SYNC_MODELS);
+    - fields: colunas enviadas em 'changed', lidas com .values();
+    - expressions: campos extras calculados no banco (nome -> expressão),
+      ex: {'category_name': F('category__name')};
+    - file_fields: campos de arquivo, enviados como URL absoluta;
+    - active_field: campo booleano de publicação; registros inativos vão
+      para 'deleted' em vez de 'changed'.
+    """
+    model = None
+    fields = ()
+    expressions = {}
+    file_fields = ()
+    active_field = None
+    page_size = SYNC_PAGE_SIZE
+
+    def get(self, request):
+        label = self.model._meta.label_lower
+        cutoff = timezone.now() - timedelta(seconds=SYNC_LAG)
+
+        since = request.query_params.get('since')
+        if since:
+            try:
+                changes_pos, deletions_pos = decode_token(since)
+            except ValueError:
+                raise ValidationError({'since': "Token inválido. Refaça a sincronização completa (sem 'since')."})
+            if deletions_pos is None or deletions_pos[0] < tombstone_retention_start():
+                raise FullResyncRequired()
+        else:
+            # Primeiro sync: tudo o que existe hoje; exclusões anteriores
+            # não interessam a quem ainda não tem nada.
+            changes_pos, deletions_pos = None, (cutoff, 0)
+
+        columns = list(dict.fromkeys([*self.fields, 'id', 'updated_at', *filter(None, [self.active_field])]))
+        rows = self.model._default_manager.filter(updated_at__lte=cutoff)
+        if changes_pos:
+            rows = rows.filter(_after('updated_at', changes_pos))
+        rows = list(rows.order_by('updated_at', 'id').values(*columns, **self.expressions)[:self.page_size + 1])
+
+        tombstones = Tombstone.objects.filter(model=label, deleted_at__lte=cutoff)
+        if deletions_pos:
+            tombstones = tombstones.filter(_after('deleted_at', deletions_pos))
+        tombstones = list(
+            tombstones.order_by('deleted_at', 'id').values_list('deleted_at', 'id', 'object_id')[:self.page_size + 1]
+        )
+
+        has_more = len(rows) > self.page_size or len(tombstones) > self.page_size
+        rows = rows[:self.page_size]
+        tombstones = tombstones[:self.page_size]
+        if rows:
+            changes_pos = (rows[-1]['updated_at'], rows[-1]['id'])
+        if tombstones:
+            deletions_pos = tombstones[-1][:2]
+
+        changed = []
+        deleted = [object_id for _, _, object_id in tombstones]
+        for row in rows:
+            if self.active_field and not row[self.active_field]:
+                deleted.append(row['id'])
+            else:
+                changed.append(self.serialize(row, request))
+
+        return Response({
+            'changed': changed,
+            'deleted': deleted,
+            'since': encode_token(changes_pos, deletions_pos),
+            'has_more': has_more,
+        })
+
+    def serialize(self, row, request):
+        item = {name: row[name] for name in [*self.fields, *self.expressions]}
+        for name in self.file_fields:
+            if item[name]:
+                url = self.model._meta.get_field(name).storage.url(item[name])
+                item[name] = request.build_absolute_uri(url)
+            else:
+                item[name] = None
+        return item
@@ -0,0 +1,19 @@
+from django.apps import apps
+
+from tasks.queue import task
+from .cache import PAGE_CACHE_MODELS, bump_version
+from .images import RESPONSIVE_IMAGE_FIELDS, update_variants
+
+
+@task
+def generate_image_variants(label, pk):
+    """Gera as versões responsivas das imagens de um registro (ver core.images)."""
+    instance = apps.get_model(label).objects.filter(pk=pk).first()
+    if instance is None:
+        return
+    changed = False
+    for field_name in RESPONSIVE_IMAGE_FIELDS[label]:
+        changed |= update_variants(instance, field_name)
+    # As páginas em cache precisam do novo srcset
+    if changed and label in PAGE_CACHE_MODELS:
+        bump_version(label)
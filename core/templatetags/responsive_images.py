@@ -0,0 +1,54 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(instance, field_name, alt='', sizes='100vw', **attrs):
+    """
+    Renderiza um <picture> com 'srcset' das versões geradas por core.images.
+
+    Uso:
+        {% load responsive_images %}
+        {% responsive_image noticia 'imagem' alt=noticia.titulo sizes='(min-width: 992px) 25vw, 100vw' class='card-img-top' %}
+
+    Sem versões (imagem ainda não processada) cai no <img> com o original.
+    """
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return ''
+
+    variants = getattr(instance, f'{field_name}_variants', None) or {}
+    sources = variants.get('sources') or {}
+
+    img_attrs = {'src': field_file.url, 'alt': alt, 'loading': 'lazy', 'decoding': 'async'}
+    if variants.get('width') and variants.get('height'):
+        img_attrs['width'] = variants['width']
+        img_attrs['height'] = variants['height']
+    img_attrs.update(attrs)
+
+    # O JPEG entra como srcset do próprio <img> (fallback universal)
+    jpeg = sources.get('image/jpeg')
+    if jpeg:
+        img_attrs['srcset'] = _srcset(field_file.storage, jpeg)
+        img_attrs['sizes'] = sizes
+
+    img = format_html('<img{}>', format_html_join('', ' {}="{}"', img_attrs.items()))
+    if not sources:
+        return img
+
+    source_tags = format_html_join(
+        '',
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (content_type, _srcset(field_file.storage, entries), sizes)
+            for content_type, entries in sources.items()
+            if content_type != 'image/jpeg'
+        ),
+    )
+    return format_html('<picture>{}{}</picture>', source_tags, img)
+
+
+def _srcset(storage, entries):
+    return ', '.join(f'{storage.url(name)} {width}w' for width, name in entries)
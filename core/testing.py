@@ -0,0 +1,86 @@
+"""
+Utilitários compartilhados pelos testes das apps (tests.py).
+"""
+import atexit
+import os
+import re
+import shutil
+import tempfile
+
+from django.db import connection
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+from . import metrics
+
+# Linha do EXPLAIN QUERY PLAN do SQLite que indica varredura da tabela
+# inteira, sem índice (ex: "SCAN careers_candidate"; até o SQLite 3.36,
+# "SCAN TABLE careers_candidate"; com apelido, "SCAN T AS U"). "SCAN t
+# USING INDEX i" é a leitura em ordem do índice (com LIMIT) e não conta
+FULL_SCAN_RE = re.compile(r'^SCAN (?:TABLE )?\w+(?: AS \w+)?$')
+
+
+def sqlite_query_plan(queryset):
+    """Retorna as linhas de 'EXPLAIN QUERY PLAN' do SQLite para o queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class QueryPlanAssertionsMixin:
+    """Mixin para TestCase: falha se a consulta varrer a tabela sem índice."""
+
+    def assertUsesIndex(self, queryset):
+        if connection.vendor != 'sqlite':
+            self.skipTest("EXPLAIN QUERY PLAN só é verificado no SQLite")
+        plan = sqlite_query_plan(queryset)
+        full_scans = [line for line in plan if FULL_SCAN_RE.match(line)]
+        self.assertFalse(full_scans, f"Consulta sem índice: {plan}\nSQL: {queryset.query}")
+
+
+class TempMediaRootMixin:
+    """Mixin para TestCase: MEDIA_ROOT temporário, esvaziado a cada teste."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+        super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(self._clear_media_root)
+
+    def _clear_media_root(self):
+        for name in os.listdir(self.media_root):
+            shutil.rmtree(os.path.join(self.media_root, name), ignore_errors=True)
+
+    def media_files(self):
+        """Caminhos (relativos a MEDIA_ROOT) de todos os arquivos gravados."""
+        return sorted(
+            os.path.relpath(os.path.join(directory, name), self.media_root)
+            for directory, _, names in os.walk(self.media_root) for name in names
+        )
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runner do 'manage.py test' (TEST_RUNNER): as métricas das requisições
+    feitas nos testes vão para um METRICS_DIR temporário, não para o do
+    projeto.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.metrics_dir = tempfile.mkdtemp()
+        self.metrics_settings = override_settings(METRICS_DIR=self.metrics_dir)
+        self.metrics_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.metrics_settings.disable()
+        # O flush do fim do processo gravaria no METRICS_DIR do projeto
+        atexit.unregister(metrics.flush)
+        shutil.rmtree(self.metrics_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -1,3 +1,428 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import CommandError, call_command
+from django.template import Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from careers.models import Candidate
+from accounts.models import CandidateProfile
+from .benchmark import (
+    BENCH_STAFF_USERNAME, BENCH_USERNAME, discover_routes, load_budgets, make_client, measure_route,
+)
+from . import metrics, profiling, streaming
+from .models import CarouselImage, Noticia, RequestProfile, Tombstone
+from .sync import _after, encode_token
+from .testing import FULL_SCAN_RE, QueryPlanAssertionsMixin, TempMediaRootMixin
+
+
+class QueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_linhas_de_varredura_completa(self):
+        for line in ('SCAN core_noticia', 'SCAN TABLE core_noticia', 'SCAN core_noticia AS U0'):
+            self.assertRegex(line, FULL_SCAN_RE)
+        for line in ('SCAN core_noticia USING INDEX noticia_recentes_idx', 'SEARCH core_noticia USING INDEX x (id=?)'):
+            self.assertNotRegex(line, FULL_SCAN_RE)
+
+    def test_carrossel_ativo(self):
+        self.assertUsesIndex(CarouselImage.objects.filter(is_active=True))
+
+    def test_listagem_de_noticias(self):
+        self.assertUsesIndex(Noticia.objects.order_by('-data_criacao', 'id')[:13])
+
+    def test_sync_de_alteracoes(self):
+        position = (timezone.now(), 10)
+        self.assertUsesIndex(
+            Noticia.objects.filter(_after('updated_at', position), updated_at__lte=timezone.now())
+            .order_by('updated_at', 'id')[:201]
+        )
+
+    def test_sync_de_exclusoes(self):
+        position = (timezone.now(), 10)
+        self.assertUsesIndex(
+            Tombstone.objects.filter(_after('deleted_at', position), model='core.noticia', deleted_at__lte=timezone.now())
+            .order_by('deleted_at', 'id')[:201]
+        )
+
+
+class TombstoneRetentionTests(TestCase):
+    """Exclusões guardadas por SYNC_TOMBSTONE_RETENTION_DAYS (core.sync)."""
+
+    def setUp(self):
+        now = timezone.now()
+        self.old = Tombstone.objects.create(model='core.noticia', object_id=1, deleted_at=now - timedelta(days=91))
+        self.recent = Tombstone.objects.create(model='core.noticia', object_id=2, deleted_at=now - timedelta(days=89))
+
+    def sync(self, deleted_since):
+        token = encode_token(None, (timezone.now() - deleted_since, 0))
+        return self.client.get(reverse('api_sync_noticias'), {'since': token}, HTTP_ACCEPT='application/json')
+
+    def test_clear_tombstones(self):
+        out = StringIO()
+        call_command('clear_tombstones', stdout=out)
+        self.assertIn('1 registro(s)', out.getvalue())
+        self.assertEqual(list(Tombstone.objects.all()), [self.recent])
+
+    def test_token_antigo_pede_sincronizacao_completa(self):
+        response = self.sync(timedelta(days=91))
+        self.assertEqual(response.status_code, 410)
+        self.assertIn("sincronização completa", response.json()['detail'])
+
+    def test_token_dentro_do_prazo(self):
+        response = self.sync(timedelta(days=90) - timedelta(minutes=1))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['deleted'], [2])
+
+def _render_without_instrumentation(template, context):
+    # Template._render original, sem o template_rendered.send do test runner
+    return template.nodelist.render(context)
+
+
+class PerformanceBudgetTests(TestCase):
+    """
+    Orçamento por rota (config/performance_budgets.json): cada rota do
+    config/urls.py é acessada com o cache vazio, anônima e logada, sobre a
+    massa do seed_benchmark. Falha se passar do limite de consultas ou de
+    tempo. Em máquinas lentas, BUDGET_TIME_FACTOR=2 dobra os limites de tempo.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(
+            MEDIA_ROOT=media_root,
+            # O cache é esvaziado antes de cada requisição: nunca o do projeto
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+        ))
+        # O test runner instrumenta cada template renderizado (signal e cópia
+        # do contexto, para o response.context do test client). Com os
+        # <select> do list_editable isso dobra o tempo medido: mede sem, como
+        # em produção
+        cls.enterClassContext(mock.patch.object(Template, '_render', _render_without_instrumentation))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manifest = load_budgets()
+        call_command(
+            'seed_benchmark', scale=cls.manifest['scale'], i_know_this_is_not_production=True, stdout=StringIO(),
+        )
+
+    def test_todas_as_rotas_tem_orcamento(self):
+        missing = sorted({route.name for route in discover_routes()} - set(self.manifest['routes']))
+        self.assertFalse(missing, f"Rotas sem orçamento em config/performance_budgets.json: {missing}")
+
+    def test_rotas_dentro_do_orcamento(self):
+        # cache.clear() abaixo esvazia só o cache do teste
+        self.assertIsInstance(caches['default'], LocMemCache)
+        time_factor = float(os.environ.get('BUDGET_TIME_FACTOR', 1))
+        clients = {
+            'anonimo': make_client('testserver'),
+            'candidato': make_client('testserver', BENCH_USERNAME),
+            'staff': make_client('testserver', BENCH_STAFF_USERNAME),
+        }
+        for route in discover_routes():
+            budget = self.manifest['routes'].get(route.name)
+            if budget is None:
+                continue  # coberto por test_todas_as_rotas_tem_orcamento
+            for user in route.users:
+                with self.subTest(route=route.name, user=user):
+                    result = measure_route(
+                        route, clients[user], user, requests=3, warmup=1, before_request=cache.clear, memory=False,
+                    )
+                    self.assertLess(result.status, 400, f"{route.url} respondeu {result.status}")
+                    self.assertLessEqual(
+                        result.queries, budget['queries'],
+                        f"{route.url} ({user}) fez {result.queries} consultas; orçamento: {budget['queries']}",
+                    )
+                    self.assertLessEqual(
+                        result.p50_ms, budget['ms'] * time_factor,
+                        f"{route.url} ({user}) levou {result.p50_ms:.1f} ms; orçamento: {budget['ms']} ms",
+                    )
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SeedBenchmarkTests(TempMediaRootMixin, TestCase):
+    """O seed_benchmark cria um superusuário: só com DEBUG ou pedido explícito, e com senha nova."""
+
+    def test_recusa_sem_debug(self):
+        with self.assertRaisesMessage(CommandError, '--i-know-this-is-not-production'):
+            call_command('seed_benchmark', scale=0.001, stdout=StringIO())
+        self.assertFalse(User.objects.exists())
+
+    def test_senha_aleatoria(self):
+        out = StringIO()
+        with self.settings(DEBUG=True):
+            call_command('seed_benchmark', scale=0.001, stdout=out)
+        password = re.search(r"senha '([^']+)'", out.getvalue()).group(1)
+        self.assertGreaterEqual(len(password), 16)
+        self.assertTrue(self.client.login(username=BENCH_STAFF_USERNAME, password=password))
+        self.assertTrue(User.objects.get(username=BENCH_USERNAME).check_password(password))
+
+class MediaAccessTests(TempMediaRootMixin, TestCase):
+    """/media/ (core.media): arquivos pessoais só para o dono ou para staff com permissão."""
+
+    RESUME = 'candidates/resumes/cv.pdf'
+    PUBLIC = 'home/video.mp4'
+
+    def setUp(self):
+        super().setUp()
+        for name, content in ((self.RESUME, b'%PDF-1.4 curriculo'), (self.PUBLIC, b'0123456789')):
+            os.makedirs(os.path.dirname(os.path.join(self.media_root, name)), exist_ok=True)
+            with open(os.path.join(self.media_root, name), 'wb') as fp:
+                fp.write(content)
+        self.owner = User.objects.create_user('candidato', 'candidato@example.com', 'senha')
+        CandidateProfile.objects.create(user=self.owner, resume_file=self.RESUME)
+        # Candidatura pelo site: o Candidate aponta para o mesmo arquivo do perfil
+        Candidate.objects.create(user=self.owner, name="Candidato", email=self.owner.email, phone='0', resume_file=self.RESUME)
+
+    def get(self, name, user=None, **extra):
+        if user is not None:
+            self.client.force_login(user)
+        return self.client.get(f'/media/{name}', **extra)
+
+    def test_dono(self):
+        response = self.get(self.RESUME, self.owner)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 curriculo')
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_rh_com_permissao_de_ver_candidatos(self):
+        rh = User.objects.create_user('rh', is_staff=True)
+        rh.user_permissions.add(Permission.objects.get(codename='view_candidate'))
+        self.assertEqual(self.get(self.RESUME, rh).status_code, 200)
+
+    def test_staff_sem_permissao(self):
+        self.assertEqual(self.get(self.RESUME, User.objects.create_user('staff', is_staff=True)).status_code, 404)
+
+    def test_outro_usuario(self):
+        self.assertEqual(self.get(self.RESUME, User.objects.create_user('outro')).status_code, 404)
+
+    def test_anonimo(self):
+        self.assertEqual(self.get(self.RESUME).status_code, 404)
+
+    def test_caminho_fora_do_media_root(self):
+        self.client.force_login(User.objects.create_superuser('admin'))
+        for name in ('../manage.py', 'home/../../manage.py', '%2e%2e/manage.py', '/etc/passwd'):
+            with self.subTest(name=name):
+                self.assertEqual(self.get(name).status_code, 404)
+
+    def test_arquivo_publico(self):
+        response = self.get(self.PUBLIC)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_range(self):
+        response = self.get(self.PUBLIC, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+
+    def test_range_fora_do_arquivo(self):
+        response = self.get(self.PUBLIC, HTTP_RANGE='bytes=10-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_range_de_arquivo_protegido_sem_acesso(self):
+        self.assertEqual(self.get(self.RESUME, HTTP_RANGE='bytes=0-3').status_code, 404)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ConditionalPageTests(TestCase):
+    """ETag/Last-Modified só para visitantes anônimos (core.cache.conditional_page)."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonimo_recebe_304(self):
+        response = self.client.get('/carreiras/')
+        self.assertIn('ETag', response)
+        again = self.client.get('/carreiras/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_logado_sem_validadores(self):
+        # O HTML traz o token CSRF da sessão: um 304 após novo login deixaria o logout dando 403
+        etag = self.client.get('/carreiras/')['ETag']
+        self.client.force_login(User.objects.create_user('cand', password='x'))
+        response = self.client.get('/carreiras/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+        again = self.client.get('/carreiras/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(again.status_code, 200)
+
+class MetricsAccessTests(TestCase):
+    """/metrics/ só para staff e para o coletor com METRICS_TOKEN; os outros recebem 404."""
+
+    def test_anonimo(self):
+        # O test client chega de 127.0.0.1, como tudo atrás do nginx no mesmo servidor
+        self.assertEqual(self.client.get('/metrics/').status_code, 404)
+
+    @override_settings(METRICS_TOKEN='segredo')
+    def test_token_do_coletor(self):
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer segredo').status_code, 200)
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer outro').status_code, 404)
+        self.assertEqual(self.client.get('/metrics/').status_code, 404)
+
+    def test_staff(self):
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        self.assertEqual(self.client.get('/metrics/').status_code, 200)
+
+
+class MetricsSnapshotTests(TestCase):
+    """Cópias das métricas por processo em METRICS_DIR (core.metrics)."""
+
+    def setUp(self):
+        self.metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metrics_dir, ignore_errors=True)
+        self.enterContext(override_settings(METRICS_DIR=self.metrics_dir))
+
+    def write_snapshot(self, name, hits):
+        with open(os.path.join(self.metrics_dir, name), 'w') as fp:
+            json.dump({
+                'counters': [['portal_cache_requests_total', [['result', 'hit'], ['view', 'teste']], hits]],
+                'histograms': [],
+            }, fp)
+
+    def hits(self):
+        counters, _ = metrics.collect()
+        return counters.get(('portal_cache_requests_total', (('result', 'hit'), ('view', 'teste'))))
+
+    def finished_pid(self):
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        return process.pid
+
+    def test_processos_encerrados_vao_para_o_arquivo(self):
+        finished = self.finished_pid()
+        self.write_snapshot(f'{finished}-1.json', 5)
+        self.write_snapshot(f'{os.getppid()}-1.json', 2)  # processo ainda vivo
+        self.assertEqual(self.hits(), 7)
+        names = set(os.listdir(self.metrics_dir))
+        self.assertIn(metrics.ARCHIVE_NAME, names)
+        self.assertNotIn(f'{finished}-1.json', names)
+        self.assertIn(f'{os.getppid()}-1.json', names)
+
+        # O que já foi arquivado não é somado de novo
+        self.assertEqual(self.hits(), 7)
+        self.write_snapshot(f'{self.finished_pid()}-1.json', 1)
+        self.assertEqual(self.hits(), 8)
+
+    def test_arquivo_por_processo(self):
+        self.enterContext(mock.patch.object(metrics, '_snapshot_file', (None, None)))
+        name = metrics._snapshot_name()
+        self.assertTrue(name.startswith(f'{os.getpid()}-'))
+        self.assertEqual(metrics._snapshot_name(), name)
+        # Outro processo (fork) com o mesmo estado do módulo: outro arquivo
+        with mock.patch('os.getpid', return_value=os.getpid() + 1):
+            self.assertNotEqual(metrics._snapshot_name(), name)
+
+    def test_processo_sem_metricas_nao_grava(self):
+        with mock.patch.object(metrics, 'snapshot', return_value={'counters': [], 'histograms': []}):
+            metrics.flush(force=True)
+        self.assertEqual(os.listdir(self.metrics_dir), [])
+
+class ProfilingTests(TestCase):
+    """Perfil pedido por '?_profile' (core.profiling, core.middleware.ProfilingMiddleware)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_superuser('rh', password='x')
+        cls.url = reverse('rh_admin:careers_candidate_changelist')
+
+    def test_staff_com_profile_1(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, {'_profile': '1', 'status': 'NOVO'})
+        # Sem o parâmetro chegar ao changelist, que o leria como filtro (?e=1)
+        self.assertEqual(response.status_code, 200)
+        profile = RequestProfile.objects.get()
+        self.assertEqual(profile.trigger, 'manual')
+        self.assertEqual(profile.path, f'{self.url}?status=NOVO')
+        self.assertEqual(response['X-Profile'], reverse('admin:core_requestprofile_change', args=[profile.pk]))
+
+    def test_token_assinado_sem_login(self):
+        token = profiling.make_token(self.staff)
+        response = self.client.get('/', {'_profile': token})
+        self.assertIn('X-Profile', response)
+        # O token não fica gravado: quem abre o perfil não pode reaproveitá-lo
+        self.assertEqual(RequestProfile.objects.get().path, '/')
+
+        self.client.get('/', HTTP_X_PROFILE=token)
+        self.assertEqual(RequestProfile.objects.count(), 2)
+
+    def test_pedidos_ignorados(self):
+        user = User.objects.create_user('comum', password='x')
+        token = profiling.make_token(self.staff)
+        self.client.get('/', {'_profile': token[:-1] + ('A' if token[-1] != 'A' else 'B')})
+        self.client.get('/', {'_profile': profiling.make_token(user)})
+        with mock.patch.object(profiling, 'PROFILING_TOKEN_MAX_AGE', -1):
+            self.client.get('/', {'_profile': token})
+        self.client.force_login(user)
+        response = self.client.get('/', {'_profile': '1'})
+        self.assertNotIn('X-Profile', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_prune_mantem_os_mais_recentes(self):
+        now = timezone.now()
+        for minutes in range(5):
+            RequestProfile.objects.create(
+                path=f'/{minutes}/', method='GET', status=200, trigger='amostra', duration_ms=1,
+                query_count=0, db_ms=0, data=b'', created_at=now - timedelta(minutes=minutes),
+            )
+        with mock.patch.object(profiling, 'PROFILING_MAX_PROFILES', 3):
+            profiling.prune()
+        self.assertEqual(
+            sorted(RequestProfile.objects.values_list('path', flat=True)), ['/0/', '/1/', '/2/'],
+        )
+
+
+class StreamingExportTests(TestCase):
+    """Planilhas geradas aos poucos (core.streaming)."""
+
+    HEADER = ["Nome", "Valor", "Quando"]
+
+    def rows(self, count):
+        when = timezone.make_aware(timezone.datetime(2026, 3, 1, 14, 30))
+        for number in range(count):
+            yield [f"Linha {number} <&> \x01", number, when]
+
+    def test_xlsx_e_um_zip_com_xml_valido(self):
+        count = streaming.ROWS_PER_CHUNK * 2 + 1
+        content = b''.join(streaming.xlsx_stream(self.HEADER, self.rows(count), sheet_name='Candidatos "RH"'))
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            for name in archive.namelist():
+                ElementTree.fromstring(archive.read(name))
+            sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        namespace = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+        rows = sheet.findall(f'{namespace}sheetData/{namespace}row')
+        self.assertEqual(len(rows), count + 1)
+        texts = [''.join(cell.itertext()) for cell in rows[1]]
+        self.assertEqual(texts, ["Linha 0 <&> ", '0', '01/03/2026 14:30'])
+
+    def test_csv_escapa_formulas(self):
+        rows = [['=HYPERLINK("x")', '+55 92', '-1', '@soma', '\tx', 'Ana', -1, None, True]]
+        content = b''.join(streaming.csv_stream(['A'] * 9, rows)).decode('utf-8')
+        self.assertTrue(content.startswith('\ufeff'))
+        lines = list(csv.reader(io.StringIO(content.lstrip('\ufeff')), delimiter=';'))
+        self.assertEqual(
+            lines[1], ['\'=HYPERLINK("x")', "'+55 92", "'-1", "'@soma", "'\tx", 'Ana', '-1', '', 'Sim'],
+        )
@@ -0,0 +1,250 @@
+"""
+Upload handler que valida os arquivos enquanto eles chegam.
+
+Com o decorator 'validate_uploads' na view, cada campo de arquivo listado
+tem uma UploadRule (tamanho máximo e tipos aceitos). O handler:
+
+- confere o tipo pelos primeiros bytes (core.files.sniff_content_type), não
+  pela extensão nem pelo Content-Type do navegador;
+- para de gravar assim que o arquivo passa do tamanho máximo ou tem tipo
+  não aceito (o resto do arquivo é lido e descartado; requisições maiores
+  que a soma dos limites levam 413 antes de qualquer leitura);
+- calcula o SHA-256 enquanto grava (StoredUploadedFile.sha256);
+- grava direto na pasta final do FileField ('.upload-*.part'): ao salvar o
+  model, o FileSystemStorage só renomeia o arquivo, sem a cópia do /tmp
+  feita pelo TemporaryFileUploadHandler padrão.
+
+Os arquivos recusados não aparecem em request.FILES; o motivo fica em
+upload_errors(request), para a view mostrar ao usuário. Um arquivo vazio ou
+menor que SNIFF_LENGTH só é recusado em file_complete, quando já não dá para
+pular o campo (SkipFile): o handler devolve um RejectedUpload, para que os
+handlers seguintes não tentem fechar um arquivo que nunca abriram, e o
+decorator o retira de request.FILES antes de chamar a view.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopFutureHandlers
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from .files import sniff_content_type
+
+MB = 1024 * 1024
+# Bytes necessários para reconhecer o tipo do arquivo
+SNIFF_LENGTH = 16
+# Folga para os campos de texto do formulário no limite da requisição inteira
+FORM_FIELDS_MARGIN = MB
+
+
+@dataclass(frozen=True)
+class UploadRule:
+    field: str            # 'app_label.Model.campo': define a pasta final do arquivo
+    max_size: int
+    content_types: frozenset
+    type_error: str = "Formato de arquivo não aceito."
+
+    def model_field(self):
+        app_label, model_name, field_name = self.field.split('.')
+        return apps.get_model(app_label, model_name)._meta.get_field(field_name)
+
+
+def _human_size(size):
+    return f"{size / MB:.0f} MB"
+
+
+class StoredUploadedFile(UploadedFile):
+    """
+    Arquivo já gravado na pasta final. temporary_file_path() faz o
+    FileSystemStorage renomear em vez de copiar; se o model não for salvo,
+    o arquivo parcial é apagado quando a requisição termina (close()).
+    """
+
+    def __init__(self, file, name, content_type, size, sha256):
+        super().__init__(file, name, content_type, size, None)
+        self.sha256 = sha256
+
+    def temporary_file_path(self):
+        return self.file.name
+
+    def close(self):
+        path = self.file.name
+        try:
+            return self.file.close()
+        finally:
+            # Ainda no nome temporário: o model não foi salvo
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class RejectedUpload:
+    """Lugar, em request.FILES, de um arquivo recusado em file_complete (retirado pelo decorator)."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def close(self):
+        pass
+
+
+class StreamingUploadHandler(FileUploadHandler):
+
+    def __init__(self, request, rules):
+        super().__init__(request)
+        self.rules = rules
+        self.errors = request.upload_errors = {}
+        self.rule = None
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.rule = self.rules.get(field_name)
+        if self.rule is None:
+            return  # campo sem regra: segue para os handlers padrão
+        self.head = b''
+        self.size = 0
+        self.sniffed_type = None
+        self.digest = hashlib.sha256()
+        self.file = tempfile.NamedTemporaryFile(
+            dir=self._target_dir(), prefix='.upload-', suffix='.part', delete=False,
+        )
+        raise StopFutureHandlers
+
+    def _target_dir(self):
+        field = self.rule.model_field()
+        name = field.generate_filename(None, self.file_name)
+        try:
+            directory = field.storage.path(os.path.dirname(name))
+        except NotImplementedError:
+            # Storage remoto: grava no diretório temporário e o storage copia no save
+            return settings.FILE_UPLOAD_TEMP_DIR or None
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def _reject(self, message):
+        self.errors[self.field_name] = message
+        self._discard()
+        raise SkipFile
+
+    def _discard(self):
+        self.file.close()
+        if os.path.exists(self.file.name):
+            os.remove(self.file.name)
+
+    def _sniff(self):
+        self.sniffed_type = sniff_content_type(self.head)
+        if self.sniffed_type not in self.rule.content_types:
+            self._reject(self.rule.type_error)
+        self._write(self.head)
+
+    def _write(self, data):
+        self.digest.update(data)
+        self.file.write(data)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.rule is None:
+            return raw_data
+        self.size += len(raw_data)
+        if self.size > self.rule.max_size:
+            self._reject(f"Arquivo maior que o limite de {_human_size(self.rule.max_size)}.")
+        if self.sniffed_type is None:
+            # Guarda o começo até ter bytes suficientes para reconhecer o tipo
+            self.head += raw_data
+            if len(self.head) >= SNIFF_LENGTH:
+                self._sniff()
+        else:
+            self._write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self.rule is None:
+            return None
+        # O campo é deste handler (StopFutureHandlers): nunca devolver None
+        if self.sniffed_type is None:
+            if not self.head:
+                self.errors[self.field_name] = "O arquivo enviado está vazio."
+                self._discard()
+                return RejectedUpload(self.file_name)
+            try:
+                self._sniff()
+            except SkipFile:
+                return RejectedUpload(self.file_name)
+        self.file.flush()
+        self.file.seek(0)
+        return StoredUploadedFile(
+            self.file, self.file_name, self.sniffed_type, self.size, self.digest.hexdigest(),
+        )
+
+    def upload_interrupted(self):
+        # Conexão caiu no meio do envio
+        if self.rule is not None and hasattr(self, 'file'):
+            self._discard()
+
+
+def upload_errors(request):
+    """{campo: mensagem} dos arquivos recusados pelo StreamingUploadHandler."""
+    return getattr(request, 'upload_errors', {})
+
+
+def add_upload_errors(form, request):
+    """Mostra no formulário os arquivos recusados durante o envio."""
+    errors = upload_errors(request)
+    if not errors:
+        return
+    # Valida antes: o full_clean() do is_valid() apagaria os erros adicionados aqui
+    form.full_clean()
+    for field_name, message in errors.items():
+        if field_name in form.fields:
+            # No lugar do "campo obrigatório": o arquivo veio, mas foi recusado
+            form.errors.pop(field_name, None)
+            form.add_error(field_name, message)
+        else:
+            form.add_error(None, message)
+
+
+def _drop_rejected(files):
+    for field_name in list(files):
+        accepted = [f for f in files.getlist(field_name) if not isinstance(f, RejectedUpload)]
+        if accepted:
+            files.setlist(field_name, accepted)
+        else:
+            del files[field_name]
+
+
+def validate_uploads(**rules):
+    """
+    Decorator de view: os campos de arquivo citados ('campo=UploadRule')
+    passam pelo StreamingUploadHandler.
+
+    O handler tem que entrar antes de alguém ler request.POST, o que o
+    CsrfViewMiddleware faz; por isso a conferência do CSRF vem para dentro
+    da view (padrão da documentação do Django).
+    """
+    max_request_size = sum(rule.max_size for rule in rules.values()) + FORM_FIELDS_MARGIN
+
+    def decorator(view):
+        protected_view = csrf_protect(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method == 'POST':
+                try:
+                    content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+                except ValueError:
+                    content_length = 0
+                if content_length > max_request_size:
+                    return HttpResponse(
+                        f"Envio maior que o limite de {_human_size(max_request_size)}.", status=413,
+                    )
+                request.upload_handlers.insert(0, StreamingUploadHandler(request, rules))
+                _drop_rejected(request.FILES)
+            return protected_view(request, *args, **kwargs)
+
+        return csrf_exempt(wrapper)
+
+    return decorator
@@ -1,9 +1,21 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import method_decorator
 from services.models import Service
+from . import media, metrics
+from .cache import cache_public_page
+from .compression import gzip_large_responses
+from .sync import DeltaSyncAPI
+from .pagination import keyset_paginate
 # 1. ADICIONEI 'CarouselImage' NA IMPORTAÇÃO ABAIXO
 from .models import Certification, HomeVideo, OperatingBase, Noticia, CanalContato, CarouselImage
 
+NOTICIAS_POR_PAGINA = 12
+
+@cache_public_page('core.CarouselImage', 'core.Noticia', 'core.HomeVideo', 'services.Service', 'core.Certification')
 def home(request):
     # --- LÓGICA DE EXIBIÇÃO ---
     
@@ -11,13 +23,13 @@ def home(request):
     carousel_images = CarouselImage.objects.filter(is_active=True)
 
     # 2. Notícias (Meio - Pegar as 4 últimas)
-    noticias = Noticia.objects.all()[:4] 
+    noticias = Noticia.objects.defer('conteudo')[:4]
 
     # 3. Vídeo Hero (Fim)
     video = HomeVideo.objects.filter(is_active=True).first()
     
     # 4. Outros elementos (Serviços e Certificações)
-    services = Service.objects.filter(is_active=True)[:6]
+    services = Service.objects.filter(is_active=True).defer('full_description')[:6]
     certifications = Certification.objects.all()
     
     return render(request, 'home.html', {
@@ -36,6 +48,7 @@ def service_detail(request, slug):
         'service': service
     })
 
+@cache_public_page('core.OperatingBase', 'core.Certification')
 def about(request):
     bases = OperatingBase.objects.all()
     certifications = Certification.objects.all()
@@ -45,15 +58,27 @@ def about(request):
         'certifications': certifications
     })
 
+@cache_public_page('core.Noticia')
 def noticia_detail(request, slug):
     noticia = get_object_or_404(Noticia, slug=slug)
     return render(request, 'noticia_detail.html', {'noticia': noticia})
 
+@cache_public_page('core.Noticia')
 def todas_noticias(request):
-    # Busca todas as notícias ordenadas da mais recente para a antiga
-    noticias = Noticia.objects.all()
-    return render(request, 'todas_noticias.html', {'noticias': noticias})
+    # Notícias da mais recente para a mais antiga, paginadas por cursor.
+    # O texto completo ('conteudo') não é usado na listagem.
+    page = keyset_paginate(
+        Noticia.objects.defer('conteudo'),
+        request.GET.get('cursor'),
+        field='data_criacao',
+        page_size=NOTICIAS_POR_PAGINA,
+    )
+    return render(request, 'todas_noticias.html', {
+        'noticias': page.object_list,
+        'page': page,
+    })
 
+@cache_public_page('core.CanalContato')
 def contato(request):
     # Lógica de Exibição (Apenas busca os canais para mostrar)
     canais = CanalContato.objects.all()
@@ -62,5 +87,33 @@ def contato(request):
         'canais': canais
     })
 
+@cache_public_page()
 def privacidade(request):
-    return render(request, 'privacidade.html')
\ No newline at end of file
+    return render(request, 'privacidade.html')
+
+@method_decorator(gzip_large_responses, name='dispatch')
+class NoticiaSyncAPI(DeltaSyncAPI):
+    """Sync incremental das notícias (ver core.sync)."""
+    model = Noticia
+    fields = ('id', 'titulo', 'slug', 'resumo', 'conteudo', 'imagem', 'data_criacao', 'updated_at')
+    file_fields = ('imagem',)
+
+def _metrics_scraper(request):
+    """Coletor do Prometheus: token de METRICS_TOKEN ou IP de METRICS_ALLOWED_IPS."""
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    scheme, _, value = request.headers.get('Authorization', '').partition(' ')
+    if token and scheme.lower() == 'bearer' and constant_time_compare(value.strip(), token):
+        return True
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', [])
+
+
+def metrics_view(request):
+    # Só staff ou o coletor; para os outros a rota não existe
+    if not (request.user.is_staff or _metrics_scraper(request)):
+        raise Http404
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+def media_view(request, path):
+    # Arquivos enviados (MEDIA_ROOT), com controle de acesso aos pessoais: ver core.media
+    return media.serve(request, path)
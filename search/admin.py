@@ -0,0 +1,20 @@
+from django.db.models.expressions import RawSQL
+
+from .index import matching_ids_sql
+
+
+class IndexedSearchAdminMixin:
+    """
+    Mixin para ModelAdmin: a caixa de busca usa o índice de busca (search.index)
+    em vez de 'icontains' em cada campo de search_fields, que varre a tabela.
+    Inclui os registros inativos. Defina 'search_kind' (chave de SOURCES).
+    """
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        match = matching_ids_sql(search_term, self.search_kind, active_only=False)
+        if match is None:
+            # Sem palavras úteis (ex: só números curtos ou 'de'): busca padrão
+            return super().get_search_results(request, queryset, search_term)
+        # Subconsulta no índice, sem limite: a contagem e a paginação da listagem valem para todos
+        return queryset.filter(pk__in=RawSQL(*match)), False
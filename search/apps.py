@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    name = 'search'
+    verbose_name = 'Busca'
+
+    def ready(self):
+        # Conecta os receivers que mantêm o índice atualizado
+        from . import signals  # noqa: F401
@@ -0,0 +1,119 @@
+"""
+Acesso à tabela 'search_index' (criada na migração 0001) em cada banco.
+
+SQLite: tabela virtual FTS5, ordenada por bm25. Postgres: tabela comum com
+uma coluna tsvector (dicionário 'portuguese', com stemming) e índice GIN,
+ordenada por ts_rank_cd.
+
+Os textos chegam já sem acentos e em minúsculas (search.index.fold), o que
+deixa a busca insensível a acentos nos dois bancos sem depender da
+extensão 'unaccent' do Postgres.
+"""
+from django.db import NotSupportedError
+
+# Peso do título em relação ao corpo na ordenação
+TITLE_WEIGHT = 10.0
+
+
+class SQLiteBackend:
+    """FTS5. O rowid é derivado de (tipo, id) para atualizar sem varrer a tabela."""
+
+    @staticmethod
+    def rowid(source, object_id):
+        return object_id * 8 + source.code
+
+    def upsert(self, cursor, source, documents):
+        rowids = [self.rowid(source, doc.object_id) for doc in documents]
+        cursor.execute(
+            f"DELETE FROM search_index WHERE rowid IN ({', '.join(['%s'] * len(rowids))})", rowids,
+        )
+        cursor.executemany(
+            "INSERT INTO search_index (rowid, kind, object_id, active, title, body) VALUES (%s, %s, %s, %s, %s, %s)",
+            [
+                (rowid, source.kind, doc.object_id, int(doc.active), doc.title, doc.body)
+                for rowid, doc in zip(rowids, documents)
+            ],
+        )
+
+    def delete(self, cursor, source, object_ids):
+        rowids = [self.rowid(source, object_id) for object_id in object_ids]
+        cursor.execute(
+            f"DELETE FROM search_index WHERE rowid IN ({', '.join(['%s'] * len(rowids))})", rowids,
+        )
+
+    def clear(self, cursor, source):
+        cursor.execute("DELETE FROM search_index WHERE kind = %s", [source.kind])
+
+    def match_sql(self, columns, terms, kinds, active_only):
+        # Os termos só têm letras e dígitos (search.index.query_terms): podem
+        # ir entre aspas na expressão do MATCH. '*' busca por prefixo.
+        match = ' '.join(f'"{term}"*' for term in terms)
+        sql = f"SELECT {columns} FROM search_index WHERE search_index MATCH %s"
+        params = [match]
+        if kinds:
+            sql += f" AND kind IN ({', '.join(['%s'] * len(kinds))})"
+            params += kinds
+        if active_only:
+            sql += " AND active = 1"
+        return sql, params
+
+    def search(self, cursor, terms, kinds, active_only, limit, offset):
+        sql, params = self.match_sql('kind, object_id', terms, kinds, active_only)
+        # Pesos por coluna: kind, object_id e active não são indexadas
+        sql += f" ORDER BY bm25(search_index, 0, 0, 0, {TITLE_WEIGHT}, 1.0) LIMIT %s OFFSET %s"
+        cursor.execute(sql, params + [limit, offset])
+        return cursor.fetchall()
+
+
+class PostgresBackend:
+    """tsvector com pesos (título 'A', corpo 'B') e índice GIN."""
+
+    def upsert(self, cursor, source, documents):
+        cursor.executemany(
+            "INSERT INTO search_index (kind, object_id, active, title, body) VALUES (%s, %s, %s, %s, %s) "
+            "ON CONFLICT (kind, object_id) DO UPDATE "
+            "SET active = EXCLUDED.active, title = EXCLUDED.title, body = EXCLUDED.body",
+            [(source.kind, doc.object_id, doc.active, doc.title, doc.body) for doc in documents],
+        )
+
+    def delete(self, cursor, source, object_ids):
+        cursor.execute(
+            "DELETE FROM search_index WHERE kind = %s AND object_id = ANY(%s)", [source.kind, list(object_ids)],
+        )
+
+    def clear(self, cursor, source):
+        cursor.execute("DELETE FROM search_index WHERE kind = %s", [source.kind])
+
+    def match_sql(self, columns, terms, kinds, active_only):
+        # to_tsquery com prefixo (':*') em cada termo, todos obrigatórios
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        sql = (
+            f"SELECT {columns} FROM search_index, to_tsquery('portuguese', %s) query "
+            "WHERE document @@ query"
+        )
+        params = [tsquery]
+        if kinds:
+            sql += " AND kind = ANY(%s)"
+            params.append(list(kinds))
+        if active_only:
+            sql += " AND active"
+        return sql, params
+
+    def search(self, cursor, terms, kinds, active_only, limit, offset):
+        sql, params = self.match_sql('kind, object_id', terms, kinds, active_only)
+        sql += " ORDER BY ts_rank_cd(document, query) DESC LIMIT %s OFFSET %s"
+        cursor.execute(sql, params + [limit, offset])
+        return cursor.fetchall()
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend(),
+    'postgresql': PostgresBackend(),
+}
+
+
+def get_backend(connection):
+    try:
+        return BACKENDS[connection.vendor]
+    except KeyError:
+        raise NotSupportedError(f"Busca não disponível para o banco '{connection.vendor}' (só SQLite e PostgreSQL).")
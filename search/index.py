@@ -0,0 +1,293 @@
+"""
+Índice de busca do site (notícias, serviços e vagas).
+
+SOURCES diz o que entra no índice de cada model. O índice é atualizado
+pelos signals (search.signals) e pode ser refeito do zero com
+'manage.py rebuild_search_index'. A consulta devolve os objetos em ordem de
+relevância, com título e trecho destacados (<mark>).
+"""
+import re
+import unicodedata
+from dataclasses import dataclass, field
+
+from django.apps import apps as global_apps
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from .backends import get_backend
+
+# Registros enviados ao banco por vez na reconstrução do índice
+REBUILD_BATCH_SIZE = 500
+# Palavras consideradas na consulta (o resto é ignorado)
+MAX_QUERY_TERMS = 8
+# Tamanho aproximado do trecho mostrado em cada resultado (caracteres)
+SNIPPET_LENGTH = 220
+
+# Palavras muito comuns: não ajudam a ordenar e, com busca por prefixo,
+# casariam com quase tudo
+STOPWORDS = {
+    'a', 'o', 'as', 'os', 'e', 'de', 'da', 'do', 'das', 'dos', 'em', 'na', 'no', 'nas', 'nos',
+    'um', 'uma', 'para', 'por', 'com', 'que', 'se', 'ao', 'aos', 'ou',
+}
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    kind: str            # identificador público (?tipo=)
+    code: int            # compõe o rowid no SQLite (1 a 7)
+    label: str
+    model: str           # 'app_label.Model'
+    title: str           # campo do título
+    body: tuple          # campos do corpo ('category.name' segue a relação)
+    url_name: str
+    url_kwarg: str
+    url_field: str
+    active_field: str = None
+    select_related: tuple = field(default=())
+
+    def get_model(self, apps=global_apps):
+        return apps.get_model(self.model)
+
+    def queryset(self, apps=global_apps):
+        return self.get_model(apps)._default_manager.select_related(*self.select_related)
+
+    def document(self, obj):
+        body = ' '.join(str(_resolve(obj, path) or '') for path in self.body)
+        return Document(
+            object_id=obj.pk,
+            active=bool(getattr(obj, self.active_field)) if self.active_field else True,
+            title=fold(getattr(obj, self.title)),
+            body=fold(strip_tags(body)),
+        )
+
+    def url(self, obj):
+        value = getattr(obj, self.url_field)
+        return reverse(self.url_name, kwargs={self.url_kwarg: value}) if value else None
+
+
+@dataclass
+class Document:
+    object_id: int
+    active: bool
+    title: str
+    body: str
+
+
+@dataclass
+class SearchResult:
+    kind: str
+    label: str
+    object: object
+    url: str
+    title: str    # HTML com <mark>
+    snippet: str  # HTML com <mark>
+
+
+SOURCES = {
+    'noticia': SearchSource(
+        'noticia', 1, "Notícia", 'core.Noticia', 'titulo', ('resumo', 'conteudo'),
+        url_name='noticia_detail', url_kwarg='slug', url_field='slug',
+    ),
+    'servico': SearchSource(
+        'servico', 2, "Serviço", 'services.Service', 'title',
+        ('short_description', 'full_description', 'category.name'),
+        url_name='service_detail', url_kwarg='slug', url_field='slug',
+        active_field='is_active', select_related=('category',),
+    ),
+    'vaga': SearchSource(
+        'vaga', 3, "Vaga", 'careers.JobOpportunity', 'title',
+        ('description', 'requirements', 'benefits', 'department', 'location'),
+        url_name='job_detail', url_kwarg='job_id', url_field='pk',
+        active_field='is_active',
+    ),
+}
+SOURCES_BY_MODEL = {source.model.lower(): source for source in SOURCES.values()}
+
+
+def _resolve(obj, path):
+    for attr in path.split('.'):
+        obj = getattr(obj, attr, None)
+        if obj is None:
+            return None
+    return obj
+
+
+# --- normalização ---
+
+class _FoldTable(dict):
+    """Tabela para str.translate: cada caractere vira a letra minúscula sem acento."""
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        folded = ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c)).lower()
+        # Mantém um caractere por caractere: as posições do texto original
+        # continuam valendo no texto normalizado (usado no destaque)
+        self[codepoint] = value = folded if len(folded) == 1 else char
+        return value
+
+
+_FOLD_TABLE = _FoldTable()
+_WORD_RE = re.compile(r'\w+')
+_SPACES_RE = re.compile(r'\s+')
+
+
+def fold(text):
+    """Minúsculas e sem acentos, com o mesmo tamanho do texto original."""
+    return text.translate(_FOLD_TABLE)
+
+
+def query_terms(query):
+    """Palavras úteis da consulta, normalizadas e sem repetição."""
+    terms = []
+    for term in _WORD_RE.findall(fold(query)):
+        term = term.replace('_', '')
+        if term and term not in STOPWORDS and term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def highlight(text, terms, length=None):
+    """
+    Texto (sem HTML) com as palavras que começam pelos termos dentro de <mark>.
+    Com 'length', devolve só um trecho em volta da primeira ocorrência.
+    """
+    text = _SPACES_RE.sub(' ', strip_tags(text)).strip()
+    folded = fold(text)
+    pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, terms)) + r')\w*') if terms else None
+
+    start, end = 0, len(text)
+    if length and len(text) > length:
+        first = pattern.search(folded) if pattern else None
+        start = max(0, first.start() - length // 4) if first else 0
+        if start:
+            # Começa numa palavra inteira
+            space = text.find(' ', start)
+            start = space + 1 if 0 <= space < start + 20 else start
+        end = min(len(text), start + length)
+        if end < len(text):
+            space = text.rfind(' ', start, end)
+            end = space if space > start else end
+
+    pieces = ['…' if start else '']
+    position = start
+    if pattern:
+        for match in pattern.finditer(folded, start, end):
+            pieces.append(escape(text[position:match.start()]))
+            pieces.append(f'<mark>{escape(text[match.start():match.end()])}</mark>')
+            position = match.end()
+    pieces.append(escape(text[position:end]))
+    pieces.append('…' if end < len(text) else '')
+    return mark_safe(''.join(pieces))
+
+
+# --- atualização ---
+
+def index_objects(source, objects):
+    """Insere ou atualiza os objetos no índice."""
+    documents = [source.document(obj) for obj in objects]
+    if not documents:
+        return
+    with connection.cursor() as cursor:
+        get_backend(connection).upsert(cursor, source, documents)
+
+
+def remove_objects(source, object_ids):
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+    with connection.cursor() as cursor:
+        get_backend(connection).delete(cursor, source, object_ids)
+
+
+def rebuild(kinds=None, apps=global_apps):
+    """
+    Refaz o índice dos tipos pedidos (todos por padrão). Retorna {tipo: registros}.
+    A migration 0002 chama com o 'apps' do RunPython (models históricos).
+    """
+    totals = {}
+    backend = get_backend(connection)
+    for kind in kinds or SOURCES:
+        source = SOURCES[kind]
+        with transaction.atomic(), connection.cursor() as cursor:
+            backend.clear(cursor, source)
+            batch, total = [], 0
+            for obj in source.queryset(apps).iterator(chunk_size=REBUILD_BATCH_SIZE):
+                batch.append(source.document(obj))
+                if len(batch) >= REBUILD_BATCH_SIZE:
+                    backend.upsert(cursor, source, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                backend.upsert(cursor, source, batch)
+                total += len(batch)
+        totals[kind] = total
+    return totals
+
+
+# --- consulta ---
+
+def search_ids(query, kinds=None, active_only=True, limit=20, offset=0):
+    """
+    [(tipo, id)] em ordem de relevância. None se a consulta não tem nenhuma
+    palavra útil (ex: só 'de').
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    with connection.cursor() as cursor:
+        rows = get_backend(connection).search(cursor, terms, list(kinds or []), active_only, limit, offset)
+    return [(kind, int(object_id)) for kind, object_id in rows]
+
+
+def matching_ids_sql(query, kind, active_only=True):
+    """
+    (sql, params) de um SELECT com os ids de 'kind' que casam com a consulta,
+    sem limite nem ordem, para usar como subconsulta (pk__in=RawSQL(...)).
+    None se a consulta não tem nenhuma palavra útil.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    return get_backend(connection).match_sql('object_id', terms, [kind], active_only)
+
+
+def search(query, kinds=None, limit=20, offset=0):
+    """
+    Resultados públicos (só ativos), em ordem de relevância, com destaque.
+    Retorna (resultados, há_mais).
+    """
+    hits = search_ids(query, kinds, active_only=True, limit=limit + 1, offset=offset)
+    if not hits:
+        return [], False
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+
+    # Uma consulta por tipo para carregar os objetos
+    ids_by_kind = {}
+    for kind, object_id in hits:
+        ids_by_kind.setdefault(kind, []).append(object_id)
+    objects = {
+        kind: SOURCES[kind].queryset().in_bulk(ids)
+        for kind, ids in ids_by_kind.items()
+    }
+
+    terms = query_terms(query)
+    results = []
+    for kind, object_id in hits:
+        source = SOURCES[kind]
+        obj = objects[kind].get(object_id)
+        url = source.url(obj) if obj is not None else None
+        if url is None:
+            continue  # apagado depois da busca ou sem endereço público
+        body = ' '.join(str(_resolve(obj, path) or '') for path in source.body)
+        results.append(SearchResult(
+            kind=kind,
+            label=source.label,
+            object=obj,
+            url=url,
+            title=highlight(getattr(obj, source.title), terms),
+            snippet=highlight(body, terms, length=SNIPPET_LENGTH),
+        ))
+    return results, has_more
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from search.index import SOURCES, rebuild
+
+
+class Command(BaseCommand):
+    help = "Refaz do zero o índice de busca (notícias, serviços e vagas)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tipo', choices=list(SOURCES), action='append', help="Só este tipo (pode repetir)")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        totals = rebuild(options['tipo'])
+        for kind, total in totals.items():
+            self.stdout.write(f"{SOURCES[kind].label}: {total} registros")
+        self.stdout.write(self.style.SUCCESS(f"Índice refeito em {time.perf_counter() - start:.1f} s"))
@@ -0,0 +1,50 @@
+# Generated by Django 6.0 on 2026-10-18 10:40
+
+from django.db import migrations
+
+# A tabela do índice não é um model: o SQL muda de banco para banco (ver search.backends)
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE search_index USING fts5(
+    kind UNINDEXED, object_id UNINDEXED, active UNINDEXED, title, body,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+POSTGRES_CREATE = """
+CREATE TABLE search_index (
+    kind varchar(20) NOT NULL,
+    object_id bigint NOT NULL,
+    active boolean NOT NULL,
+    title text NOT NULL,
+    body text NOT NULL,
+    document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', title), 'A') || setweight(to_tsvector('portuguese', body), 'B')
+    ) STORED,
+    PRIMARY KEY (kind, object_id)
+);
+CREATE INDEX search_index_document_idx ON search_index USING GIN (document);
+"""
+
+
+def create_index_table(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE)
+    elif vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_CREATE)
+
+
+def drop_index_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP TABLE IF EXISTS search_index")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.RunPython(create_index_table, drop_index_table),
+    ]
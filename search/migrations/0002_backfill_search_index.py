@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 16:20
+
+from django.db import migrations
+
+
+def backfill_search_index(apps, schema_editor):
+    # A 0001 cria a tabela vazia e os signals só indexam o que for salvo
+    # depois: preenche com as notícias, serviços e vagas existentes
+    from search.backends import BACKENDS
+    from search.index import rebuild
+
+    if schema_editor.connection.vendor in BACKENDS:
+        rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0010_backfill_candidate_search'),
+        ('core', '0015_perfil_requisicao'),
+        ('search', '0001_initial'),
+        ('services', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from services.models import ServiceCategory
+
+from .index import SOURCES, SOURCES_BY_MODEL, index_objects, remove_objects
+
+
+@receiver(post_save)
+def index_saved_object(sender, instance, raw=False, **kwargs):
+    """Notícias, serviços e vagas entram (ou são atualizados) no índice ao salvar."""
+    source = SOURCES_BY_MODEL.get(sender._meta.label_lower)
+    if source is None or raw:
+        return
+    index_objects(source, [instance])
+
+
+@receiver(post_delete)
+def unindex_deleted_object(sender, instance, **kwargs):
+    source = SOURCES_BY_MODEL.get(sender._meta.label_lower)
+    if source is not None:
+        remove_objects(source, [instance.pk])
+
+
+@receiver(post_save, sender=ServiceCategory)
+def reindex_category_services(sender, instance, created, raw=False, **kwargs):
+    """O nome da categoria faz parte do texto indexado dos serviços."""
+    if created or raw:
+        return
+    source = SOURCES['servico']
+    index_objects(source, source.queryset().filter(category=instance))
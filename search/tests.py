@@ -0,0 +1,105 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Noticia
+from services.models import Service, ServiceCategory
+from . import index
+
+
+class AdminSearchTests(TestCase):
+    """Busca do admin pelo índice (search.admin): a listagem conta todos os resultados."""
+
+    def setUp(self):
+        Noticia.objects.bulk_create([
+            Noticia(titulo=f"Manutenção {n}", slug=f'manutencao-{n}', resumo="Subestação", conteudo="Texto", imagem='n.jpg')
+            for n in range(1200)
+        ] + [Noticia(titulo="Outro assunto", slug='outro', resumo="Nada", conteudo="Texto", imagem='n.jpg')])
+        index.rebuild(['noticia'])
+        self.client.force_login(User.objects.create_superuser('admin'))
+
+    def test_todos_os_resultados(self):
+        response = self.client.get('/admin/core/noticia/', {'q': 'manutencao'})
+        self.assertEqual(response.context['cl'].result_count, 1200)
+        self.assertEqual(response.context['cl'].full_result_count, 1201)
+
+    def test_consulta_sem_palavras_uteis(self):
+        response = self.client.get('/admin/core/noticia/', {'q': 'de'})
+        self.assertEqual(response.status_code, 200)
+
+
+class SearchTests(TestCase):
+    """Busca do site (/busca/) e da API (/api/v1/busca/) pelo índice (search.index)."""
+
+    def setUp(self):
+        self.category = ServiceCategory.objects.create(name="Manutenção Elétrica")
+        self.service = self.create_service("Subestação de energia", 'subestacao')
+        self.create_service("Subestação desativada", 'desativada', is_active=False)
+        self.noticia = Noticia.objects.create(
+            titulo="Inauguração da base", slug='inauguracao', resumo="Nova base em Manaus", conteudo="Texto",
+            imagem='n.jpg',
+        )
+
+    def create_service(self, title, slug, **kwargs):
+        return Service.objects.create(
+            category=self.category, title=title, slug=slug, short_description="Resumo",
+            full_description="Detalhes", cover_image='services/capa.jpg', **kwargs,
+        )
+
+    def api(self, query, **params):
+        response = self.client.get(reverse('api_busca'), {'q': query, **params}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def found(self, query):
+        return [(result['tipo'], result['id']) for result in self.api(query)]
+
+    def test_pagina_de_busca(self):
+        response = self.client.get(reverse('busca'), {'q': 'subestacao'})
+        self.assertEqual([result.object for result in response.context['results']], [self.service])
+        self.assertContains(response, '<mark>Subestação</mark>', html=False)
+
+    def test_sem_acentos_e_maiusculas(self):
+        for query in ('subestacao', 'SUBESTAÇÃO', 'inauguração', 'INAUGURACAO'):
+            with self.subTest(query=query):
+                self.assertEqual(len(self.found(query)), 1)
+
+    def test_destaque(self):
+        result, = self.api('subest energia')
+        self.assertEqual(result['titulo'], '<mark>Subestação</mark> de <mark>energia</mark>')
+        self.assertEqual(result['url'], 'http://testserver' + reverse('service_detail', kwargs={'slug': 'subestacao'}))
+
+    def test_inativos_nao_aparecem(self):
+        self.assertEqual(self.found('desativada'), [])
+        self.assertEqual(self.found('subestacao'), [('servico', self.service.pk)])
+
+    def test_tipo(self):
+        self.assertEqual(self.found('base'), [('noticia', self.noticia.pk)])
+        self.assertEqual(self.api('base', tipo='servico'), [])
+
+    def test_atualiza_ao_salvar_e_apagar(self):
+        self.service.title = "Linha de transmissão"
+        self.service.save()
+        self.assertEqual(self.found('transmissao'), [('servico', self.service.pk)])
+        self.assertEqual(self.found('subestacao'), [])
+        self.service.delete()
+        self.assertEqual(self.found('transmissao'), [])
+
+    def test_atualiza_ao_renomear_a_categoria(self):
+        self.assertEqual(self.found('eletrica'), [('servico', self.service.pk)])
+        self.category.name = "Obras Civis"
+        self.category.save()
+        self.assertEqual(self.found('obras'), [('servico', self.service.pk)])
+        self.assertEqual(self.found('eletrica'), [])
+
+    def test_rebuild_com_models_historicos(self):
+        # O que a migration 0002 faz com o índice vazio da 0001
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM search_index")
+        self.assertEqual(self.found('subestacao'), [])
+        executor = MigrationExecutor(connection)
+        apps = executor.loader.project_state(('search', '0002_backfill_search_index')).apps
+        self.assertEqual(index.rebuild(apps=apps), {'noticia': 1, 'servico': 2, 'vaga': 0})
+        self.assertEqual(self.found('subestacao'), [('servico', self.service.pk)])
@@ -0,0 +1,78 @@
+from django.shortcuts import render
+from django.utils.decorators import method_decorator
+from rest_framework import serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.compression import gzip_large_responses
+
+from .index import SOURCES, search
+
+RESULTADOS_POR_PAGINA = 20
+# Máximo de resultados por chamada da API (?limit=)
+API_MAX_LIMIT = 50
+# Consultas maiores que isso são cortadas
+MAX_QUERY_LENGTH = 200
+
+
+def busca(request):
+    query = request.GET.get('q', '').strip()[:MAX_QUERY_LENGTH]
+    kind = request.GET.get('tipo')
+    if kind not in SOURCES:
+        kind = None
+    try:
+        page = max(int(request.GET.get('pagina', 1)), 1)
+    except ValueError:
+        page = 1
+
+    results, has_more = [], False
+    if query:
+        results, has_more = search(
+            query, kinds=[kind] if kind else None,
+            limit=RESULTADOS_POR_PAGINA, offset=(page - 1) * RESULTADOS_POR_PAGINA,
+        )
+    return render(request, 'busca.html', {
+        'query': query,
+        'tipo': kind,
+        'tipos': SOURCES.values(),
+        'results': results,
+        'page': page,
+        'has_more': has_more,
+    })
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=MAX_QUERY_LENGTH, trim_whitespace=True)
+    tipo = serializers.ChoiceField(choices=list(SOURCES), required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=API_MAX_LIMIT, default=RESULTADOS_POR_PAGINA)
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+@method_decorator(gzip_large_responses, name='dispatch')
+class SearchAPI(APIView):
+    """
+    GET /api/v1/busca/?q=<texto>[&tipo=noticia|servico|vaga][&limit=][&offset=]
+
+    Resultados em ordem de relevância. 'titulo' e 'trecho' são HTML já
+    escapado, com as palavras encontradas dentro de <mark>.
+    """
+
+    def get(self, request):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        kind = data.get('tipo')
+        results, has_more = search(data['q'], kinds=[kind] if kind else None, limit=data['limit'], offset=data['offset'])
+        return Response({
+            'results': [
+                {
+                    'tipo': result.kind,
+                    'id': result.object.pk,
+                    'titulo': result.title,
+                    'trecho': result.snippet,
+                    'url': request.build_absolute_uri(result.url),
+                }
+                for result in results
+            ],
+            'has_more': has_more,
+        })
@@ -1,4 +1,6 @@
 from django.contrib import admin
+from search.admin import IndexedSearchAdminMixin
+
 from .models import ServiceCategory, Service
 
 @admin.register(ServiceCategory)
@@ -6,8 +8,9 @@ class ServiceCategoryAdmin(admin.ModelAdmin):
     list_display = ('name',)
 
 @admin.register(Service)
-class ServiceAdmin(admin.ModelAdmin):
+class ServiceAdmin(IndexedSearchAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'category', 'is_active', 'created_at')
     list_filter = ('category', 'is_active')
     search_fields = ('title', 'short_description')
+    search_kind = 'servico'  # busca pelo índice (search.admin); também usada pelo search_model do Jazzmin
     prepopulated_fields = {"slug": ("title",)} # Preenche a URL automaticamente
\ No newline at end of file
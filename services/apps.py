@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ServicesConfig(AppConfig):
     name = 'services'
+
+    def ready(self):
+        # Conecta os receivers do sync incremental
+        from . import signals  # noqa: F401
@@ -0,0 +1,132 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from services.models import Service, ServiceCategory
+from services.serializers import SERVICE_LIST_FIELDS, ServiceSerializer, serialize_service_rows, service_list_values
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a API de serviços (/api/v1/servicos/) com 10 a 10.000 serviços: "
+        "serialização pelo ModelSerializer x caminho com .values(), tempo por página, "
+        "tamanho da resposta (com e sem ?fields= e gzip) e tempo de renderização do JSON. "
+        "Os dados de teste são criados numa transação desfeita no final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,1000,10000', help="Quantidades de serviços, separadas por vírgula")
+        parser.add_argument('--repeat', type=int, default=5, help="Repetições de cada medida (vale a melhor)")
+        parser.add_argument('--page-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        self.repeat = options['repeat']
+        self.page_size = options['page_size']
+        # As requisições precisam de um host aceito por ALLOWED_HOSTS
+        host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'localhost')
+        self.factory = APIRequestFactory(SERVER_NAME=host)
+        # A página passa pela pilha completa (middlewares, ETag, renderização)
+        self.client = Client(SERVER_NAME=host)
+
+        self.stdout.write(
+            f"{'serviços':>9} | {'ModelSerializer':>22} | {'.values()':>22} | {'página da API':>20}"
+        )
+        try:
+            with transaction.atomic():
+                category = ServiceCategory.objects.create(name='Benchmark')
+                created = 0
+                for size in sizes:
+                    self.create_services(category, created, size)
+                    created = size
+                    self.report(size)
+                self.payload()
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_services(self, category, start, end):
+        Service.objects.bulk_create(
+            [
+                Service(
+                    category=category,
+                    title=f"Serviço de teste {i}",
+                    slug=f"bench-servico-{i}",
+                    short_description="Resumo do serviço usado no benchmark da API.",
+                    full_description="Descrição completa. " * 50,
+                    cover_image='services/bench.jpg',
+                )
+                for i in range(start, end)
+            ],
+            batch_size=1000,
+        )
+
+    def measure(self, fn):
+        """Melhor tempo (s) entre as repetições e o número de consultas de uma execução."""
+        best = float('inf')
+        for _ in range(self.repeat):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                fn()
+                elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+        return best, len(ctx.captured_queries)
+
+    def report(self, size):
+        request = self.factory.get(reverse('api_services'))
+        active = Service.objects.filter(is_active=True)
+
+        # Caminho antigo: instâncias + ModelSerializer (já com o JOIN da categoria)
+        old, old_queries = self.measure(
+            lambda: ServiceSerializer(
+                active.select_related('category').defer('full_description'),
+                many=True, context={'request': request},
+            ).data
+        )
+        new, new_queries = self.measure(
+            lambda: serialize_service_rows(active.values(*service_list_values(SERVICE_LIST_FIELDS)), request)
+        )
+        url = reverse('api_services')
+        page, page_queries = self.measure(lambda: self.client.get(url, {'page_size': self.page_size}))
+
+        self.stdout.write(
+            f"{size:>9} | {self.rate(size, old)} {old_queries:>2}q | "
+            f"{self.rate(size, new)} {new_queries:>2}q | {page * 1000:>9.2f} ms {page_queries:>2}q"
+        )
+
+    def payload(self):
+        """Tamanho de uma página da API e custo de renderizar o JSON dela."""
+        url = reverse('api_services')
+        request = self.factory.get(url)
+        self.stdout.write(
+            f"\nPágina com {self.page_size} serviços\n"
+            f"{'campos':>28} | {'JSON':>10} | {'gzip':>10} | {'JSONRenderer':>12}"
+        )
+        for fields in (list(SERVICE_LIST_FIELDS), ['id', 'slug', 'title']):
+            params = {'page_size': self.page_size, 'fields': ','.join(fields)}
+            raw = self.client.get(url, params, HTTP_ACCEPT='application/json')
+            gzipped = self.client.get(url, params, HTTP_ACCEPT='application/json', HTTP_ACCEPT_ENCODING='gzip')
+
+            rows = Service.objects.filter(is_active=True).order_by('-created_at', '-id')
+            data = serialize_service_rows(rows.values(*service_list_values(fields))[:self.page_size], request, fields)
+            render, _ = self.measure(lambda: JSONRenderer().render(data))
+
+            label = 'todos' if len(fields) == len(SERVICE_LIST_FIELDS) else ','.join(fields)
+            self.stdout.write(
+                f"{label:>28} | {len(raw.content):>8} B | {len(gzipped.content):>8} B | "
+                f"{render * 1000:>9.3f} ms"
+            )
+
+    def rate(self, size, seconds):
+        return f"{size / seconds:>11,.0f} linhas/s"
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='cover_image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Versões Responsivas'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='servico_ativo_recentes_idx'),
+        ),
+    ]
@@ -26,15 +26,24 @@ class Service(models.Model):
     
     # Mídia
     cover_image = models.ImageField("Imagem de Capa", upload_to="services/")
+    cover_image_variants = models.JSONField("Versões Responsivas", default=dict, blank=True, editable=False)
     icon_class = models.CharField("Ícone (FontAwesome/Bootstrap)", max_length=50, blank=True, help_text="Ex: bi-lightning-charge")
     
     # Status
     is_active = models.BooleanField("Ativo", default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Usado pela sincronização incremental (core.sync)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Serviço"
         verbose_name_plural = "Serviços"
+        indexes = [
+            # Serviços ativos na ordem da API (paginação por cursor) e da Home
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_active=True), name='servico_ativo_recentes_idx'),
+            # Alterações desde o último sync (core.sync)
+            models.Index(fields=['updated_at', 'id'], name='servico_alteracoes_idx'),
+        ]
 
     def __str__(self):
         return self.title
\ No newline at end of file
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ServiceCursorPagination(CursorPagination):
+    """
+    Paginação por cursor da API de serviços: a posição vai codificada em
+    ?cursor=..., então o custo por página não cresce com o tamanho da tabela.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
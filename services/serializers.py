@@ -6,4 +6,62 @@ class ServiceSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Service
-        fields = ['id', 'title', 'slug', 'category_name', 'short_description', 'cover_image']
\ No newline at end of file
+        fields = ['id', 'title', 'slug', 'category_name', 'short_description', 'cover_image']
+
+
+# Campos da listagem da API -> coluna lida com .values(). Com ?fields=id,slug
+# o cliente recebe só esses campos e só essas colunas saem do banco.
+SERVICE_LIST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'slug': 'slug',
+    'category_name': 'category__name',
+    'short_description': 'short_description',
+    'cover_image': 'cover_image',
+}
+# A paginação por cursor lê a posição de 'created_at', que não vai para a resposta
+CURSOR_VALUES = ('created_at',)
+
+
+def requested_fields(request):
+    """Lista de campos pedida em ?fields=; sem o parâmetro, todos."""
+    raw = request.query_params.get('fields', '')
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    if not fields:
+        return list(SERVICE_LIST_FIELDS)
+    unknown = [name for name in fields if name not in SERVICE_LIST_FIELDS]
+    if unknown:
+        raise serializers.ValidationError({
+            'fields': f"Campos desconhecidos: {', '.join(unknown)}. "
+                      f"Disponíveis: {', '.join(SERVICE_LIST_FIELDS)}."
+        })
+    return fields
+
+
+def service_list_values(fields):
+    """Colunas para o .values() da listagem com os campos pedidos."""
+    return [SERVICE_LIST_FIELDS[name] for name in fields] + list(CURSOR_VALUES)
+
+
+def serialize_service_rows(rows, request=None, fields=None):
+    """
+    Versão rápida do ServiceSerializer para linhas de .values(*service_list_values(fields)):
+    mesmo formato de saída, sem instanciar modelos nem resolver campo a campo.
+    """
+    columns = [(name, SERVICE_LIST_FIELDS[name]) for name in (fields or SERVICE_LIST_FIELDS)]
+    storage = Service._meta.get_field('cover_image').storage
+    data = []
+    for row in rows:
+        item = {}
+        for name, column in columns:
+            value = row[column]
+            if name == 'cover_image':
+                if value:
+                    value = storage.url(value)
+                    if request is not None:
+                        value = request.build_absolute_uri(value)
+                else:
+                    value = None
+            item[name] = value
+        data.append(item)
+    return data
@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Service, ServiceCategory
+
+
+@receiver(post_save, sender=ServiceCategory)
+def touch_category_services(sender, instance, created, raw=False, **kwargs):
+    """
+    O sync de serviços (core.sync) envia o nome da categoria junto com cada
+    serviço: renomear a categoria precisa marcar os serviços dela como alterados.
+    """
+    if created or raw:
+        return
+    Service.objects.filter(category=instance).update(updated_at=timezone.now())
@@ -1,3 +1,40 @@
+from datetime import timedelta
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import QueryPlanAssertionsMixin
+from .models import Service, ServiceCategory
+
+
+class QueryPlanTests(QueryPlanAssertionsMixin, TestCase):
+
+    def test_servicos_ativos_da_home(self):
+        self.assertUsesIndex(Service.objects.filter(is_active=True)[:6])
+
+    def test_servicos_ativos_da_api(self):
+        self.assertUsesIndex(Service.objects.filter(is_active=True).order_by('-created_at', '-id')[:21])
+
+
+class APIRendererTests(TestCase):
+    """A API usa o JSONRenderer do DRF: compacto, com U+2028 escapado e datas em '...Z'."""
+
+    def setUp(self):
+        category = ServiceCategory.objects.create(name="Energia")
+        self.service = Service.objects.create(
+            category=category, title="Linha\u2028nova", slug='linha', short_description="Resumo",
+            full_description="Detalhes", cover_image='services/capa.jpg',
+        )
+
+    def test_lista(self):
+        response = self.client.get(reverse('api_services'), HTTP_ACCEPT='application/json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn(b'"title":"Linha\\u2028nova"', response.content)
 
-# Create your tests here.
+    def test_datas_no_formato_do_drf(self):
+        # O sync só entrega registros mais velhos que SYNC_LAG
+        Service.objects.update(updated_at=timezone.now() - timedelta(minutes=1))
+        response = self.client.get(reverse('api_sync_services'), HTTP_ACCEPT='application/json')
+        self.assertIn(b'Z"', response.content)
+        self.assertNotIn(b'+00:00', response.content)
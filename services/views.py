@@ -1,19 +1,54 @@
+from django.db.models import F, Prefetch
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from rest_framework import generics
 from .models import Service, ServiceCategory 
-from .serializers import ServiceSerializer
+from .pagination import ServiceCursorPagination
+from .serializers import ServiceSerializer, requested_fields, serialize_service_rows, service_list_values
+from core.cache import cache_public_page, conditional_page
+from core.compression import gzip_large_responses
+from core.sync import DeltaSyncAPI
 
+@method_decorator(gzip_large_responses, name='dispatch')
+@method_decorator(conditional_page('services.Service', 'services.ServiceCategory', include_global=False), name='dispatch')
 class ServiceListAPI(generics.ListAPIView):
     """
     Endpoint para listar todos os serviços ativos em formato JSON.
+    Aceita ?fields=id,slug,title para devolver só alguns campos.
     """
-    queryset = Service.objects.filter(is_active=True)
+    queryset = Service.objects.filter(is_active=True).select_related('category').defer('full_description')
     serializer_class = ServiceSerializer
+    pagination_class = ServiceCursorPagination
 
+    def list(self, request, *args, **kwargs):
+        # Uma única consulta com JOIN na categoria, lida como dicionários:
+        # a serialização não passa pelo ModelSerializer campo a campo.
+        fields = requested_fields(request)
+        rows = self.filter_queryset(self.get_queryset()).values(*service_list_values(fields))
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(serialize_service_rows(page, request, fields))
+
+@method_decorator(gzip_large_responses, name='dispatch')
+class ServiceSyncAPI(DeltaSyncAPI):
+    """Sync incremental dos serviços (ver core.sync). Inativos saem como excluídos."""
+    model = Service
+    fields = (
+        'id', 'title', 'slug', 'category_id', 'short_description', 'full_description',
+        'cover_image', 'icon_class', 'created_at', 'updated_at',
+    )
+    expressions = {'category_name': F('category__name')}
+    file_fields = ('cover_image',)
+    active_field = 'is_active'
+
+@cache_public_page('services.Service', 'services.ServiceCategory')
 def service_list(request):
     # Traz todas as categorias que tenham pelo menos um serviço ativo
     # O 'prefetch_related' otimiza o banco para não fazer 1 consulta por categoria
-    categories = ServiceCategory.objects.prefetch_related('services').filter(services__is_active=True).distinct()
+    # A listagem não usa a descrição completa, então ela não é carregada
+    active_services = Service.objects.filter(is_active=True).defer('full_description')
+    categories = ServiceCategory.objects.prefetch_related(
+        Prefetch('services', queryset=active_services)
+    ).filter(services__is_active=True).distinct()
     
     return render(request, 'services_list.html', {
         'categories': categories
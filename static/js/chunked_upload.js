@@ -0,0 +1,249 @@
+/*
+ * Envio de arquivos em partes, com retomada (protocolo em uploads/chunked.py).
+ *
+ * Cada elemento com data-chunked-upload (widget uploads.forms.ChunkedFileInput
+ * ou o formulário do onboarding) tem um <input type="file">, um campo oculto
+ * data-upload-id e, opcionalmente, data-upload-progress e data-upload-status.
+ * Ao escolher o arquivo, ele sobe em partes com SHA-256 de cada uma; o
+ * formulário só é enviado no fim, levando apenas o id da sessão.
+ *
+ * Uma queda de conexão não perde o que já subiu: o envio tenta de novo com
+ * espera crescente e continua do ponto em que o servidor parou. Se a página
+ * for recarregada, escolher o mesmo arquivo retoma a mesma sessão.
+ */
+(function () {
+    'use strict';
+
+    var RETRY_DELAYS = [1000, 2000, 5000, 10000, 20000, 30000];
+    var STORAGE_PREFIX = 'chunked-upload:';
+
+    function csrfToken(form) {
+        var input = form && form.querySelector('input[name="csrfmiddlewaretoken"]');
+        if (input) {
+            return input.value;
+        }
+        var match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+        return match ? decodeURIComponent(match[1]) : '';
+    }
+
+    function sleep(ms) {
+        return new Promise(function (resolve) { setTimeout(resolve, ms); });
+    }
+
+    var SHA256_K = new Uint32Array([
+        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+    ]);
+
+    // SHA-256 em JavaScript, para quando crypto.subtle não existe (página em HTTP)
+    function sha256Fallback(bytes) {
+        var length = bytes.length;
+        var padded = new Uint8Array(((length + 8) >> 6 << 6) + 64);
+        padded.set(bytes);
+        padded[length] = 0x80;
+        var view = new DataView(padded.buffer);
+        view.setUint32(padded.length - 8, Math.floor(length / 0x20000000));
+        view.setUint32(padded.length - 4, length << 3);
+
+        var hash = new Uint32Array([
+            0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+        ]);
+        var w = new Uint32Array(64);
+        for (var block = 0; block < padded.length; block += 64) {
+            for (var i = 0; i < 16; i++) {
+                w[i] = view.getUint32(block + i * 4);
+            }
+            for (i = 16; i < 64; i++) {
+                var x = w[i - 15], y = w[i - 2];
+                var s0 = ((x >>> 7) | (x << 25)) ^ ((x >>> 18) | (x << 14)) ^ (x >>> 3);
+                var s1 = ((y >>> 17) | (y << 15)) ^ ((y >>> 19) | (y << 13)) ^ (y >>> 10);
+                w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+            }
+            var a = hash[0], b = hash[1], c = hash[2], d = hash[3];
+            var e = hash[4], f = hash[5], g = hash[6], h = hash[7];
+            for (i = 0; i < 64; i++) {
+                var t1 = (h + (((e >>> 6) | (e << 26)) ^ ((e >>> 11) | (e << 21)) ^ ((e >>> 25) | (e << 7)))
+                    + ((e & f) ^ (~e & g)) + SHA256_K[i] + w[i]) | 0;
+                var t2 = ((((a >>> 2) | (a << 30)) ^ ((a >>> 13) | (a << 19)) ^ ((a >>> 22) | (a << 10)))
+                    + ((a & b) ^ (a & c) ^ (b & c))) | 0;
+                h = g; g = f; f = e; e = (d + t1) | 0;
+                d = c; c = b; b = a; a = (t1 + t2) | 0;
+            }
+            hash[0] += a; hash[1] += b; hash[2] += c; hash[3] += d;
+            hash[4] += e; hash[5] += f; hash[6] += g; hash[7] += h;
+        }
+        return Array.from(hash, function (word) {
+            return word.toString(16).padStart(8, '0');
+        }).join('');
+    }
+
+    async function sha256Hex(blob) {
+        var buffer = await blob.arrayBuffer();
+        // crypto.subtle só existe em HTTPS (ou localhost)
+        if (!(window.crypto && window.crypto.subtle)) {
+            return sha256Fallback(new Uint8Array(buffer));
+        }
+        var digest = await window.crypto.subtle.digest('SHA-256', buffer);
+        return Array.from(new Uint8Array(digest), function (byte) {
+            return byte.toString(16).padStart(2, '0');
+        }).join('');
+    }
+
+    function UploadFailed(message) {
+        this.message = message;
+    }
+
+    // fetch com novas tentativas para falhas de rede e erros 5xx
+    async function send(url, options) {
+        for (var attempt = 0; ; attempt++) {
+            var response = null;
+            try {
+                response = await fetch(url, Object.assign({credentials: 'same-origin'}, options));
+            } catch (error) {
+                response = null;  // sem conexão
+            }
+            if (response && response.status < 500) {
+                var data = response.status === 204 ? {} : await response.json();
+                return {status: response.status, data: data};
+            }
+            if (attempt >= RETRY_DELAYS.length) {
+                throw new UploadFailed('Sem conexão com o servidor. Tente novamente mais tarde.');
+            }
+            await sleep(RETRY_DELAYS[attempt]);
+        }
+    }
+
+    function storageKey(kind, file) {
+        return STORAGE_PREFIX + [kind, file.name, file.size, file.lastModified].join(':');
+    }
+
+    async function openSession(container, file, headers) {
+        var key = storageKey(container.dataset.kind, file);
+        var savedUrl = window.localStorage.getItem(key);
+        if (savedUrl) {
+            var saved = await send(savedUrl, {method: 'GET', headers: headers});
+            if (saved.status === 200 && saved.data.size === file.size) {
+                return saved.data;
+            }
+            window.localStorage.removeItem(key);
+        }
+        var created = await send(container.dataset.startUrl, {
+            method: 'POST',
+            headers: Object.assign({'Content-Type': 'application/json'}, headers),
+            body: JSON.stringify({kind: container.dataset.kind, filename: file.name, size: file.size}),
+        });
+        if (created.status !== 201) {
+            throw new UploadFailed(created.data.error || 'Não foi possível iniciar o envio.');
+        }
+        window.localStorage.setItem(key, created.data.url);
+        return created.data;
+    }
+
+    async function upload(container, file, onProgress) {
+        var headers = {'X-CSRFToken': csrfToken(container.closest('form'))};
+        var session = await openSession(container, file, headers);
+        var offset = session.offset;
+        var corrupted = 0;
+        onProgress(offset, file.size);
+
+        while (!session.completed && offset < file.size) {
+            var chunk = file.slice(offset, offset + session.chunk_size);
+            var chunkHeaders = Object.assign({
+                'Upload-Offset': String(offset),
+                'Upload-Checksum': 'sha256 ' + await sha256Hex(chunk),
+            }, headers);
+            var result = await send(session.url, {method: 'PUT', headers: chunkHeaders, body: chunk});
+            if (result.status === 200) {
+                session = result.data;
+                offset = session.offset;
+                corrupted = 0;
+            } else if (result.status === 409 || (result.status === 400 && result.data.offset !== undefined)) {
+                // O servidor diz de onde continuar (parte repetida ou interrompida)
+                offset = result.data.offset;
+            } else if (result.status === 422 && ++corrupted < 3) {
+                continue;  // parte corrompida no caminho: reenvia
+            } else {
+                throw new UploadFailed(result.data.error || 'Falha no envio.');
+            }
+            onProgress(offset, file.size);
+        }
+        window.localStorage.removeItem(storageKey(container.dataset.kind, file));
+        return session.id;
+    }
+
+    function setup(container) {
+        var form = container.closest('form');
+        var input = container.querySelector('input[type="file"]');
+        var hidden = container.querySelector('[data-upload-id]');
+        var progress = container.querySelector('[data-upload-progress]');
+        var status = container.querySelector('[data-upload-status]');
+        var buttons = form.querySelectorAll('[type="submit"]');
+        var uploading = false;
+        var submitRequested = false;
+
+        function setStatus(text) {
+            if (status) {
+                status.textContent = text;
+            }
+        }
+
+        input.addEventListener('change', async function () {
+            hidden.value = '';
+            if (!input.files.length) {
+                return;
+            }
+            var file = input.files[0];
+            uploading = true;
+            if (progress) {
+                progress.hidden = false;
+            }
+            try {
+                hidden.value = await upload(container, file, function (sent, total) {
+                    var percent = total ? Math.floor(sent * 100 / total) : 100;
+                    if (progress) {
+                        progress.value = percent;
+                    }
+                    setStatus('Enviando ' + file.name + ': ' + percent + '%');
+                });
+                // O arquivo já está no servidor: o formulário leva só o id
+                input.value = '';
+                input.required = false;
+                setStatus(file.name + ' enviado.');
+                if (submitRequested) {
+                    form.requestSubmit ? form.requestSubmit() : form.submit();
+                }
+            } catch (error) {
+                setStatus(error instanceof UploadFailed ? error.message : 'Falha no envio.');
+            } finally {
+                uploading = false;
+                submitRequested = false;
+                buttons.forEach(function (button) { button.disabled = false; });
+            }
+        });
+
+        form.addEventListener('submit', function (event) {
+            if (uploading) {
+                // Envia o formulário assim que o arquivo terminar de subir
+                event.preventDefault();
+                submitRequested = true;
+                buttons.forEach(function (button) { button.disabled = true; });
+            }
+        });
+    }
+
+    function init() {
+        document.querySelectorAll('[data-chunked-upload]').forEach(setup);
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
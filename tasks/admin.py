@@ -0,0 +1,17 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'duration_ms', 'run_after', 'created_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name',)
+    readonly_fields = ('started_at', 'finished_at', 'duration_ms', 'worker', 'created_at')
+    actions = ['reenfileirar']
+
+    @admin.action(description="Reenfileirar tarefas selecionadas")
+    def reenfileirar(self, request, queryset):
+        count = queryset.exclude(status='EXECUTANDO').update(status='PENDENTE', attempts=0, run_after=timezone.now())
+        self.message_user(request, f"{count} tarefa(s) reenfileirada(s).")
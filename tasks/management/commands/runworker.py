@@ -0,0 +1,22 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Processa a fila de tarefas em segundo plano (tasks.Task) com um pool de processos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 2, help="Número de processos (padrão: nº de CPUs)")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Segundos entre consultas à fila")
+        parser.add_argument('--burst', action='store_true', help="Encerra quando a fila estiver vazia")
+
+    def handle(self, *args, **options):
+        worker = Worker(options['processes'], options['poll_interval'], stdout=self.stdout)
+        self.stdout.write(f"Worker {worker.worker_id} iniciado com {worker.processes} processo(s).")
+        try:
+            worker.run(burst=options['burst'])
+        except KeyboardInterrupt:
+            self.stdout.write("Encerrando worker.")
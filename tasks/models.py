@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """
+    Fila de tarefas em segundo plano (processada por 'manage.py runworker').
+    Cada linha é uma chamada de função: caminho da função + argumentos JSON.
+    """
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('EXECUTANDO', 'Executando'),
+        ('CONCLUIDA', 'Concluída'),
+        ('FALHOU', 'Falhou'),
+    ]
+
+    name = models.CharField("Função", max_length=200, help_text="Caminho completo, ex: core.tasks.generate_image_variants")
+    args = models.JSONField("Argumentos", default=list, blank=True)
+    kwargs = models.JSONField("Argumentos Nomeados", default=dict, blank=True)
+
+    status = models.CharField("Status", max_length=20, choices=STATUS_CHOICES, default='PENDENTE')
+    attempts = models.PositiveIntegerField("Tentativas", default=0)
+    max_attempts = models.PositiveIntegerField("Máximo de Tentativas", default=5)
+    run_after = models.DateTimeField("Executar a partir de", default=timezone.now)
+    last_error = models.TextField("Último Erro", blank=True)
+
+    worker = models.CharField("Worker", max_length=100, blank=True)
+    started_at = models.DateTimeField("Início", null=True, blank=True)
+    finished_at = models.DateTimeField("Fim", null=True, blank=True)
+    duration_ms = models.FloatField("Duração (ms)", null=True, blank=True)
+    created_at = models.DateTimeField("Criada em", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+        ordering = ['-created_at']
+        indexes = [
+            # Busca do worker: próximas tarefas pendentes
+            models.Index(fields=['status', 'run_after'], name='task_fila_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
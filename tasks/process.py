@@ -0,0 +1,30 @@
+"""
+Código executado nos processos filhos do worker (tasks.worker).
+
+O pool usa o método 'spawn': cada filho é um Python novo, que importa este
+módulo antes de django.setup(). Por isso nada aqui importa models no nível
+do módulo.
+"""
+import time
+import traceback
+
+from django.db import connections
+
+
+def init_process():
+    import django
+    django.setup()
+
+
+def run_task(name, args, kwargs):
+    """Executa a tarefa. Retorna (duração_ms, erro ou None)."""
+    from .queue import execute
+
+    start = time.perf_counter()
+    try:
+        duration = execute(name, args, kwargs)
+        return duration, None
+    except Exception:
+        return (time.perf_counter() - start) * 1000, traceback.format_exc()
+    finally:
+        connections.close_all()
@@ -0,0 +1,58 @@
+"""
+API para enfileirar tarefas.
+
+    from tasks.queue import task
+
+    @task
+    def gerar_miniatura(foto_id):
+        ...
+
+    gerar_miniatura.enqueue(foto.id)   # volta na hora; o worker executa depois
+
+Os argumentos precisam ser serializáveis em JSON (ids, strings, números).
+"""
+import time
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+
+def task(func=None, *, max_attempts=5):
+    """Decorator que adiciona '.enqueue(*args, **kwargs)' à função."""
+    def decorator(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+
+        def enqueue_func(*args, **kwargs):
+            return enqueue(name, args, kwargs, max_attempts=max_attempts)
+
+        func.task_name = name
+        func.enqueue = enqueue_func
+        return func
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def enqueue(name, args=(), kwargs=None, max_attempts=5):
+    """
+    Grava a tarefa na fila. Por ser uma tabela do próprio banco, a tarefa só
+    fica visível para o worker quando a transação da requisição é confirmada.
+
+    Com TASKS_ALWAYS_EAGER = True (testes/desenvolvimento) executa na hora.
+    """
+    kwargs = kwargs or {}
+    if getattr(settings, 'TASKS_ALWAYS_EAGER', False):
+        execute(name, list(args), kwargs)
+        return None
+    return Task.objects.create(name=name, args=list(args), kwargs=kwargs, max_attempts=max_attempts)
+
+
+def execute(name, args, kwargs):
+    """Executa a função e retorna a duração em milissegundos."""
+    func = import_string(name)
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,147 @@
+"""
+Worker da fila de tarefas: busca tarefas pendentes no banco e executa num
+pool de processos, com novas tentativas e backoff exponencial.
+"""
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .process import init_process, run_task
+
+logger = logging.getLogger(__name__)
+
+# Espera antes da tentativa N: BASE * 2^(N-1), limitada a MAX (segundos)
+RETRY_BACKOFF_BASE = getattr(settings, 'TASKS_RETRY_BACKOFF_BASE', 10)
+RETRY_BACKOFF_MAX = getattr(settings, 'TASKS_RETRY_BACKOFF_MAX', 60 * 60)
+# Tarefas 'EXECUTANDO' há mais tempo que isso são de um worker que morreu
+STALE_AFTER = getattr(settings, 'TASKS_STALE_AFTER', 60 * 60)
+# De quanto em quanto tempo (segundos) o worker procura tarefas abandonadas
+REQUEUE_INTERVAL = getattr(settings, 'TASKS_REQUEUE_INTERVAL', 60)
+
+# Filhos sem nada herdado do pai: com 'fork' levariam as conexões do banco
+# e os locks (logging, threads do driver) no estado em que estavam
+_mp_context = multiprocessing.get_context('spawn')
+
+
+def retry_delay(attempts):
+    return min(RETRY_BACKOFF_BASE * 2 ** (attempts - 1), RETRY_BACKOFF_MAX)
+
+
+class Worker:
+    def __init__(self, processes, poll_interval=1.0, stdout=None):
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout = stdout
+        self.inflight = {}  # future -> task id
+        self.next_requeue = 0  # time.monotonic() da próxima requeue_stale()
+
+    def log(self, message):
+        if self.stdout:
+            self.stdout.write(message)
+        logger.info(message)
+
+    def requeue_stale(self):
+        """Devolve à fila as tarefas de workers que morreram (as deste worker ainda estão rodando)."""
+        self.next_requeue = time.monotonic() + REQUEUE_INTERVAL
+        limit = timezone.now() - timedelta(seconds=STALE_AFTER)
+        count = Task.objects.filter(status='EXECUTANDO', started_at__lt=limit).exclude(worker=self.worker_id).update(
+            status='PENDENTE', worker='', run_after=timezone.now()
+        )
+        if count:
+            self.log(f"{count} tarefa(s) abandonada(s) voltaram para a fila.")
+
+    def claim(self, limit):
+        """Reserva até 'limit' tarefas. O UPDATE condicional evita que dois workers peguem a mesma."""
+        now = timezone.now()
+        candidates = Task.objects.filter(status='PENDENTE', run_after__lte=now).order_by('run_after').values_list('id', flat=True)[:limit]
+        claimed = []
+        for task_id in list(candidates):
+            updated = Task.objects.filter(id=task_id, status='PENDENTE').update(
+                status='EXECUTANDO', worker=self.worker_id, started_at=now,
+                finished_at=None, attempts=F('attempts') + 1,
+            )
+            if updated:
+                claimed.append(Task.objects.get(id=task_id))
+        return claimed
+
+    def finish(self, task_id, duration_ms, error):
+        task = Task.objects.get(id=task_id)
+        task.duration_ms = duration_ms
+        task.finished_at = timezone.now()
+        task.worker = ''
+        if error is None:
+            task.status = 'CONCLUIDA'
+            task.last_error = ''
+            self.log(f"OK   {task.name}#{task.id} em {duration_ms:.0f} ms")
+        elif task.attempts < task.max_attempts:
+            delay = retry_delay(task.attempts)
+            task.status = 'PENDENTE'
+            task.run_after = timezone.now() + timedelta(seconds=delay)
+            task.last_error = error
+            self.log(f"ERRO {task.name}#{task.id} (tentativa {task.attempts}/{task.max_attempts}), nova tentativa em {delay}s")
+        else:
+            task.status = 'FALHOU'
+            task.last_error = error
+            self.log(f"FALHOU {task.name}#{task.id} após {task.attempts} tentativas")
+        task.save(update_fields=['status', 'run_after', 'last_error', 'worker', 'finished_at', 'duration_ms'])
+
+    def run(self, burst=False):
+        """
+        Loop principal. Com burst=True termina quando a fila esvazia
+        (útil em cron ou em testes).
+        """
+        while True:
+            with ProcessPoolExecutor(max_workers=self.processes, mp_context=_mp_context, initializer=init_process) as pool:
+                if self._loop(pool, burst):
+                    return
+            # Um processo filho morreu e o pool ficou inutilizável: recria
+            self.log("Pool de processos reiniciado.")
+
+    def _loop(self, pool, burst):
+        """Retorna True para encerrar o worker, False se o pool quebrou."""
+        while True:
+            # Não só na partida: um worker de outra máquina pode morrer a qualquer hora
+            if time.monotonic() >= self.next_requeue:
+                self.requeue_stale()
+
+            free = self.processes - len(self.inflight)
+            if free > 0:
+                for task in self.claim(free):
+                    future = pool.submit(run_task, task.name, task.args, task.kwargs)
+                    self.inflight[future] = task.id
+
+            if not self.inflight:
+                if burst:
+                    return True
+                time.sleep(self.poll_interval)
+                continue
+
+            broken = False
+            done, _ = wait(self.inflight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                task_id = self.inflight.pop(future)
+                try:
+                    duration_ms, error = future.result()
+                except BrokenProcessPool:
+                    # O processo filho morreu (ex: falta de memória)
+                    duration_ms, error = None, traceback.format_exc()
+                    broken = True
+                self.finish(task_id, duration_ms, error)
+            if broken:
+                # As demais tarefas do pool quebrado também se perderam
+                for task_id in self.inflight.values():
+                    self.finish(task_id, None, "Processo do worker encerrado inesperadamente.")
+                self.inflight.clear()
+                return False
@@ -0,0 +1,244 @@
+"""
+Envio de arquivos grandes em partes, com retomada depois de uma queda.
+
+Protocolo (uploads.views, usado por static/js/chunked_upload.js):
+
+1. POST /envios/ com JSON {"kind", "filename", "size"}: cria a sessão e
+   devolve {"id", "url", "offset": 0, "size", "chunk_size"}.
+2. PUT <url> com os bytes de uma parte e os headers
+       Upload-Offset: <posição da parte no arquivo>
+       Upload-Checksum: sha256 <hex da parte>
+   A parte só é aceita se começar exatamente em 'offset' e o SHA-256
+   conferir. Resposta: o novo 'offset'. Posição errada: 409 com o offset
+   certo. Checksum ausente ou diferente: 422 e a parte é descartada
+   (reenviar). O checksum é obrigatório: sem crypto.subtle (páginas em HTTP)
+   o JavaScript calcula o SHA-256 por conta própria.
+3. GET <url>: estado atual, para retomar do 'offset' depois de uma queda.
+4. Com offset == size a sessão fica concluída. O formulário (admin do
+   HomeVideo, onboarding) envia só o id da sessão, aceito apenas do mesmo
+   usuário que fez o envio, e o arquivo é movido para o FileField
+   (AssembledFile), sem nova cópia no FileSystemStorage. A sessão é
+   apagada depois de usada.
+
+Cada parte é lida da requisição e gravada em pedaços: nem a parte nem o
+arquivo inteiro ficam em memória.
+"""
+import fcntl
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.utils import timezone
+
+from careers.tasks import ACCEPTED_DOCUMENT_TYPES
+from core.files import sniff_content_type
+
+from .models import UploadSession
+
+MB = 1024 * 1024
+
+# Tamanho das partes sugerido ao navegador e o máximo aceito
+CHUNK_SIZE = 4 * MB
+MAX_CHUNK_SIZE = 16 * MB
+# Bytes lidos da requisição por vez
+READ_SIZE = 64 * 1024
+# Sessões em andamento por usuário (cada uma ocupa disco até terminar ou expirar)
+MAX_OPEN_SESSIONS = 5
+# Sessões sem atividade há mais que isso são apagadas (clear_upload_sessions)
+SESSION_MAX_AGE = timedelta(hours=24)
+
+
+@dataclass(frozen=True)
+class UploadKind:
+    max_size: int
+    extensions: tuple
+    content_types: frozenset  # conferidos nos primeiros bytes da primeira parte
+    permissions: tuple = field(default=())  # basta uma; vazio: qualquer usuário logado
+
+
+UPLOAD_KINDS = {
+    'home_video': UploadKind(
+        2048 * MB, ('.mp4',), frozenset({'video/mp4'}),
+        permissions=('core.add_homevideo', 'core.change_homevideo'),
+    ),
+    'candidate_document': UploadKind(25 * MB, ('.pdf', '.jpg', '.jpeg', '.png'), ACCEPTED_DOCUMENT_TYPES),
+}
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def _human_size(size):
+    return f"{size / MB:.0f} MB"
+
+
+def start(user, kind, filename, size):
+    """Cria a sessão de envio (UploadError se o arquivo não for aceito)."""
+    upload_kind = UPLOAD_KINDS.get(kind)
+    if upload_kind is None:
+        raise UploadError("Destino de envio inválido.")
+    if upload_kind.permissions and not any(user.has_perm(perm) for perm in upload_kind.permissions):
+        raise UploadError("Sem permissão para este envio.", status=403)
+
+    filename = os.path.basename(str(filename or '').replace('\\', '/'))[:255]
+    if not filename or os.path.splitext(filename)[1].lower() not in upload_kind.extensions:
+        raise UploadError(f"Formato não aceito. Envie {', '.join(upload_kind.extensions)}.")
+    if not isinstance(size, int) or size <= 0:
+        raise UploadError("Tamanho do arquivo inválido.")
+    if size > upload_kind.max_size:
+        raise UploadError(f"Arquivo maior que o limite de {_human_size(upload_kind.max_size)}.", status=413)
+    if UploadSession.objects.filter(user=user, completed_at__isnull=True).count() >= MAX_OPEN_SESSIONS:
+        raise UploadError("Muitos envios em andamento. Conclua ou aguarde antes de começar outro.", status=429)
+
+    session = UploadSession.objects.create(user=user, kind=kind, filename=filename, size=size)
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    open(session.temp_path, 'wb').close()
+    return session
+
+
+def _parse_checksum(header):
+    """'sha256 <hex>' -> hex."""
+    if not header:
+        raise UploadError("Header Upload-Checksum obrigatório ('sha256 <hex>').", status=422)
+    algorithm, _, value = header.strip().partition(' ')
+    if algorithm.lower() != 'sha256' or len(value.strip()) != 64:
+        raise UploadError("Upload-Checksum deve ser 'sha256 <hex>'.")
+    return value.strip().lower()
+
+
+def append(session, offset, length, stream, checksum_header):
+    """
+    Grava a parte (length bytes lidos de 'stream') na posição 'offset'.
+    Retorna o novo offset.
+
+    Roda fora de transação: numa conexão lenta a parte leva minutos, e no
+    SQLite uma transação aberta nesse tempo trava as escritas do site todo.
+    Duas partes da mesma sessão ao mesmo tempo (aba duplicada) são separadas
+    pelo flock no arquivo parcial; o banco só é tocado no fim, num UPDATE
+    condicionado ao offset.
+    """
+    if length <= 0 or length > MAX_CHUNK_SIZE:
+        raise UploadError(f"Cada parte deve ter até {_human_size(MAX_CHUNK_SIZE)}.", status=413)
+    expected = _parse_checksum(checksum_header)
+    try:
+        fp = open(session.temp_path, 'r+b')
+    except FileNotFoundError:
+        raise UploadError("Envio expirado. Comece de novo.", status=410)
+
+    with fp:
+        try:
+            fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadError("Outra parte deste envio ainda está chegando.", status=409, offset=session.offset)
+        # Com o arquivo travado, o offset do banco é o definitivo
+        try:
+            session.refresh_from_db(fields=['offset', 'completed_at'])
+        except UploadSession.DoesNotExist:
+            raise UploadError("Envio expirado. Comece de novo.", status=410)
+        if session.is_complete:
+            raise UploadError("Envio já concluído.", status=409, offset=session.offset)
+        if offset != session.offset:
+            raise UploadError("A parte não começa onde o envio parou.", status=409, offset=session.offset)
+        if offset + length > session.size:
+            raise UploadError("A parte passa do tamanho informado do arquivo.")
+
+        digest, received = hashlib.sha256(), 0
+        # Descarta o que sobrou de uma parte interrompida no meio
+        fp.seek(offset)
+        fp.truncate()
+        while received < length:
+            data = stream.read(min(READ_SIZE, length - received))
+            if not data:
+                break
+            digest.update(data)
+            fp.write(data)
+            received += len(data)
+
+        if received != length or digest.hexdigest() != expected:
+            fp.truncate(offset)
+            if received != length:
+                raise UploadError("Parte incompleta: a conexão caiu no meio do envio.", offset=offset)
+            raise UploadError("A parte chegou corrompida (SHA-256 diferente). Reenvie.", status=422, offset=offset)
+        if offset == 0:
+            # Tipo pelo conteúdo, não pela extensão: recusa já na primeira parte
+            fp.seek(0)
+            if sniff_content_type(fp.read(16)) not in UPLOAD_KINDS[session.kind].content_types:
+                fp.truncate(0)
+                raise UploadError("O conteúdo do arquivo não corresponde a um formato aceito.", status=415)
+        fp.flush()
+
+        new_offset = offset + length
+        completed_at = timezone.now() if new_offset == session.size else None
+        updated = UploadSession.objects.filter(pk=session.pk, offset=offset).update(
+            offset=new_offset, completed_at=completed_at, updated_at=timezone.now(),
+        )
+        if not updated:
+            # Sessão cancelada (DELETE) ou expirada enquanto a parte chegava
+            raise UploadError("Envio expirado. Comece de novo.", status=410)
+    session.offset, session.completed_at = new_offset, completed_at
+    return session.offset
+
+
+def abort(session):
+    _remove_temp_file(session)
+    session.delete()
+
+
+def completed_session(upload_id, kind, user):
+    """Sessão concluída de 'user' e ainda não usada (None se não existir)."""
+    try:
+        upload_id = uuid.UUID(str(upload_id))
+    except ValueError:
+        return None
+    if user is None or not user.is_authenticated:
+        return None
+    session = UploadSession.objects.filter(pk=upload_id, kind=kind, user=user, completed_at__isnull=False).first()
+    if session is None or not os.path.exists(session.temp_path):
+        return None
+    return session
+
+
+class AssembledFile(UploadedFile):
+    """
+    Arquivo de uma sessão concluída, para atribuir a um FileField. Como tem
+    temporary_file_path(), o FileSystemStorage move o arquivo para
+    MEDIA_ROOT em vez de copiar.
+    """
+
+    def __init__(self, session):
+        super().__init__(open(session.temp_path, 'rb'), session.filename, None, session.size, None)
+        self.session = session
+
+    def temporary_file_path(self):
+        return self.session.temp_path
+
+
+def save_to_field(field_file, session, save=True):
+    """Grava o arquivo da sessão no FileField e encerra a sessão."""
+    with AssembledFile(session) as content:
+        field_file.save(session.filename, content, save=save)
+    abort(session)
+
+
+def _remove_temp_file(session):
+    try:
+        os.remove(session.temp_path)
+    except FileNotFoundError:
+        pass
+
+
+def clear_stale(max_age=SESSION_MAX_AGE):
+    """Apaga as sessões paradas há mais de 'max_age' (e os arquivos parciais). Retorna quantas."""
+    stale = list(UploadSession.objects.filter(updated_at__lt=timezone.now() - max_age))
+    for session in stale:
+        _remove_temp_file(session)
+    UploadSession.objects.filter(pk__in=[session.pk for session in stale]).delete()
+    return len(stale)
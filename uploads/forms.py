@@ -0,0 +1,93 @@
+from django import forms
+from django.urls import reverse
+
+from .chunked import AssembledFile, abort, completed_session
+
+
+def upload_field_name(name):
+    """Campo oculto com o id da sessão de envio de 'name'."""
+    return f'{name}_upload'
+
+
+class ChunkedFileInput(forms.ClearableFileInput):
+    """
+    Campo de arquivo enviado em partes pelo static/js/chunked_upload.js: o
+    formulário leva só o id da sessão concluída, e o arquivo montado no
+    servidor vira o valor do campo. Sem JavaScript funciona como o campo
+    comum (um único POST).
+
+    Só vale a sessão do usuário em 'user' (definido pela view ou pelo
+    ModelAdmin, ver ChunkedUploadAdminMixin); sem ele, o id é ignorado. A
+    permissão para enviar é conferida ao criar a sessão. Depois de salvar o
+    model, finish_chunked_uploads(form) encerra as sessões usadas.
+    """
+    template_name = 'uploads/chunked_file_input.html'
+
+    class Media:
+        js = ('js/chunked_upload.js',)
+
+    def __init__(self, kind, attrs=None):
+        super().__init__(attrs)
+        self.kind = kind
+        self.user = None
+        self._assembled = None
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget'].update({
+            'kind': self.kind,
+            'upload_name': upload_field_name(name),
+            'start_url': reverse('upload_start'),
+        })
+        return context
+
+    def value_from_datadict(self, data, files, name):
+        if self._assembled is None:
+            # O form lê o valor mais de uma vez (clean, has_changed): abre o arquivo só uma
+            session = completed_session(data.get(upload_field_name(name)), self.kind, self.user)
+            if session is not None:
+                self._assembled = AssembledFile(session)
+        if self._assembled is not None:
+            return self._assembled
+        return super().value_from_datadict(data, files, name)
+
+    def value_omitted_from_data(self, data, files, name):
+        return (
+            super().value_omitted_from_data(data, files, name)
+            and not data.get(upload_field_name(name))
+        )
+
+
+def finish_chunked_uploads(form):
+    """Depois de salvar o model: fecha os arquivos montados e apaga as sessões usadas."""
+    for field in form.fields.values():
+        assembled = getattr(field.widget, '_assembled', None)
+        if assembled is not None:
+            assembled.close()
+            abort(assembled.session)
+            field.widget._assembled = None
+
+
+class ChunkedUploadAdminMixin:
+    """
+    ModelAdmin com campos ChunkedFileInput: aceita só as sessões do usuário
+    logado e as encerra depois de salvar.
+    """
+
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        user = request.user
+
+        class ChunkedUploadForm(form):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                for field in self.fields.values():
+                    if isinstance(field.widget, ChunkedFileInput):
+                        field.widget.user = user
+
+        ChunkedUploadForm.__name__ = form.__name__
+        return ChunkedUploadForm
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        finish_chunked_uploads(form)
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from uploads import chunked
+
+
+class Command(BaseCommand):
+    help = "Apaga os envios em partes parados (e os arquivos parciais em CHUNKED_UPLOAD_DIR)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=float, default=chunked.SESSION_MAX_AGE.total_seconds() / 3600,
+            help="Apaga os envios sem atividade há mais que isso (padrão: 24)",
+        )
+
+    def handle(self, *args, **options):
+        total = chunked.clear_stale(timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f"{total} envio(s) apagado(s)."))
@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-18 10:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=30, verbose_name='Destino')),
+                ('filename', models.CharField(max_length=255, verbose_name='Nome do Arquivo')),
+                ('size', models.BigIntegerField(verbose_name='Tamanho (bytes)')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='Bytes Recebidos')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Envio em Partes',
+                'verbose_name_plural': 'Envios em Partes',
+                'indexes': [models.Index(fields=['updated_at'], name='envio_partes_atualizado_idx')],
+            },
+        ),
+    ]
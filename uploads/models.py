@@ -0,0 +1,43 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class UploadSession(models.Model):
+    """
+    Envio de um arquivo em partes (uploads.chunked). As partes são gravadas
+    em ordem num arquivo temporário em CHUNKED_UPLOAD_DIR; 'offset' diz
+    quantos bytes já chegaram, e é dele que o navegador continua depois de
+    uma queda de conexão.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions', verbose_name="Usuário")
+    kind = models.CharField("Destino", max_length=30)
+    filename = models.CharField("Nome do Arquivo", max_length=255)
+    size = models.BigIntegerField("Tamanho (bytes)")
+    offset = models.BigIntegerField("Bytes Recebidos", default=0)
+    completed_at = models.DateTimeField("Concluído em", null=True, blank=True)
+    created_at = models.DateTimeField("Criado em", auto_now_add=True)
+    updated_at = models.DateTimeField("Atualizado em", auto_now=True)
+
+    class Meta:
+        verbose_name = "Envio em Partes"
+        verbose_name_plural = "Envios em Partes"
+        indexes = [
+            # Limpeza dos envios abandonados (clear_upload_sessions)
+            models.Index(fields=['updated_at'], name='envio_partes_atualizado_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def temp_path(self):
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f'{self.pk}.part')
+
+    @property
+    def is_complete(self):
+        return self.completed_at is not None
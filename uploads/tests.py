@@ -0,0 +1,144 @@
+import fcntl
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import Permission, User
+from django.test import TestCase, override_settings
+
+from core.models import HomeVideo
+from core.testing import TempMediaRootMixin
+from . import chunked
+from .models import UploadSession
+
+MP4 = b'\x00\x00\x00\x18ftypmp42' + b'\x00' * 16 + bytes(range(256)) * 4
+
+
+def checksum(data):
+    return 'sha256 ' + hashlib.sha256(data).hexdigest()
+
+
+class ChunkedUploadTests(TempMediaRootMixin, TestCase):
+    """Protocolo do envio em partes (uploads.chunked / uploads.views)."""
+
+    def setUp(self):
+        super().setUp()
+        upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_dir, ignore_errors=True)
+        self.enterContext(override_settings(CHUNKED_UPLOAD_DIR=upload_dir))
+        self.user = User.objects.create_user('admin-video', is_staff=True)
+        self.user.user_permissions.add(*Permission.objects.filter(codename__in=['add_homevideo', 'change_homevideo']))
+        self.client.force_login(self.user)
+
+    def start(self, data=MP4):
+        response = self.client.post(
+            '/envios/', {'kind': 'home_video', 'filename': 'video.mp4', 'size': len(data)},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def put(self, session, data, offset, upload_checksum=None):
+        headers = {'Upload-Offset': str(offset)}
+        if upload_checksum is not False:
+            headers['Upload-Checksum'] = upload_checksum or checksum(data)
+        return self.client.put(session['url'], data, content_type='application/octet-stream', headers=headers)
+
+    def upload(self, data=MP4, chunk_size=400):
+        session = self.start(data)
+        for offset in range(0, len(data), chunk_size):
+            response = self.put(session, data[offset:offset + chunk_size], offset)
+            self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['completed'])
+        return session
+
+    def test_envio_completo(self):
+        session = UploadSession.objects.get(pk=self.upload()['id'])
+        with open(session.temp_path, 'rb') as fp:
+            self.assertEqual(fp.read(), MP4)
+
+    def test_parte_fora_de_ordem(self):
+        session = self.start()
+        self.put(session, MP4[:400], 0)
+        response = self.put(session, MP4[800:1200], 800)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 400)
+
+    def test_checksum_diferente(self):
+        session = self.start()
+        response = self.put(session, MP4[:400], 0, upload_checksum=checksum(b'outro'))
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()['offset'], 0)
+        self.assertEqual(os.path.getsize(UploadSession.objects.get(pk=session['id']).temp_path), 0)
+
+    def test_checksum_obrigatorio(self):
+        response = self.put(self.start(), MP4[:400], 0, upload_checksum=False)
+        self.assertEqual(response.status_code, 422)
+
+    def test_parte_incompleta(self):
+        session = UploadSession.objects.get(pk=self.start()['id'])
+        chunked.append(session, 0, 400, io.BytesIO(MP4[:400]), checksum(MP4[:400]))
+        # A conexão cai no meio da segunda parte: os bytes que chegaram são descartados
+        with self.assertRaises(chunked.UploadError) as error:
+            chunked.append(session, 400, 400, io.BytesIO(MP4[400:700]), checksum(MP4[400:800]))
+        self.assertEqual((error.exception.status, error.exception.offset), (400, 400))
+        self.assertEqual(os.path.getsize(session.temp_path), 400)
+
+    def test_parte_simultanea_da_mesma_sessao(self):
+        session = self.start()
+        self.put(session, MP4[:400], 0)
+        # Outra requisição gravando a mesma sessão (aba duplicada) segura o arquivo parcial
+        with open(UploadSession.objects.get(pk=session['id']).temp_path, 'r+b') as fp:
+            fcntl.flock(fp, fcntl.LOCK_EX)
+            response = self.put(session, MP4[400:800], 400)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.put(session, MP4[400:800], 400).status_code, 200)
+
+    def test_primeira_parte_com_tipo_errado(self):
+        data = b'<html>' + MP4[6:]
+        response = self.put(self.start(data), data[:400], 0)
+        self.assertEqual(response.status_code, 415)
+
+    def test_retomada(self):
+        session = self.start()
+        self.put(session, MP4[:400], 0)
+        # Página recarregada: o GET diz de onde continuar
+        state = self.client.get(session['url']).json()
+        self.assertEqual(state['offset'], 400)
+        response = self.put(session, MP4[400:], 400)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['completed'])
+
+    def test_sessao_de_outro_usuario(self):
+        session = self.start()
+        self.client.force_login(User.objects.create_user('outro'))
+        self.assertEqual(self.client.get(session['url']).status_code, 404)
+        self.assertEqual(self.put(session, MP4[:400], 0).status_code, 404)
+
+    def post_home_video(self, upload_id):
+        return self.client.post('/admin/core/homevideo/add/', {
+            'title': "Vídeo", 'overlay_text': '', 'is_active': 'on', 'video_file_upload': upload_id,
+        })
+
+    def test_admin_do_video_usa_a_sessao_e_a_encerra(self):
+        session = UploadSession.objects.get(pk=self.upload()['id'])
+        self.user.user_permissions.add(Permission.objects.get(codename='view_homevideo'))
+        response = self.post_home_video(session.pk)
+        self.assertEqual(response.status_code, 302)
+        video = HomeVideo.objects.get()
+        with video.video_file.open('rb') as fp:
+            self.assertEqual(fp.read(), MP4)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(session.temp_path))
+
+    def test_admin_do_video_recusa_sessao_de_outro_usuario(self):
+        session_id = self.upload()['id']
+        other = User.objects.create_user('outro-admin', is_staff=True)
+        other.user_permissions.add(*Permission.objects.filter(codename__in=['add_homevideo', 'change_homevideo']))
+        self.client.force_login(other)
+        response = self.post_home_video(session_id)
+        self.assertEqual(response.status_code, 200)  # formulário de volta: arquivo obrigatório
+        self.assertFalse(HomeVideo.objects.exists())
+        self.assertTrue(UploadSession.objects.filter(pk=session_id).exists())
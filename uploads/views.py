@@ -0,0 +1,76 @@
+import json
+from functools import wraps
+
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods, require_POST
+
+from . import chunked
+from .models import UploadSession
+
+
+def _session_data(session):
+    return {
+        'id': str(session.pk),
+        'url': reverse('upload_session', args=[session.pk]),
+        'filename': session.filename,
+        'size': session.size,
+        'offset': session.offset,
+        'chunk_size': chunked.CHUNK_SIZE,
+        'completed': session.is_complete,
+    }
+
+
+def _error(error):
+    data = {'error': str(error)}
+    if error.offset is not None:
+        data['offset'] = error.offset
+    return JsonResponse(data, status=error.status)
+
+
+def _login_required_json(view):
+    # Chamado por fetch(): 401 em JSON em vez do redirecionamento para o login
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': "Faça login para enviar arquivos."}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+@require_POST
+@_login_required_json
+def upload_start(request):
+    try:
+        data = json.loads(request.body)
+        session = chunked.start(request.user, data.get('kind'), data.get('filename'), data.get('size'))
+    except (ValueError, AttributeError):
+        return JsonResponse({'error': "JSON inválido."}, status=400)
+    except chunked.UploadError as error:
+        return _error(error)
+    return JsonResponse(_session_data(session), status=201)
+
+
+@require_http_methods(['GET', 'HEAD', 'PUT', 'DELETE'])
+@_login_required_json
+def upload_session(request, upload_id):
+    if request.method in ('GET', 'HEAD'):
+        session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+        return JsonResponse(_session_data(session))
+
+    session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+    if request.method == 'DELETE':
+        chunked.abort(session)
+        return HttpResponse(status=204)
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return JsonResponse({'error': "Header Upload-Offset inválido."}, status=400)
+    try:
+        # Sem transação aberta enquanto a parte chega (ver chunked.append)
+        chunked.append(session, offset, length, request, request.headers.get('Upload-Checksum'))
+    except chunked.UploadError as error:
+        return _error(error)
+    return JsonResponse(_session_data(session))